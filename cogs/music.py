@@ -21,6 +21,7 @@
 #  ------------------------------------------------------------
 #
 
+import asyncio
 import os
 import time
 from datetime import timedelta
@@ -33,14 +34,34 @@ from nextcord import SelectOption
 from nextcord.ext import commands
 from termcolor import colored
 
-from config.loader import SQLITE_PATH, USE_SQLITE, default_language, lang, type_color
+from config.loader import (
+    SQLITE_PATH,
+    USE_SQLITE,
+    default_language,
+    executor_sizes,
+    extractor_backend,
+    ffmpeg_cpu_threshold,
+    ffmpeg_max_processes,
+    ffmpeg_saturation_policy,
+    lang,
+    metadata_expire_days,
+    metadata_packs,
+    metadata_refresh_interval,
+    metadata_stale_days,
+    player_idle_timeout,
+    replay_retention_days,
+    rpc_mode,
+    type_color,
+    use_ytdlp,
+    ytdlp_pool_size,
+)
 from config.perm import auth_guard
 from database.guild_handler import get_guild_language, get_guild_settings
 from module.embeds.generic import Embeds
 from module.embeds.nowplaying import NowPlayingMenu
 from module.embeds.queue import QueueViewer
 from module.embeds.lyrics import LyricsLangEmbed
-from module.matcher import SongMatcher
+from module.lyrics import caption_cache
 from module.nextcord_jukebox.enums import LOOPMODE
 from module.nextcord_jukebox.event_manager import EventManager
 from module.nextcord_jukebox.exceptions import (
@@ -56,10 +77,12 @@ from module.nextcord_jukebox.exceptions import (
     UserNotConnected,
     VoiceChannelMismatch,
 )
+from module.nextcord_jukebox.executors import executors
 from module.nextcord_jukebox.player_manager import PlayerManager
 from module.nextcord_jukebox.utils import get_playlist_id
 from module.progressBar import progressBar
 from module.replay_card import create_top_songs_poster
+from module.view_registry import ViewRegistry
 
 class_namespace = "music_class_title"
 
@@ -67,12 +90,28 @@ class_namespace = "music_class_title"
 class Music(commands.Cog, EventManager):
     def __init__(self, bot):
         self.bot = bot
-        self.now_playing_menus = {}
-        self.queue_menus = {}
-        self.lyrics_menus = {}
+
+        manager_options = {
+            "extractor_backend": extractor_backend,
+            "use_ytdlp": use_ytdlp,
+            "ytdlp_pool_size": ytdlp_pool_size,
+            "executor_sizes": executor_sizes,
+            "ffmpeg_max_processes": ffmpeg_max_processes,
+            "ffmpeg_cpu_threshold": ffmpeg_cpu_threshold,
+            "ffmpeg_saturation_policy": ffmpeg_saturation_policy,
+            "replay_retention_days": replay_retention_days,
+            "metadata_stale_days": metadata_stale_days,
+            "metadata_expire_days": metadata_expire_days,
+            "metadata_refresh_interval": metadata_refresh_interval,
+            "metadata_packs": metadata_packs,
+            "rpc_mode": rpc_mode,
+            "player_idle_timeout": player_idle_timeout,
+        }
 
         if USE_SQLITE:
-            self.manager = PlayerManager(bot, db_type="sqlite", db_path=SQLITE_PATH)
+            self.manager = PlayerManager(
+                bot, db_type="sqlite", db_path=SQLITE_PATH, **manager_options
+            )
         else:
             self.manager = PlayerManager(
                 bot,
@@ -82,8 +121,21 @@ class Music(commands.Cog, EventManager):
                 mysql_user=os.getenv("MYSQL_USER"),
                 mysql_password=os.getenv("MYSQL_PASSWORD"),
                 mysql_database=os.getenv("MYSQL_DATABASE"),
+                **manager_options,
             )
 
+        caption_cache.attach(self.manager.database)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.manager.start_maintenance()
+        self.manager.start_reaper()
+        self.manager.start_rpc()
+
+    def cog_unload(self):
+        EventManager.detach(self)
+        asyncio.create_task(self.manager.shutdown())
+
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
         await self.manager.fire_voice_state_update(member, before, after)
@@ -156,21 +208,17 @@ class Music(commands.Cog, EventManager):
                 )
             )
 
+    @EventManager.listener
+    async def player_removed(self, manager, guild_id: int):
+        await ViewRegistry.retire(guild_id)
+
     @EventManager.listener
     async def track_start(self, player, interaction: Interaction, before, after):
-        if interaction.guild.id in self.now_playing_menus:
-            for menu in list(self.now_playing_menus[interaction.guild.id]):
-                if menu.is_timeout:
-                    self.now_playing_menus[interaction.guild.id].remove(menu)
-                else:
-                    await menu.update()
+        for menu in ViewRegistry.views(interaction.guild.id, NowPlayingMenu):
+            await menu.update()
 
-        if interaction.guild.id in self.queue_menus:
-            for menu in list(self.queue_menus[interaction.guild.id]):
-                if menu.is_timeout:
-                    self.queue_menus[interaction.guild.id].remove(menu)
-                else:
-                    await menu.edit_page()
+        for menu in ViewRegistry.views(interaction.guild.id, QueueViewer):
+            await menu.edit_page()
 
         if (
             await get_guild_settings(interaction.guild.id, "music_silent_mode")
@@ -581,127 +629,89 @@ class Music(commands.Cog, EventManager):
         if not player:
             return
 
-        async def get_page(page: int, query=""):
+        async def get_page(page: int, results: list, query=""):
             # TODO: クエリ内のスコアに基づいて曲を表示する
-            music_player = await self.ensure_voice_state(self.bot, interaction)
-            if not music_player:
-                return
+            guild_lang = lang[await get_guild_language(interaction.guild.id)]
+            no_result_option = SelectOption(
+                label=guild_lang["music_queue_no_result"],
+                description=guild_lang["music_queue_no_result_description"],
+                value="no_result",
+            )
 
             try:
-                now_playing = await music_player.now_playing()
+                now_playing = await player.now_playing()
                 duration_song_str = str(timedelta(seconds=now_playing.duration))
                 time_elapsed = now_playing.timer.elapsed
                 duration_passed = round(time_elapsed)
                 duration_passed_str = str(timedelta(seconds=duration_passed))
                 options = []
-                no_result = True
 
                 embed = nextcord.Embed(
-                    title=lang[await get_guild_language(interaction.guild.id)][
-                        "currently_playing"
-                    ].format(title=now_playing.title),
+                    title=guild_lang["currently_playing"].format(
+                        title=now_playing.title
+                    ),
                     description=f"{progressBar.splitBar(now_playing.duration, duration_passed)[0]} | {duration_passed_str}/{duration_song_str}",
                     color=type_color["list"],
                 )
 
-                subset = (
-                    [
-                        song
-                        for song, _ in SongMatcher.match(
-                            await music_player.current_queue(),
-                            query,
-                            case_sens=False,
-                            threshold=0.8,
-                        )
-                    ]
-                    if query.replace(" ", "") != ""
-                    else await music_player.current_queue()
-                )
-
-                for i, song in enumerate(
-                    subset[(page - 1) * 10 : page * 10], start=(page - 1) * 10
+                for i, (position, song) in enumerate(
+                    results[(page - 1) * 10 : page * 10], start=(page - 1) * 10
                 ):
                     if song == now_playing and i == 0:
                         continue
 
                     duration_str = str(timedelta(seconds=song.duration))
                     views_str = "{:,}".format(song.views)
-                    current_queue = await music_player.current_queue()
-                    field_name = (
-                        f"{i}. {song.title}"
-                        if query.replace(" ", "") == ""
-                        else f"{current_queue.index(song)}. {song.title}"
-                    )
+                    eta_str = str(timedelta(seconds=round(player.time_until(position))))
 
                     embed.add_field(
-                        name=field_name,
-                        value=f"⏳ {duration_str} | 👁️ {views_str}",
+                        name=f"{position}. {song.title}",
+                        value=f"⏳ {duration_str} | 👁️ {views_str} | 🕒 {eta_str}",
                         inline=False,
                     )
                     options.append(
                         SelectOption(
                             label=song.title,
                             description=song.channel,
-                            value=str(current_queue.index(song)),
+                            value=str(position),
                         )
                     )
-                    no_result = False
 
-                if no_result:
-                    options.append(
-                        SelectOption(
-                            label=lang[await get_guild_language(interaction.guild.id)][
-                                "music_queue_no_result"
-                            ],
-                            description=lang[
-                                await get_guild_language(interaction.guild.id)
-                            ]["music_queue_no_result_description"],
-                            value="no_result",
-                        )
-                    )
+                if not options:
+                    options.append(no_result_option)
 
-                total_pages = QueueViewer.compute_total_pages(len(subset), 10)
+                total_pages = QueueViewer.compute_total_pages(len(results), 10)
                 footer_text_key = (
                     "queue_footer"
                     if query.replace(" ", "") == ""
                     else "queue_footer_with_query"
                 )
                 embed.set_footer(
-                    text=lang[await get_guild_language(interaction.guild.id)][
-                        footer_text_key
-                    ].format(page=page, total_pages=total_pages, query=query)
+                    text=guild_lang[footer_text_key].format(
+                        page=page,
+                        total_pages=total_pages,
+                        query=query,
+                        remaining=str(
+                            timedelta(seconds=round(player.remaining_duration()))
+                        ),
+                    )
                 )
 
                 return embed, total_pages, options
-            except NothingPlaying:
+            except (NothingPlaying, NotConnected):
                 return (
                     Embeds.message(
-                        title=lang[await get_guild_language(interaction.guild.id)][
-                            class_namespace
-                        ],
-                        message=lang[await get_guild_language(interaction.guild.id)][
-                            "nothing_is_playing"
-                        ],
+                        title=guild_lang[class_namespace],
+                        message=guild_lang["nothing_is_playing"],
                         message_type="warn",
                     ),
                     1,
-                    [
-                        SelectOption(
-                            label=lang[await get_guild_language(interaction.guild.id)][
-                                "music_queue_no_result"
-                            ],
-                            description=lang[
-                                await get_guild_language(interaction.guild.id)
-                            ]["music_queue_no_result_description"],
-                            value="no_result",
-                        )
-                    ],
+                    [no_result_option],
                 )
 
         queue_viewer = QueueViewer(interaction, get_page, player)
         await queue_viewer.navigate()
-        QueueViewer.compute_total_pages(len(await player.current_queue()), 10)
-        self.queue_menus.setdefault(interaction.guild.id, []).append(queue_viewer)
+        ViewRegistry.register(interaction.guild.id, queue_viewer)
 
     @music.subcommand(description=lang[default_language]["music_shuffle_description"])
     @auth_guard.check_permissions("music/shuffle")
@@ -737,6 +747,63 @@ class Music(commands.Cog, EventManager):
                 )
             )
 
+    @music.subcommand(description=lang[default_language]["music_volume_description"])
+    @auth_guard.check_permissions("music/volume")
+    async def volume(
+        self,
+        interaction: Interaction,
+        volume: int = SlashOption(
+            name="volume",
+            description=lang[default_language]["music_volume_level_description"],
+            required=True,
+        ),
+    ):
+        await interaction.response.defer(with_message=True)
+        player = await self.ensure_voice_state(self.bot, interaction)
+        if not player:
+            return
+
+        if not 0 <= volume <= 200:
+            await interaction.followup.send(
+                embed=Embeds.message(
+                    title=lang[await get_guild_language(interaction.guild.id)][
+                        class_namespace
+                    ],
+                    message=lang[await get_guild_language(interaction.guild.id)][
+                        "volume_out_of_range"
+                    ],
+                    message_type="warn",
+                )
+            )
+            return
+
+        try:
+            now_playing = await player.now_playing()
+            await player.set_volume(volume / 100)
+            await interaction.followup.send(
+                embed=Embeds.message(
+                    title=lang[await get_guild_language(interaction.guild.id)][
+                        class_namespace
+                    ],
+                    message=lang[await get_guild_language(interaction.guild.id)][
+                        "changed_volume"
+                    ].format(title=now_playing.name, volume=volume),
+                    message_type="success",
+                )
+            )
+        except (NothingPlaying, EmptyQueue):
+            await interaction.followup.send(
+                embed=Embeds.message(
+                    title=lang[await get_guild_language(interaction.guild.id)][
+                        class_namespace
+                    ],
+                    message=lang[await get_guild_language(interaction.guild.id)][
+                        "nothing_is_playing"
+                    ],
+                    message_type="warn",
+                )
+            )
+
     @music.subcommand(description=lang[default_language]["music_loop_description"])
     @auth_guard.check_permissions("music/loop")
     async def loop(
@@ -821,7 +888,7 @@ class Music(commands.Cog, EventManager):
             )
 
             await menu.update()
-            self.now_playing_menus.setdefault(interaction.guild.id, []).append(menu)
+            ViewRegistry.register(interaction.guild.id, menu)
 
         except (NothingPlaying, EmptyQueue):
             await interaction.followup.send(
@@ -1102,28 +1169,23 @@ class Music(commands.Cog, EventManager):
         period_dict = {"Week": 7, "Month": 30, "Year": 365}
         cutoff_days = period_dict.get(period, 30)
 
-        replay_history = await self.manager.database.get_replay_history(
+        replay_counts = await self.manager.database.get_replay_counts(
             str(interaction.user.id), cutoff_days
         )
+        total_replays = sum(replay_count for _, replay_count in replay_counts)
 
-        replay_aggregate = {}
-        artist_counts = {}
-        total_replays = 0
-
-        for replay in replay_history:
-            video_id = replay["song"]
-            replay_aggregate[video_id] = replay_aggregate.get(video_id, 0) + 1
-            total_replays += 1
-
-        video_metadata = self.manager.database.get_bulk_video_metadata(
-            list(replay_aggregate.keys())
+        video_metadata = self.manager.database.get_bulk_poster_metadata(
+            [video_id for video_id, _ in replay_counts]
         )
 
-        for video_id, replay_count in replay_aggregate.items():
+        artist_counts = {}
+        total_time = 0
+        for video_id, replay_count in replay_counts:
             metadata = video_metadata.get(video_id, {})
             if metadata:
-                artist = metadata.get("channel", "Unknown")
+                artist = metadata.get("channel") or "Unknown"
                 artist_counts[artist] = artist_counts.get(artist, 0) + replay_count
+                total_time += (metadata.get("duration") or 0) * replay_count
 
         top_artist = max(artist_counts, key=artist_counts.get, default="Unknown")
         top_artist_percentage = (
@@ -1133,32 +1195,22 @@ class Music(commands.Cog, EventManager):
         )
 
         result_list = {
-            "total_replayed": len(replay_history),
-            "total_time": 0,
+            "total_replayed": total_replays,
+            "total_time": total_time,
             "replays": [],
             "top_artist": {"name": top_artist, "percentage": top_artist_percentage},
         }
 
-        top_replays = sorted(
-            (
-                (video_id, replay_count)
-                for video_id, replay_count in replay_aggregate.items()
-            ),
-            key=lambda item: item[1],
-            reverse=True,
-        )[:10]
-
-        for video_id, replay_count in top_replays:
+        for video_id, replay_count in replay_counts[:10]:
             metadata = video_metadata.get(video_id, {})
             result_list["replays"].append(
                 {
-                    "title": metadata.get("title", ""),
-                    "artist": metadata.get("channel", ""),
-                    "thumbnails": metadata.get("thumbnails", ""),
+                    "title": metadata.get("title") or "",
+                    "artist": metadata.get("channel") or "",
+                    "poster_thumbnail": metadata.get("poster_thumbnail") or "",
                     "replays": replay_count,
                 }
             )
-            result_list["total_time"] += metadata.get("duration", 0) * replay_count
 
         result_list["replays"].extend(
             {"title": "", "artist": "", "thumbnail": "", "replays": ""}
@@ -1174,11 +1226,13 @@ class Music(commands.Cog, EventManager):
 
         timer = time.time()
         print(colored("Generating Canvas...", "dark_grey"))
-        canvas = await self.bot.loop.run_in_executor(
-            None,
-            lambda: self.generate_canvas(
-                interaction, period, guild_language, result_list
-            ),
+        canvas = await executors.run(
+            "rendering",
+            self.generate_canvas,
+            interaction,
+            period,
+            guild_language,
+            result_list,
         )
 
         with BytesIO() as image_binary:
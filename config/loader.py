@@ -39,6 +39,19 @@ use_custom_emojis = config["use_custom_emojis"]
 use_informal_lang = config["use_informal_lang"]
 included_unmaintained_lang = config["included_unmaintained_lang"]
 use_ytdlp = config["use_ytdlp"]
+extractor_backend = config.get("extractor_backend", "auto")
+ytdlp_pool_size = config.get("ytdlp_pool_size", min(4, os.cpu_count() or 1))
+executor_sizes = config.get("executor_sizes", {})
+ffmpeg_max_processes = config.get("ffmpeg_max_processes", 0)
+ffmpeg_cpu_threshold = config.get("ffmpeg_cpu_threshold", 0)
+ffmpeg_saturation_policy = config.get("ffmpeg_saturation_policy", "degrade")
+replay_retention_days = config.get("replay_retention_days", 0)
+metadata_stale_days = config.get("metadata_stale_days", 7)
+metadata_expire_days = config.get("metadata_expire_days", 28)
+metadata_refresh_interval = config.get("metadata_refresh_interval", 2.0)
+metadata_packs = config.get("metadata_packs", [])
+rpc_mode = config.get("rpc_mode", "loop")
+player_idle_timeout = config.get("player_idle_timeout", 600)
 theme_color = config["theme_color"]
 max_note = config["max_note"]
 point_receive_limit = config["point_receive_limit"]
@@ -28,6 +28,7 @@ from deep_translator import GoogleTranslator
 import asyncio
 import nextcord
 import re
+from bisect import bisect_right
 
 from nextcord import SelectOption
 from nextcord.ext.commands import Bot
@@ -39,11 +40,10 @@ from module.lyrics import get_available_languages, fetch_lyrics
 from module.nextcord_jukebox.music_player import MusicPlayer
 from module.nextcord_jukebox.exceptions import EmptyQueue, NothingPlaying
 from module.nextcord_jukebox.song import Song
+from module.view_registry import ViewRegistry
 
 class_namespace = "music_class_title"
 
-running = {}
-
 
 class LyricsEmbed:
     """
@@ -53,7 +53,8 @@ class LyricsEmbed:
         interaction (nextcord.Interaction): The interaction object.
         player (MusicPlayer): The music player object.
         song (Song): The song object.
-        data (list): The list of lyrics data.
+        data (list): The list of lyrics data, sorted by start time.
+        starts (list): The start time of each line in `data`, for bisecting.
         link (str): The source URL of the lyrics.
         thumbnail (str, optional): The thumbnail URL of the song. Defaults to None.
         title (str): The title of the song.
@@ -62,12 +63,16 @@ class LyricsEmbed:
         follow_up (nextcord.Message, optional): The follow-up message object. Defaults to None.
         captions (list): The list of captions for the lyrics.
         joined (str, optional): The joined string of captions. Defaults to None.
-        last_line (int): The index of the last line of lyrics.
-        next_update (float): The time for the next update.
+        last_line (int): The index of the highlighted line, or -1 before the first render.
+        next_update (float): The start time of the next line, or None after the last line.
         loop_task (asyncio.Task): The task for auto-updating the embed.
         bot (Bot): The bot object.
+        resync_interval (float): The longest the update loop sleeps, so pauses and jumps in the
+            song's timer are picked up even when the next line is far away.
     """
 
+    resync_interval = 1.0
+
     def __init__(
         self,
         interaction: nextcord.Interaction,
@@ -98,11 +103,12 @@ class LyricsEmbed:
         self.source_url = link
         self.is_timeout = False
         self.follow_up = None
-        self.data = data
+        self.data = sorted(data, key=lambda caption: caption["start"])
+        self.starts = [caption["start"] for caption in self.data]
         self.captions = []
         self.joined = None
-        self.last_line = 0
-        self.next_update = 0.0
+        self.last_line = -1
+        self.next_update = None
         self.bot = bot
 
         super().__init__()
@@ -110,17 +116,66 @@ class LyricsEmbed:
         self.loop_task = asyncio.create_task(self.auto_update())
 
     async def auto_update(self):
-        """Automatically updates the embed with the current lyrics."""
+        """
+        Keeps the highlighted line in sync with the song.
+
+        The loop sleeps until the next line starts according to the song's timer, and only
+        edits the message when the highlighted line changes.
+        """
         await asyncio.sleep(1)
         while not self.is_timeout:
-            if not self.song == await self.player.now_playing() or self.is_timeout:
+            try:
+                song = await self.player.now_playing()
+            except (NothingPlaying, EmptyQueue):
+                song = None
+            if not self.song == song or self.is_timeout:
                 await self.timeout_self()
                 break
-            await self.update()
-            await asyncio.sleep(0.01)
 
-    async def update(self):
-        """Updates the embed with the current lyrics."""
+            position = song.timer.elapsed + self.bot.latency
+            line = self.line_at(position)
+            if line != self.last_line:
+                await self.update(line)
+
+            await asyncio.sleep(self.time_until_next_line(song.timer, position, line))
+
+    def line_at(self, position: float) -> int:
+        """
+        Finds the line playing at a position in the song.
+
+        Args:
+            position (float): The position in seconds.
+
+        Returns:
+            int: The index of the last line starting at or before the position, or 0 before
+                the first line.
+        """
+        return max(bisect_right(self.starts, position) - 1, 0)
+
+    def time_until_next_line(self, timer, position: float, line: int) -> float:
+        """
+        Computes how long the update loop can sleep.
+
+        Args:
+            timer (CountTimer): The timer of the playing song.
+            position (float): The current position in seconds.
+            line (int): The highlighted line.
+
+        Returns:
+            float: Seconds until the next line starts, capped at `resync_interval`.
+        """
+        if timer.paused or line + 1 >= len(self.starts):
+            return self.resync_interval
+        return min(max(self.starts[line + 1] - position, 0.01), self.resync_interval)
+
+    async def update(self, line: int = None):
+        """
+        Updates the embed with the current lyrics.
+
+        Args:
+            line (int, optional): The line to highlight. Defaults to the line at the song's
+                current position.
+        """
         try:
             self.song = await self.player.now_playing()
         except (NothingPlaying, EmptyQueue):
@@ -141,32 +196,21 @@ class LyricsEmbed:
                 await self.interaction.message.edit(embed=embed, view=None)
             return
 
+        if line is None:
+            line = self.line_at(self.song.timer.elapsed + self.bot.latency)
+
         self.title = self.song.title
         self.thumbnail = self.song.thumbnail
         self.captions.clear()
 
-        try:
-            for i in range(-2, 3):
-                f = self.data[self.last_line + i]
-                line = re.sub("\n", " ", f["text"]).strip()
-                if i == 0:
-                    self.captions.append(f"**{line}**")
-                else:
-                    if self.last_line == 0 and i < 0:
-                        continue
-                    self.captions.append(f"-# {line}")
-
-        except IndexError:
-            pass
-
-        if (
-            self.song.timer.elapsed + self.bot.latency
-            < self.data[self.last_line + 1]["start"]
-        ):
-            pass
-        else:
-            self.next_update = self.data[self.last_line + 1]
-            self.last_line += 1
+        for index in range(max(line - 2, 0), min(line + 3, len(self.data))):
+            text = re.sub("\n", " ", self.data[index]["text"]).strip()
+            self.captions.append(f"**{text}**" if index == line else f"-# {text}")
+
+        self.last_line = line
+        self.next_update = (
+            self.starts[line + 1] if line + 1 < len(self.starts) else None
+        )
 
         self.joined = "\n".join(self.captions)
 
@@ -193,6 +237,7 @@ class LyricsEmbed:
     async def timeout_self(self):
         """Timeout the view and stop the auto-update task."""
         self.is_timeout = True
+        ViewRegistry.unregister(self)
         await self.interaction.followup.edit_message(
             message_id=self.follow_up.id, view=None
         )
@@ -240,8 +285,7 @@ class TranslateDropdown(nextcord.ui.Select):
         """
         await interaction.response.defer()
 
-        for _ in running:
-            await running[interaction.guild.id][0].timeout_self()
+        await ViewRegistry.retire(interaction.guild.id, LyricsEmbed)
 
         if not self.values[0][-1] == "*":
             captions = await fetch_lyrics(link=self.link, language_code=self.values[0])
@@ -254,31 +298,6 @@ class TranslateDropdown(nextcord.ui.Select):
             except Exception as e:
                 raise e
 
-        def clean_text(raw_text):
-            """Remove HTML-like tags and extra spaces from the caption text."""
-            cleaned_text = re.sub(r"<[^>]+>", "", raw_text)
-            return cleaned_text.strip()
-
-        def deduplicate_captions(captions):
-            """Deduplicate captions based on start and end times."""
-            unique_captions = {}
-            for caption in captions:
-                key = (caption["start"], caption["end"])
-                text = clean_text(caption["text"])
-                if key not in unique_captions:
-                    unique_captions[key] = text
-                else:
-                    if text not in unique_captions[key]:
-                        unique_captions[key] += f"\n{text}"
-
-            result = [
-                {"start": start, "end": end, "duration": end - start, "text": text}
-                for (start, end), text in unique_captions.items()
-            ]
-            return result
-
-        captions = deduplicate_captions(captions)
-
         menu = LyricsEmbed(
             interaction,
             player=self.player,
@@ -288,8 +307,8 @@ class TranslateDropdown(nextcord.ui.Select):
             bot=self.bot,
         )
 
+        ViewRegistry.register(interaction.guild.id, menu, menu.loop_task)
         await menu.update()
-        running.setdefault(interaction.guild.id, []).append(menu)
 
 
 class LyricsLangEmbed(nextcord.ui.View):
@@ -21,7 +21,6 @@
 #  ------------------------------------------------------------
 #
 
-import asyncio
 from datetime import datetime, timedelta
 from typing import Callable
 
@@ -37,6 +36,8 @@ from module.nextcord_jukebox.music_player import MusicPlayer
 from module.nextcord_jukebox.song import Song
 from module.progressBar import progressBar
 from module.embeds.lyrics import LyricsLangEmbed
+from module.refresh_scheduler import RefreshScheduler
+from module.view_registry import ViewRegistry
 
 class_namespace = "music_class_title"
 
@@ -88,27 +89,38 @@ class NowPlayingMenu(nextcord.ui.View):
         self.is_timeout = False
         self.source_url = self.song.source_url
         self.last_interact = datetime.now()
-        self.__timeout = 180
+        self.progress_size = 15
 
-        super().__init__()
+        super().__init__(timeout=180)
 
-        self.loop_task = asyncio.create_task(self.auto_update())
+    def next_refresh(self):
+        """
+        Returns how long until the embed changes on its own.
 
-    async def auto_update(self):
-        """Automatically update the Now Playing embed every 0.5 seconds."""
-        await asyncio.sleep(1)
-        while not self.is_timeout:
-            if (datetime.now() - self.last_interact).total_seconds() > self.__timeout:
-                await self.timeout_self()
-                break
-            await self.update()
-            await asyncio.sleep(0.5)
+        While a song plays, this is the time until the progress bar moves one step. The
+        refresh scheduler clamps it to its own bounds, so the elapsed time shown still
+        refreshes regularly.
 
-    async def update(self):
-        """Update the Now Playing embed and buttons."""
+        Returns:
+            Optional[float]: Seconds until the next change, or None while paused or idle.
+        """
+        if self.song is None or not self.song.timer.running or not self.song.duration:
+            return None
+        step = self.song.duration / self.progress_size
+        elapsed = self.song.timer.elapsed
+        return (round(elapsed / step) + 0.5) * step - elapsed
+
+    async def render(self):
+        """
+        Renders the Now Playing embed and buttons.
+
+        Returns:
+            dict: The `embed` and `view` to send.
+        """
         try:
             self.song = await self.player.now_playing()
         except (NothingPlaying, EmptyQueue):
+            self.song = None
             embed = Embeds.message(
                 title=lang[await get_guild_language(self.interaction.guild.id)][
                     class_namespace
@@ -118,13 +130,7 @@ class NowPlayingMenu(nextcord.ui.View):
                 ],
                 message_type="warn",
             )
-            if self.follow_up is not None:
-                await self.interaction.followup.edit_message(
-                    message_id=self.follow_up.id, embed=embed, view=None
-                )
-            else:
-                await self.interaction.followup.send(embed=embed)
-            return
+            return {"embed": embed, "view": None}
 
         self.title = self.song.title
         self.thumbnail = self.song.thumbnail
@@ -142,7 +148,9 @@ class NowPlayingMenu(nextcord.ui.View):
 
         elapsed_time_str = str(timedelta(seconds=round(time_elapsed)))
         duration_str = str(timedelta(seconds=self.song.duration))
-        progress_bar = progressBar.splitBar(self.song.duration, round(time_elapsed))[0]
+        progress_bar = progressBar.splitBar(
+            self.song.duration, round(time_elapsed), size=self.progress_size
+        )[0]
 
         embed.add_field(
             name=f"{progress_bar} | {elapsed_time_str}/{duration_str}",
@@ -153,17 +161,23 @@ class NowPlayingMenu(nextcord.ui.View):
         embed.set_footer(text=f"🔗 {self.song.url}")
 
         await self.update_button()
+        return {"embed": embed, "view": self}
 
-        if self.follow_up is None:
-            follow_up_id: nextcord.Message = await self.interaction.followup.send(
-                embed=embed, view=self
-            )
+    async def update(self):
+        """
+        Sends the Now Playing embed, or asks the guild's refresh scheduler to update it.
 
-            self.follow_up = follow_up_id
-        else:
-            await self.interaction.followup.edit_message(
-                message_id=self.follow_up.id, embed=embed, view=self
-            )
+        Edits are coalesced by the scheduler, so calling this repeatedly is cheap.
+        """
+        scheduler = RefreshScheduler.of(self.interaction.guild.id)
+        if self.follow_up is not None:
+            scheduler.request(self)
+            return
+
+        payload = await self.render()
+        self.follow_up = await self.interaction.followup.send(**payload)
+        if payload["view"] is not None:
+            scheduler.register(self, payload)
 
     async def update_button(self):
         """Update the play/pause button based on the playing state."""
@@ -407,9 +421,16 @@ class NowPlayingMenu(nextcord.ui.View):
                 message_id=self.follow_up.id, view=None
             )
 
+    async def on_timeout(self):
+        """Handles the timeout event by removing the buttons."""
+        await self.timeout_self()
+
     async def timeout_self(self):
-        """Timeout the view and stop the auto-update task."""
+        """Timeout the view and stop refreshing it."""
         self.is_timeout = True
+        RefreshScheduler.of(self.interaction.guild.id).unregister(self)
+        ViewRegistry.unregister(self)
+        self.stop()
         await self.interaction.followup.edit_message(
             message_id=self.follow_up.id, view=None
         )
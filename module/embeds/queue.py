@@ -22,13 +22,16 @@
 #
 
 import asyncio
-from typing import Callable, Optional
+import time
+from typing import Callable, List, Optional, Tuple
 
 import nextcord
 
 from config.loader import lang
 from database.guild_handler import get_guild_language
 from module.emoji import get_emoji
+from module.matcher import SongSearchIndex
+from module.view_registry import ViewRegistry
 
 
 class Search(nextcord.ui.Modal):
@@ -104,6 +107,7 @@ class QueueViewer(nextcord.ui.View):
         total_pages (Optional[int]): The total number of pages.
         index (int): The current page index.
         guild_language (str): The language of the guild.
+        render_us (Optional[int]): How long the last page took to render, in microseconds.
     """
 
     def __init__(self, interaction: nextcord.Interaction, get_page: Callable, player):
@@ -112,7 +116,9 @@ class QueueViewer(nextcord.ui.View):
 
         Args:
             interaction (nextcord.Interaction): The interaction that initiated the pagination.
-            get_page (Callable): The function to get the page data.
+            get_page (Callable): The function to get the page data. It is called as
+                `get_page(page, results, query=...)`, where `results` is the cached list of
+                `(position, song)` pairs returned by `results()`.
         """
         super().__init__(timeout=180)
 
@@ -125,13 +131,71 @@ class QueueViewer(nextcord.ui.View):
         self.guild_language = asyncio.run(get_guild_language(interaction.guild.id))
         self.player = player
         self.is_timeout = False
+        self.render_us: Optional[int] = None
+
+        self._snapshot: List[Tuple[int, object]] = []
+        self._snapshot_key: Optional[tuple] = None
 
         self.dropdown = SkipDropdown(self, self.guild_language, self.player)
         self.add_item(self.dropdown)
 
+    def results(self) -> List[Tuple[int, object]]:
+        """
+        Returns the songs matching the current search query, with their queue positions.
+
+        The list is a snapshot keyed by the queue's mutation counter and the query, so page
+        turns slice the cached list and only a queue change or a new query rebuilds it.
+
+        Returns:
+            List[Tuple[int, Song]]: `(position, song)` pairs in display order.
+        """
+        queue = self.player.music_queue
+        key = (id(queue), queue.version, self.search_query)
+        if key != self._snapshot_key:
+            self._snapshot = self._build_snapshot(queue, self.search_query)
+            self._snapshot_key = key
+        return self._snapshot
+
+    @staticmethod
+    def _build_snapshot(queue, query: str) -> List[Tuple[int, object]]:
+        """
+        Builds the `(position, song)` list for a queue and a search query.
+
+        Args:
+            queue (SongQueue): The queue to list.
+            query (str): The search query, or an empty string for the whole queue.
+
+        Returns:
+            List[Tuple[int, Song]]: `(position, song)` pairs in display order.
+        """
+        if query.replace(" ", "") == "":
+            return list(enumerate(queue))
+
+        positions = {}
+        for position, song in enumerate(queue):
+            positions.setdefault(id(song), position)
+        return [
+            (positions[id(song)], song)
+            for song, _ in SongSearchIndex.of(queue).match(queue, query, threshold=0.8)
+        ]
+
+    async def render(self):
+        """
+        Renders the current page from the cached results.
+
+        Returns:
+            tuple: The embed, the total number of pages and the skip dropdown options.
+        """
+        start = time.perf_counter()
+        page = await self.get_page(
+            self.index, self.results(), query=self.search_query
+        )
+        self.render_us = round((time.perf_counter() - start) * 1_000_000)
+        return page
+
     async def navigate(self):
         """Navigates to the initial page and sends the first message."""
-        emb, self.total_pages, options = await self.get_page(self.index)
+        emb, self.total_pages, options = await self.render()
         self.dropdown.options = options
         if self.total_pages == 1:
             follow_up_msg: nextcord.Message = await self.interaction.followup.send(
@@ -147,9 +211,7 @@ class QueueViewer(nextcord.ui.View):
 
     async def edit_page(self):
         """Edits the current page based on the search query and page index."""
-        emb, self.total_pages, options = await self.get_page(
-            self.index, query=self.search_query
-        )
+        emb, self.total_pages, options = await self.render()
         self.dropdown.options = options
 
         if self.index == 0 and self.total_pages != 0:
@@ -254,7 +316,13 @@ class QueueViewer(nextcord.ui.View):
 
     async def on_timeout(self):
         """Handles the timeout event by removing pagination buttons."""
+        await self.timeout_self()
+
+    async def timeout_self(self):
+        """Timeout the view and remove the pagination buttons."""
         self.is_timeout = True
+        ViewRegistry.unregister(self)
+        self.stop()
 
         await self.interaction.followup.edit_message(
             message_id=self.follow_up.id, view=None
@@ -21,21 +21,138 @@
 #  ------------------------------------------------------------
 #
 
+import asyncio
+import re
+from collections import OrderedDict
+
 from meta_yt import YouTube
 from deep_translator import GoogleTranslator
 from langdetect import detect
 
+from module.nextcord_jukebox.executors import executors
+from module.nextcord_jukebox.utils import get_video_id
 
-async def get_available_languages(link: str):
+
+class CaptionCache:
     """
-    Get available languages for captions from a YouTube video
+    Caches caption tracks and their translations by video and language.
 
-    Args:
-        link (str): YouTube video link
+    Lookups go through an in-memory LRU first, then the jukebox database once one is attached,
+    and only then to YouTube and the translator in the misc executor. Concurrent requests for
+    the same key share a single fetch.
 
-    Returns:
-        dict: Available languages
+    Attributes:
+        database (Database | None): The jukebox database used as the persistent tier.
+        max_entries (int): The number of entries kept in memory.
+        hits (int): Lookups served from memory.
+        db_hits (int): Lookups served from the database.
+        misses (int): Lookups that had to fetch from YouTube.
     """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries (int, optional): The number of entries kept in memory. Defaults to 128.
+        """
+        self.database = None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+
+    def attach(self, database):
+        """
+        Uses a jukebox database as the persistent tier.
+
+        Args:
+            database (Database): The database to store captions in.
+        """
+        self.database = database
+
+    def _remember(self, key: tuple, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _single_flight(self, key: tuple, load):
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(load())
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def languages(self, link: str) -> dict:
+        """
+        Returns the caption languages a video provides.
+
+        Args:
+            link (str): YouTube video link
+
+        Returns:
+            dict: Language names mapped to language codes.
+        """
+        key = (await get_video_id(link) or link, None, False)
+
+        async def load():
+            self.misses += 1
+            languages = await executors.run("misc", _get_available_languages, link)
+            self._remember(key, languages)
+            return languages
+
+        return await self._single_flight(key, load)
+
+    async def captions(self, link: str, language_code: str, translate: bool) -> list:
+        """
+        Returns the cleaned and deduplicated captions of a video.
+
+        Args:
+            link (str): YouTube video link
+            language_code (str): Language code
+            translate (bool): Translate the captions into the language rather than use the video's own track.
+
+        Returns:
+            list: Caption lines sorted by start time.
+        """
+        video_id = await get_video_id(link)
+        key = (video_id or link, language_code, translate)
+
+        async def load():
+            captions = None
+            if self.database is not None and video_id is not None:
+                captions = self.database.get_cached_captions(
+                    video_id, language_code, translate
+                )
+            if captions is not None:
+                self.db_hits += 1
+            else:
+                self.misses += 1
+                captions = await executors.run(
+                    "misc", _fetch_lyrics, link, language_code, translate
+                )
+                if self.database is not None and video_id is not None:
+                    self.database.cache_captions(
+                        video_id, language_code, translate, captions
+                    )
+            self._remember(key, captions)
+            return captions
+
+        return await self._single_flight(key, load)
+
+
+caption_cache = CaptionCache()
+
+
+def _get_available_languages(link: str):
     captions = YouTube(link).video.get_captions()
     return (
         {caption.language: caption.language_code for caption in captions}
@@ -44,6 +161,19 @@ async def get_available_languages(link: str):
     )
 
 
+async def get_available_languages(link: str):
+    """
+    Get available languages for captions from a YouTube video
+
+    Args:
+        link (str): YouTube video link
+
+    Returns:
+        dict: Available languages
+    """
+    return await caption_cache.languages(link)
+
+
 async def fetch_lyrics(link: str, language_code: str, translate: bool = False):
     """
     Fetch lyrics from a YouTube video
@@ -54,8 +184,42 @@ async def fetch_lyrics(link: str, language_code: str, translate: bool = False):
         translate (bool, optional): Translate the lyrics. Defaults to False.
 
     Returns:
-        dict: Lyrics
+        list: Lyrics, cleaned, deduplicated and sorted by start time
     """
+    return await caption_cache.captions(link, language_code, translate)
+
+
+def clean_text(raw_text: str) -> str:
+    """Remove HTML-like tags and extra spaces from the caption text."""
+    cleaned_text = re.sub(r"<[^>]+>", "", raw_text)
+    return cleaned_text.strip()
+
+
+def deduplicate_captions(captions: list) -> list:
+    """Deduplicate captions based on start and end times."""
+    unique_captions = {}
+    for caption in captions:
+        key = (caption["start"], caption["end"])
+        text = clean_text(caption["text"] or "")
+        if key not in unique_captions:
+            unique_captions[key] = text
+        else:
+            if text not in unique_captions[key]:
+                unique_captions[key] += f"\n{text}"
+
+    result = [
+        {"start": start, "end": end, "duration": end - start, "text": text}
+        for (start, end), text in unique_captions.items()
+    ]
+    result.sort(key=lambda caption: caption["start"])
+    return result
+
+
+def _fetch_lyrics(link: str, language_code: str, translate: bool):
+    return deduplicate_captions(_fetch_raw_lyrics(link, language_code, translate))
+
+
+def _fetch_raw_lyrics(link: str, language_code: str, translate: bool):
     data = {}
     base_transcript = []
     lyrics = {}
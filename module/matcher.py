@@ -22,9 +22,17 @@
 #
 
 import re
+from collections import Counter, defaultdict
 
 from termcolor import colored
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_BATCH_MIN = 32
+
 
 class SongMatcher:
     """A class for matching songs based on a query string."""
@@ -59,6 +67,145 @@ class SongMatcher:
 
         return prev[-1]
 
+    @classmethod
+    def max_dist(cls, len1, len2, threshold):
+        """
+        Computes the largest Levenshtein distance at which two strings can still reach a similarity threshold.
+
+        Args:
+            len1 (int): The length of the first string.
+            len2 (int): The length of the second string.
+            threshold (float): The similarity threshold.
+
+        Returns:
+            int: The distance bound. The small epsilon keeps the bound from rounding below the float comparison in `match`.
+        """
+        return int((1 - threshold) * max(len1, len2) + 1e-9)
+
+    @classmethod
+    def bounded_lev_dist(cls, s1, s2, bound):
+        """
+        Computes the Levenshtein distance between two strings if it is at most `bound`.
+
+        Only the diagonal band of width 2 * bound + 1 is computed (Ukkonen), and the
+        computation stops as soon as a whole row exceeds the bound.
+
+        Args:
+            s1 (str): The first string.
+            s2 (str): The second string.
+            bound (int): The largest distance of interest.
+
+        Returns:
+            int: The Levenshtein distance, or bound + 1 if it exceeds the bound.
+        """
+        if len(s1) < len(s2):
+            s1, s2 = s2, s1
+        n, m = len(s1), len(s2)
+        over = bound + 1
+        if n - m > bound:
+            return over
+        if m == 0:
+            return n
+
+        prev = [j if j <= bound else over for j in range(m + 1)]
+        for i in range(1, n + 1):
+            curr = [over] * (m + 1)
+            if i <= bound:
+                curr[0] = i
+            row_min = curr[0]
+            c1 = s1[i - 1]
+            for j in range(max(1, i - bound), min(m, i + bound) + 1):
+                value = min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + (c1 != s2[j - 1]))
+                if value > over:
+                    value = over
+                curr[j] = value
+                if value < row_min:
+                    row_min = value
+            if row_min > bound:
+                return over
+            prev = curr
+        return prev[m]
+
+    @classmethod
+    def batch_lev_dist(cls, s1, targets, bounds):
+        """
+        Computes the Levenshtein distance between one string and many targets at once with NumPy.
+
+        The dynamic-programming rows of every target advance together, one character of
+        `s1` at a time, and the computation stops once every target exceeds its bound.
+
+        Args:
+            s1 (str): The string compared against every target.
+            targets (list of str): The target strings.
+            bounds (list of int): The largest distance of interest per target.
+
+        Returns:
+            list of int: The distance per target, or its bound + 1 where it exceeds the bound.
+        """
+        lengths = np.fromiter((len(t) for t in targets), dtype=np.int64, count=len(targets))
+        limits = np.asarray(bounds, dtype=np.int64)
+        width = int(lengths.max()) if len(targets) else 0
+        codes = np.full((len(targets), width), -1, dtype=np.int64)
+        for row, target in enumerate(targets):
+            codes[row, : len(target)] = [ord(c) for c in target]
+
+        steps = np.arange(width + 1, dtype=np.int64)
+        prev = np.broadcast_to(steps, (len(targets), width + 1)).copy()
+        for i, c1 in enumerate(s1, start=1):
+            best = np.empty_like(prev)
+            best[:, 0] = i
+            np.minimum(prev[:, :-1] + (codes != ord(c1)), prev[:, 1:] + 1, out=best[:, 1:])
+            prev = np.minimum.accumulate(best - steps, axis=1) + steps
+            if (prev.min(axis=1) > limits).all():
+                return [bound + 1 for bound in bounds]
+        dists = prev[np.arange(len(targets)), lengths]
+        return np.where(dists > limits, limits + 1, dists).tolist()
+
+    @classmethod
+    def term_sims(cls, q_term, t_terms, threshold, use_numpy=None):
+        """
+        Computes the similarity scores between a query term and many target terms for a threshold.
+
+        Targets whose length difference alone rules out the threshold are skipped, and the
+        rest are scored with a distance bounded by the threshold, in one NumPy batch when
+        NumPy is installed and there are enough targets.
+
+        Args:
+            q_term (str): The query term.
+            t_terms (list of str): The target terms.
+            threshold (float): The similarity threshold.
+            use_numpy (bool | None): Whether to use the NumPy batch path, None to decide by batch size.
+
+        Returns:
+            list of float: The score per target term. Scores reaching the threshold are exact,
+                lower scores are replaced by an upper bound that is still below the threshold.
+        """
+        q_len = len(q_term)
+        scores = [0.0] * len(t_terms)
+        pending, bounds = [], []
+        for index, t_term in enumerate(t_terms):
+            max_len = max(q_len, len(t_term))
+            bound = cls.max_dist(q_len, len(t_term), threshold)
+            if abs(q_len - len(t_term)) > bound:
+                scores[index] = cls.calc_score(bound + 1, max_len)
+            else:
+                pending.append(index)
+                bounds.append(bound)
+
+        if use_numpy is None:
+            use_numpy = np is not None and len(pending) >= NUMPY_BATCH_MIN
+        if use_numpy and pending:
+            dists = cls.batch_lev_dist(q_term, [t_terms[i] for i in pending], bounds)
+        else:
+            dists = [
+                cls.bounded_lev_dist(q_term, t_terms[i], bound)
+                for i, bound in zip(pending, bounds)
+            ]
+
+        for index, dist in zip(pending, dists):
+            scores[index] = cls.calc_score(dist, max(q_len, len(t_terms[index])))
+        return scores
+
     @classmethod
     def calc_score(cls, dist, max_len):
         """
@@ -99,7 +246,7 @@ class SongMatcher:
             float: The similarity score (between 0 and 1).
         """
         max_len = max(len(q_term), len(t_term))
-        dist = cls.lev_dist(q_term, t_term)
+        dist = cls.bounded_lev_dist(q_term, t_term, max_len)
         return cls.calc_score(dist, max_len)
 
     @classmethod
@@ -162,9 +309,9 @@ class SongMatcher:
                     break
 
                 # Compare against split terms
-                for t_term in combined_terms:
-                    sim_score = cls.term_sim(q_term, t_term)
-                    highest_score = max(highest_score, sim_score)
+                highest_score = max(
+                    highest_score, *cls.term_sims(q_term, combined_terms, threshold)
+                )
 
                 if highest_score >= threshold:
                     match_found = True
@@ -185,6 +332,216 @@ class SongMatcher:
         return results
 
 
+def trigrams(text):
+    """
+    Counts the character trigrams of a text.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        Counter: The number of occurrences of every trigram.
+    """
+    return Counter(text[i : i + 3] for i in range(len(text) - 2))
+
+
+class SongSearchIndex:
+    """
+    A search index over a queue of songs that returns the same results as `SongMatcher.match`.
+
+    Titles and channels are normalized and split once when a song is added. Substring
+    matches are looked up through a trigram index over the normalized strings, and fuzzy
+    term matches are only scored for vocabulary terms that pass a length filter and the
+    q-gram count filter (strings within edit distance d share at least
+    max(len) - 2 - 3d trigrams), so most of the queue is never compared.
+
+    Attributes:
+        case_sens (bool): Whether matching is case-sensitive.
+    """
+
+    def __init__(self, songs=(), case_sens=False):
+        """
+        Initializes the index with the given songs.
+
+        Args:
+            songs (list of Song): The songs to index.
+            case_sens (bool): Whether matching is case-sensitive.
+        """
+        self.case_sens = case_sens
+        self._entries = {}
+        self._song_grams = defaultdict(set)
+        self._term_songs = defaultdict(set)
+        self._term_grams = defaultdict(dict)
+        self._lengths = defaultdict(set)
+        self.update(list(songs), [])
+
+    @classmethod
+    def of(cls, song_queue, case_sens=False):
+        """
+        Returns the index attached to a queue, building it on first use. The index is stored
+        on the queue itself, since a `SongQueue` is a list and cannot be a dict key, and
+        follows later changes through the queue's listeners.
+
+        Args:
+            song_queue (SongQueue): The queue to index.
+            case_sens (bool): Whether matching is case-sensitive.
+
+        Returns:
+            SongSearchIndex: The attached index.
+        """
+        index = getattr(song_queue, "_search_index", None)
+        if index is None or index.case_sens != case_sens:
+            if index is not None:
+                song_queue.remove_listener(index.update)
+            index = cls(song_queue, case_sens=case_sens)
+            song_queue.add_listener(index.update)
+            song_queue._search_index = index
+        return index
+
+    def _process(self, text):
+        text = SongMatcher.normalize_text(text)
+        return text if self.case_sens else text.lower()
+
+    def update(self, added, removed):
+        """
+        Adds and removes songs. Used as a `SongQueue` listener.
+
+        Args:
+            added (list of Song): The songs added to the queue.
+            removed (list of Song): The songs removed from the queue.
+        """
+        for song in added:
+            key = id(song)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[3] += 1
+                continue
+            title = self._process(song.name)
+            channel = self._process(song.channel)
+            terms = set(SongMatcher.split(title) + SongMatcher.split(channel))
+            self._entries[key] = [song, title, channel, 1, terms]
+            for gram in set(trigrams(title)) | set(trigrams(channel)):
+                self._song_grams[gram].add(key)
+            for term in terms:
+                if not self._term_songs[term]:
+                    self._add_term(term)
+                self._term_songs[term].add(key)
+
+        for song in removed:
+            key = id(song)
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            entry[3] -= 1
+            if entry[3] > 0:
+                continue
+            del self._entries[key]
+            _, title, channel, _, terms = entry
+            for gram in set(trigrams(title)) | set(trigrams(channel)):
+                self._song_grams[gram].discard(key)
+                if not self._song_grams[gram]:
+                    del self._song_grams[gram]
+            for term in terms:
+                self._term_songs[term].discard(key)
+                if not self._term_songs[term]:
+                    del self._term_songs[term]
+                    self._remove_term(term)
+
+    def _add_term(self, term):
+        self._lengths[len(term)].add(term)
+        for gram, count in trigrams(term).items():
+            self._term_grams[gram][term] = count
+
+    def _remove_term(self, term):
+        self._lengths[len(term)].discard(term)
+        if not self._lengths[len(term)]:
+            del self._lengths[len(term)]
+        for gram in trigrams(term):
+            self._term_grams[gram].pop(term, None)
+            if not self._term_grams[gram]:
+                del self._term_grams[gram]
+
+    def _substring_candidates(self, q_term):
+        grams = set(trigrams(q_term))
+        if not grams:
+            return self._entries.keys()
+        postings = sorted(
+            (self._song_grams.get(gram, set()) for gram in grams), key=len
+        )
+        return set.intersection(*postings)
+
+    def _fuzzy_candidates(self, q_term, threshold):
+        q_len = len(q_term)
+        scan, bounds = [], {}
+        for length in self._lengths:
+            longest = max(length, q_len)
+            max_dist = int((1 - threshold) * longest + 1e-9)
+            if abs(length - q_len) > max_dist:
+                continue
+            min_common = longest - 2 - 3 * max_dist
+            if min_common <= 0:
+                scan.append(length)
+            else:
+                bounds[length] = min_common
+
+        candidates = [term for length in scan for term in self._lengths[length]]
+        if bounds:
+            common = Counter()
+            for gram, q_count in trigrams(q_term).items():
+                for term, count in self._term_grams.get(gram, {}).items():
+                    common[term] += min(q_count, count)
+            candidates.extend(
+                term
+                for term, shared in common.items()
+                if shared >= bounds.get(len(term), q_len + len(term))
+            )
+        return candidates
+
+    def match(self, song_queue, query, threshold=0.8):
+        """
+        Matches songs from the song queue based on the query string, like `SongMatcher.match`.
+
+        Args:
+            song_queue (list of Song): The songs to return results for, in queue order. Every song must be indexed.
+            query (str): The query string.
+            threshold (float): The minimum similarity score to consider a match.
+
+        Returns:
+            list of tuple: A list of tuples containing matched songs and their scores.
+        """
+        if not self.case_sens:
+            query = query.lower()
+        q_terms = SongMatcher.split(SongMatcher.normalize_text(query))
+        scores = {}
+
+        for q_term in q_terms:
+            for key in self._substring_candidates(q_term):
+                if key in scores:
+                    continue
+                _, title, channel, _, _ = self._entries[key]
+                if q_term in title or q_term in channel:
+                    scores[key] = 1
+
+            best = {}
+            candidates = self._fuzzy_candidates(q_term, threshold)
+            for term, score in zip(
+                candidates, SongMatcher.term_sims(q_term, candidates, threshold)
+            ):
+                if score < threshold:
+                    continue
+                for key in self._term_songs[term]:
+                    if key not in scores and score > best.get(key, 0):
+                        best[key] = score
+            scores.update(best)
+
+            if len(scores) == len(self._entries):
+                break
+
+        results = [(song, scores[id(song)]) for song in song_queue if id(song) in scores]
+        results.sort(key=lambda x: x[1], reverse=True)
+        return results
+
+
 class Song:
     """
     A class representing a song with a name and a channel.
@@ -199,69 +556,70 @@ class Song:
         self.channel = channel
 
 
+EXAMPLE_SONGS = [
+    Song(
+        name="夕刻、夢ト見紛ウ / アステル・レダ × カグラナナ【 歌ってみた 】",
+        channel="カグラナナ",
+    ),
+    Song(
+        name="【歌ってみた】一度だけの恋なら【とこ尊楓リゼるる】",
+        channel="戌亥とこ",
+    ),
+    Song(
+        name="仮死化 / 遼遼 (Covered by ゆめおいまちた)【歌ってみた/にじさんじ/夢追翔/町田ちま】",
+        channel="夢追翔のJUKEBOX",
+    ),
+    Song(name="[MV] We don't talk anymore", channel="Justin Bieber"),
+    Song(
+        name="【歌衣メイカ爆誕祭2024】W/X/Y／歌衣メイカ × アステル・レダ",
+        channel="歌衣メイカ",
+    ),
+    Song(
+        name="【Original MV&Inst】可愛くてごめん/HoneyWorks 歌ってみた【Covered by 七海うらら】",
+        channel="七海うらら",
+    ),
+    Song(
+        name="【アステル4周年LIVE】でんでんぱっしょん／アステル・レダ × 奏手イヅル × 影山シエン × 夜十神封魔 × 羽継烏有 × 緋崎ガンマ〈AI 高画質化〉",
+        channel="アステル・レダ",
+    ),
+    Song(
+        name="Masayoshi Oishi - SHINDA! [Official Video]", channel="Oishi Masayoshi"
+    ),
+    Song(
+        name="【MV】常夜鬼譚／竜胆尊【オリジナル曲】",
+        channel="竜胆 尊 / Rindou Mikoto",
+    ),
+    Song(
+        name="Alice in Musicland ・*✧Special Edition",
+        channel="VOCALOID",
+    ),
+    Song(
+        name="四月は君の嘘『オレンジ』 / Kaga Sumire＆Nazuna (Cover)",
+        channel="Kaga Sumire",
+    ),
+]
+
+EXAMPLE_QUERIES = [
+    "cover",
+    "仮死化",
+    "covered by 町田ちま",
+    "夢追翔 and 町田ちま",
+    "一度だけの恋なら とこ",
+    "   一度だ  け  の   恋   なら",
+    "カグラナナ",
+    "アステル レダ",
+    "アステルレダ",
+    "w/x/y",
+    "alice in musicland",
+    "オレンジ",
+]
+
+
 if __name__ == "__main__":
-    songs = [
-        Song(
-            name="夕刻、夢ト見紛ウ / アステル・レダ × カグラナナ【 歌ってみた 】",
-            channel="カグラナナ",
-        ),
-        Song(
-            name="【歌ってみた】一度だけの恋なら【とこ尊楓リゼるる】",
-            channel="戌亥とこ",
-        ),
-        Song(
-            name="仮死化 / 遼遼 (Covered by ゆめおいまちた)【歌ってみた/にじさんじ/夢追翔/町田ちま】",
-            channel="夢追翔のJUKEBOX",
-        ),
-        Song(name="[MV] We don't talk anymore", channel="Justin Bieber"),
-        Song(
-            name="【歌衣メイカ爆誕祭2024】W/X/Y／歌衣メイカ × アステル・レダ",
-            channel="歌衣メイカ",
-        ),
-        Song(
-            name="【Original MV&Inst】可愛くてごめん/HoneyWorks 歌ってみた【Covered by 七海うらら】",
-            channel="七海うらら",
-        ),
-        Song(
-            name="【アステル4周年LIVE】でんでんぱっしょん／アステル・レダ × 奏手イヅル × 影山シエン × 夜十神封魔 × 羽継烏有 × 緋崎ガンマ〈AI 高画質化〉",
-            channel="アステル・レダ",
-        ),
-        Song(
-            name="Masayoshi Oishi - SHINDA! [Official Video]", channel="Oishi Masayoshi"
-        ),
-        Song(
-            name="【MV】常夜鬼譚／竜胆尊【オリジナル曲】",
-            channel="竜胆 尊 / Rindou Mikoto",
-        ),
-        Song(
-            name="Alice in Musicland ・*✧Special Edition",
-            channel="VOCALOID",
-        ),
-        Song(
-            name="四月は君の嘘『オレンジ』 / Kaga Sumire＆Nazuna (Cover)",
-            channel="Kaga Sumire",
-        ),
-    ]
-
-    queries = [
-        "cover",
-        "仮死化",
-        "covered by 町田ちま",
-        "夢追翔 and 町田ちま",
-        "一度だけの恋なら とこ",
-        "   一度だ  け  の   恋   なら",
-        "カグラナナ",
-        "アステル レダ",
-        "アステルレダ",
-        "w/x/y",
-        "alice in musicland",
-        "オレンジ",
-    ]
-
-    for q in queries:
+    for q in EXAMPLE_QUERIES:
         print(f"Matches for '{q}':")
         matches = SongMatcher.match(
-            songs, q, case_sens=False, threshold=0.8, debug=True
+            EXAMPLE_SONGS, q, case_sens=False, threshold=0.8, debug=True
         )
         for t, s in matches:
             print(colored(f"Match >  {t.name} (Score: {s:.2f})", "green"))
@@ -21,7 +21,9 @@
 #  ------------------------------------------------------------
 #
 
+import asyncio
 import inspect
+import time
 
 from . import LogHandler
 
@@ -30,13 +32,25 @@ class EventManager:
     """
     A class for managing event listeners and dispatching events to attached cog instances.
 
+    Listeners are registered per class with the `listener` decorator. Attaching an instance
+    binds its listeners into a dispatch table, so firing an event only walks the callables
+    registered for it. Listeners of one event run concurrently, each with its own timeout,
+    and a failing listener is logged without affecting the others or the caller.
+
     Attributes:
         _event_listeners (dict): A dictionary of event listeners keyed by event names.
         _cog_instances (list): A list of attached cog instances.
+        _dispatch (dict): Bound listeners of the attached instances keyed by event names.
+        _stats (dict): Dispatch counters keyed by event names.
+        listener_timeout (float): Seconds a listener may run before it is cancelled.
     """
 
     _event_listeners = {}
     _cog_instances = []
+    _dispatch = {}
+    _stats = {}
+    _background = set()
+    listener_timeout = 30.0
 
     @classmethod
     def listener(cls, func):
@@ -53,6 +67,8 @@ class EventManager:
         if event_name not in cls._event_listeners:
             cls._event_listeners[event_name] = []
         cls._event_listeners[event_name].append(func)
+        if cls._cog_instances:
+            cls._rebuild()
         LogHandler.info(f"Started Listening on function {event_name}")
         return func
 
@@ -66,12 +82,40 @@ class EventManager:
         """
         cog_name = cog_instance.__class__.__name__
         cls._cog_instances.append(cog_instance)
+        cls._rebuild()
         LogHandler.info(f"Attached cog {cog_name}")
 
+    @classmethod
+    def detach(cls, cog_instance):
+        """
+        Detaches a cog instance so its listeners are no longer called.
+
+        Args:
+            cog_instance: The cog instance to detach.
+        """
+        if cog_instance in cls._cog_instances:
+            cls._cog_instances.remove(cog_instance)
+            cls._rebuild()
+            LogHandler.info(f"Detached cog {cog_instance.__class__.__name__}")
+
+    @classmethod
+    def _rebuild(cls):
+        """Rebuilds the dispatch table from the registered listeners and attached instances."""
+        dispatch = {}
+        for instance in cls._cog_instances:
+            cog_name = instance.__class__.__name__
+            for event_name, listeners in cls._event_listeners.items():
+                for listener in listeners:
+                    if cog_name == listener.__qualname__.split(".")[0]:
+                        dispatch.setdefault(event_name, []).append(
+                            (listener.__qualname__, listener.__get__(instance))
+                        )
+        cls._dispatch = {name: tuple(entries) for name, entries in dispatch.items()}
+
     @classmethod
     async def fire(cls, event_name, *args, **kwargs):
         """
-        Fires an event, calling all registered listeners for the event.
+        Fires an event, calling all registered listeners for the event concurrently.
 
         Args:
             event_name (str): The name of the event to fire.
@@ -79,14 +123,92 @@ class EventManager:
             **kwargs: Keyword arguments to pass to the event listeners.
         """
         LogHandler.info(f"Fired {event_name}")
-        for instance in cls._cog_instances:
-            if event_name in cls._event_listeners:
-                for listener in cls._event_listeners[event_name]:
-                    if (
-                        instance.__class__.__name__
-                        == listener.__qualname__.split(".")[0]
-                    ):
-                        if inspect.iscoroutinefunction(listener):
-                            await listener(instance, *args, **kwargs)
-                        else:
-                            listener(instance, *args, **kwargs)
+        listeners = cls._dispatch.get(event_name)
+        if not listeners:
+            return
+
+        stats = cls._stats.get(event_name)
+        if stats is None:
+            stats = cls._stats[event_name] = {
+                "count": 0,
+                "errors": 0,
+                "timeouts": 0,
+                "total": 0.0,
+                "max": 0.0,
+            }
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                cls._call(event_name, name, callback, stats, args, kwargs)
+                for name, callback in listeners
+            )
+        )
+        elapsed = time.perf_counter() - started
+        stats["count"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+
+    @classmethod
+    def fire_nowait(cls, event_name, *args, **kwargs) -> asyncio.Task:
+        """
+        Fires an event in the background without waiting for its listeners.
+
+        Args:
+            event_name (str): The name of the event to fire.
+            *args: Positional arguments to pass to the event listeners.
+            **kwargs: Keyword arguments to pass to the event listeners.
+
+        Returns:
+            asyncio.Task: The task dispatching the event.
+        """
+        task = asyncio.create_task(cls.fire(event_name, *args, **kwargs))
+        cls._background.add(task)
+        task.add_done_callback(cls._background.discard)
+        return task
+
+    @classmethod
+    async def _call(cls, event_name, name, callback, stats, args, kwargs):
+        """
+        Calls a single listener, logging instead of raising its failures.
+
+        Args:
+            event_name (str): The name of the event being fired.
+            name (str): The qualified name of the listener.
+            callback (Callable): The bound listener.
+            stats (dict): The counters of the event.
+            args (tuple): Positional arguments to pass to the listener.
+            kwargs (dict): Keyword arguments to pass to the listener.
+        """
+        try:
+            result = callback(*args, **kwargs)
+            if inspect.isawaitable(result):
+                await asyncio.wait_for(result, cls.listener_timeout)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            LogHandler.warning(
+                f"Listener {name} timed out after {cls.listener_timeout}s on {event_name}"
+            )
+        except Exception as e:
+            stats["errors"] += 1
+            LogHandler.error(f"Listener {name} failed on {event_name}: {e}")
+
+    @classmethod
+    def metrics(cls) -> dict:
+        """
+        Returns dispatch counters for every fired event.
+
+        Returns:
+            dict: Per event, the number of dispatches, listener errors and timeouts, and the
+                average and highest time in seconds until all listeners finished.
+        """
+        return {
+            event_name: {
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "timeouts": stats["timeouts"],
+                "average": stats["total"] / stats["count"] if stats["count"] else 0.0,
+                "max": stats["max"],
+            }
+            for event_name, stats in cls._stats.items()
+        }
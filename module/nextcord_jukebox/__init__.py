@@ -4,6 +4,7 @@ __title__ = "Nextcord-JukeBox"
 __author__ = "Rystal-Team"
 __license__ = "MIT"
 __socket_standard_version__ = "1.1.0"
+__socket_standard_v2_version__ = "2.0.0"
 
 #  ------------------------------------------------------------
 #  Copyright (c) 2024 Rystal-Team
@@ -21,15 +21,45 @@
 #  ------------------------------------------------------------
 #
 
+import asyncio
 import json
 import sqlite3
+from collections import Counter
 from datetime import datetime, timedelta
 
 import mysql.connector
 from mysql.connector import Error
 
 from . import LogHandler
-from .utils import generate_secret
+from .metadata_pack import MetadataPack
+from .utils import generate_secret, get_poster_thumbnail
+
+VIDEO_COLUMNS = (
+    "url",
+    "title",
+    "views",
+    "duration",
+    "thumbnail",
+    "channel",
+    "channel_url",
+)
+
+
+def to_epoch(value) -> int:
+    """
+    Converts a timestamp to epoch seconds.
+
+    Args:
+        value (int | float | str | datetime): Epoch seconds, an ISO-8601 string or a datetime.
+
+    Returns:
+        int: The timestamp in epoch seconds.
+    """
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value).timestamp())
+    return int(value)
 
 
 class Database:
@@ -40,6 +70,9 @@ class Database:
         db_type (str): The type of database ('sqlite' or 'mysql').
         connection: The database connection object.
         cursor: The database cursor object.
+        stale_after (int): Seconds after which cached video metadata is considered stale.
+        on_stale (Callable | None): Called with the IDs of stale cached videos when they are read, to revalidate them in the background.
+        packs (list): Mounted read-only metadata packs, consulted in order for videos missing from the SQL cache.
     """
 
     def __init__(self, db_type, **kwargs):
@@ -53,6 +86,14 @@ class Database:
         self.db_type = db_type
         self.connection = None
         self.cursor = None
+        self._registered_users = set()
+        self._user_secrets = {}
+        self._secret_users = {}
+        self._video_key_cache = {}
+        self.migration_pending = False
+        self.stale_after = 7 * 86400
+        self.on_stale = None
+        self.packs = []
         if db_type == "sqlite":
             self._connect_sqlite(**kwargs)
         elif db_type == "mysql":
@@ -99,17 +140,137 @@ class Database:
         queries = {
             "sqlite": [
                 "CREATE TABLE IF NOT EXISTS jukebox_secrets (user_id TEXT PRIMARY KEY, secret TEXT);",
-                "CREATE TABLE IF NOT EXISTS jukebox_ytcache (video_id TEXT PRIMARY KEY, metadata TEXT, registered_date TEXT);",
-                "CREATE TABLE IF NOT EXISTS jukebox_replay_history (user_id TEXT, played_at TEXT, song TEXT, FOREIGN KEY (user_id) REFERENCES jukebox_secrets (user_id));",
+                "CREATE TABLE IF NOT EXISTS jukebox_video_metadata (video_id TEXT PRIMARY KEY, url TEXT, title TEXT, views INTEGER, duration INTEGER, thumbnail TEXT, channel TEXT, channel_url TEXT, poster_thumbnail TEXT, thumbnails TEXT, registered_at INTEGER NOT NULL, last_accessed INTEGER);",
+                "CREATE TABLE IF NOT EXISTS jukebox_videos (id INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT NOT NULL UNIQUE);",
+                "CREATE TABLE IF NOT EXISTS jukebox_replay_events (user_id INTEGER NOT NULL, played_at INTEGER NOT NULL, video INTEGER NOT NULL);",
+                "CREATE TABLE IF NOT EXISTS jukebox_replay_daily (user_id TEXT, day TEXT, song TEXT, plays INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (user_id, day, song));",
+                "CREATE TABLE IF NOT EXISTS jukebox_captions (video_id TEXT, language TEXT, translated INTEGER NOT NULL DEFAULT 0, captions TEXT NOT NULL, cached_at INTEGER NOT NULL, PRIMARY KEY (video_id, language, translated));",
             ],
             "mysql": [
                 "CREATE TABLE IF NOT EXISTS jukebox_secrets (user_id VARCHAR(255) PRIMARY KEY, secret TEXT);",
-                "CREATE TABLE IF NOT EXISTS jukebox_ytcache (video_id VARCHAR(255) PRIMARY KEY, metadata TEXT, registered_date VARCHAR(255));",
-                "CREATE TABLE IF NOT EXISTS jukebox_replay_history (user_id VARCHAR(255), played_at VARCHAR(255), song TEXT, FOREIGN KEY (user_id) REFERENCES jukebox_secrets (user_id));",
+                "CREATE TABLE IF NOT EXISTS jukebox_video_metadata (video_id VARCHAR(64) PRIMARY KEY, url VARCHAR(255), title TEXT, views BIGINT, duration INT, thumbnail TEXT, channel VARCHAR(255), channel_url VARCHAR(255), poster_thumbnail TEXT, thumbnails MEDIUMTEXT, registered_at BIGINT NOT NULL, last_accessed BIGINT);",
+                "CREATE TABLE IF NOT EXISTS jukebox_videos (id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY, video_id VARCHAR(64) NOT NULL UNIQUE);",
+                "CREATE TABLE IF NOT EXISTS jukebox_replay_events (user_id BIGINT UNSIGNED NOT NULL, played_at INT UNSIGNED NOT NULL, video INT UNSIGNED NOT NULL);",
+                "CREATE TABLE IF NOT EXISTS jukebox_replay_daily (user_id VARCHAR(255), day CHAR(10), song VARCHAR(255), plays INT NOT NULL DEFAULT 0, PRIMARY KEY (user_id, day, song));",
+                "CREATE TABLE IF NOT EXISTS jukebox_captions (video_id VARCHAR(64), language VARCHAR(32), translated TINYINT NOT NULL DEFAULT 0, captions MEDIUMTEXT NOT NULL, cached_at BIGINT NOT NULL, PRIMARY KEY (video_id, language, translated));",
             ],
         }
         for query in queries[self.db_type]:
             self.cursor.execute(query)
+        self._create_index(
+            "idx_replay_events_user_played",
+            "jukebox_replay_events",
+            "user_id, played_at",
+        )
+        self._create_index("idx_replay_events_played", "jukebox_replay_events", "played_at")
+        self._add_column(
+            "jukebox_video_metadata",
+            "last_accessed",
+            "INTEGER" if self.db_type == "sqlite" else "BIGINT",
+        )
+        self.connection.commit()
+        if self._table_exists("jukebox_ytcache"):
+            self._migrate_video_cache()
+        self.migration_pending = self._table_exists("jukebox_replay_history")
+        if self.migration_pending:
+            self._backfill_replay_daily()
+        self._load_secrets()
+
+    def _load_secrets(self):
+        """Loads every registered user's secret into the in-memory user and secret index."""
+        self.cursor.execute("SELECT user_id, secret FROM jukebox_secrets")
+        for user_id, secret in self.cursor.fetchall():
+            if secret is None:
+                self._registered_users.add(str(user_id))
+            else:
+                self._index_secret(str(user_id), secret)
+
+    def _index_secret(self, user_id: str, secret: str):
+        """
+        Records a user's secret in the in-memory index, replacing their previous one.
+
+        Args:
+            user_id (str): The user ID.
+            secret (str): The user's secret.
+        """
+        previous = self._user_secrets.get(user_id)
+        if previous is not None:
+            self._secret_users.pop(previous, None)
+        self._user_secrets[user_id] = secret
+        self._secret_users[secret] = user_id
+        self._registered_users.add(user_id)
+
+    def _table_exists(self, table: str) -> bool:
+        """
+        Checks if a table exists in the database.
+
+        Args:
+            table (str): The table name.
+
+        Returns:
+            bool: True if the table exists, False otherwise.
+        """
+        query = {
+            "sqlite": "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?",
+            "mysql": "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+        }
+        self.cursor.execute(query[self.db_type], (table,))
+        return self.cursor.fetchone()[0] > 0
+
+    def _create_index(self, name: str, table: str, columns: str):
+        """
+        Creates an index if it does not exist yet.
+
+        Args:
+            name (str): The index name.
+            table (str): The table to index.
+            columns (str): The comma separated column list.
+        """
+        if self.db_type == "sqlite":
+            self.cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+            )
+            return
+        self.cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+            (table, name),
+        )
+        if self.cursor.fetchone()[0] == 0:
+            self.cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+
+    def _add_column(self, table: str, column: str, definition: str):
+        """
+        Adds a column to an existing table if it is missing.
+
+        Args:
+            table (str): The table name.
+            column (str): The column name.
+            definition (str): The column type and constraints.
+        """
+        if self.db_type == "sqlite":
+            self.cursor.execute(f"PRAGMA table_info({table})")
+            exists = any(row[1] == column for row in self.cursor.fetchall())
+        else:
+            self.cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+                (table, column),
+            )
+            exists = self.cursor.fetchone()[0] > 0
+        if not exists:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _backfill_replay_daily(self):
+        """Builds the daily replay rollup from the legacy replay history when the rollup is still empty."""
+        self.cursor.execute("SELECT 1 FROM jukebox_replay_daily LIMIT 1")
+        if self.cursor.fetchone():
+            return
+        query = {
+            "sqlite": "INSERT INTO jukebox_replay_daily (user_id, day, song, plays) SELECT user_id, substr(played_at, 1, 10), song, COUNT(*) FROM jukebox_replay_history GROUP BY user_id, substr(played_at, 1, 10), song",
+            "mysql": "INSERT INTO jukebox_replay_daily (user_id, day, song, plays) SELECT user_id, SUBSTRING(played_at, 1, 10), song, COUNT(*) FROM jukebox_replay_history GROUP BY user_id, SUBSTRING(played_at, 1, 10), song",
+        }
+        self.cursor.execute(query[self.db_type])
+        if self.cursor.rowcount > 0:
+            LogHandler.info(f"Backfilled {self.cursor.rowcount} daily replay rollups")
         self.connection.commit()
 
     async def register(self, user_id: str) -> str:
@@ -131,6 +292,7 @@ class Database:
             }
             self.cursor.execute(query[self.db_type], (user_id, secret))
             self.connection.commit()
+            self._index_secret(user_id, secret)
             LogHandler.info(f"Registered user: {user_id}")
         except Exception as e:
             LogHandler.error(f"Error registering user: {e}")
@@ -147,20 +309,25 @@ class Database:
         Returns:
             bool: True if the user exists, False otherwise.
         """
+        if str(user_id) in self._registered_users:
+            return True
         try:
             query = {
                 "sqlite": "SELECT EXISTS(SELECT 1 FROM jukebox_secrets WHERE user_id = ?)",
                 "mysql": "SELECT EXISTS(SELECT 1 FROM jukebox_secrets WHERE user_id = %s)",
             }
             self.cursor.execute(query[self.db_type], (user_id,))
-            return self.cursor.fetchone()[0] == 1
+            exists = self.cursor.fetchone()[0] == 1
+            if exists:
+                self._registered_users.add(str(user_id))
+            return exists
         except Exception as e:
             LogHandler.error(f"Error checking if user exists: {e}")
             return False
 
     async def get_user_secret(self, user_id: str) -> str | None:
         """
-        Retrieves the secret for a given user ID.
+        Retrieves the secret for a given user ID from the in-memory index.
 
         Args:
             user_id (str): The user ID.
@@ -168,17 +335,130 @@ class Database:
         Returns:
             str | None: The user's secret if found, None otherwise.
         """
-        try:
-            query = {
-                "sqlite": "SELECT secret FROM jukebox_secrets WHERE user_id = ?",
-                "mysql": "SELECT secret FROM jukebox_secrets WHERE user_id = %s",
-            }
-            self.cursor.execute(query[self.db_type], (user_id,))
-            result = self.cursor.fetchone()
-            return result[0] if result else None
-        except Exception as e:
-            LogHandler.error(f"Error fetching user secret: {e}")
-            raise e
+        return self._user_secrets.get(str(user_id))
+
+    def get_user_secrets(self, user_ids) -> dict:
+        """
+        Retrieves the secrets of several users from the in-memory index.
+
+        Args:
+            user_ids (Iterable): The user IDs.
+
+        Returns:
+            dict: The secrets of the registered users, keyed by user ID as given.
+        """
+        return {
+            user_id: secret
+            for user_id in user_ids
+            if (secret := self._user_secrets.get(str(user_id))) is not None
+        }
+
+    def get_secret_user(self, secret: str) -> str | None:
+        """
+        Retrieves the user ID a secret belongs to.
+
+        Args:
+            secret (str): The secret.
+
+        Returns:
+            str | None: The user ID if the secret is current, None otherwise.
+        """
+        return self._secret_users.get(secret)
+
+    def _migrate_video_cache(self, batch_size: int = 500):
+        """
+        Moves cached metadata from the legacy JSON `jukebox_ytcache` table into the typed `jukebox_video_metadata` table and drops the legacy table.
+
+        The legacy table is paged through by video ID and every batch is committed on its own,
+        so only one batch is held in memory and an interrupted migration resumes safely.
+
+        Args:
+            batch_size (int, optional): Rows converted per batch. Defaults to 500.
+        """
+        marker = "?" if self.db_type == "sqlite" else "%s"
+        migrated = 0
+        last_id = ""
+        while True:
+            self.cursor.execute(
+                f"SELECT video_id, metadata, registered_date FROM jukebox_ytcache WHERE video_id > {marker} ORDER BY video_id LIMIT {marker}",
+                (last_id, batch_size),
+            )
+            rows = self.cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            values = []
+            for video_id, metadata_json, registered_date in rows:
+                try:
+                    values.append(
+                        self._video_row(
+                            video_id,
+                            json.loads(metadata_json),
+                            to_epoch(registered_date),
+                        )
+                    )
+                except (TypeError, ValueError):
+                    LogHandler.warning(f"Dropping malformed cache entry for {video_id}")
+            self._upsert_video_rows(values)
+            self.connection.commit()
+            migrated += len(values)
+        self.cursor.execute("DROP TABLE jukebox_ytcache")
+        self.connection.commit()
+        LogHandler.info(f"Migrated {migrated} cached videos to typed columns")
+
+    @staticmethod
+    def _video_row(video_id: str, metadata: dict, registered_at: int) -> tuple:
+        """
+        Builds a `jukebox_video_metadata` row from a metadata dictionary.
+
+        Args:
+            video_id (str): The video ID.
+            metadata (dict): The metadata returned by the extractor.
+            registered_at (int): The epoch second the metadata was fetched.
+
+        Returns:
+            tuple: The row values in column order.
+        """
+        thumbnails = metadata.get("thumbnails") or []
+        return (
+            str(video_id),
+            *(metadata.get(column) for column in VIDEO_COLUMNS),
+            get_poster_thumbnail(thumbnails),
+            json.dumps(thumbnails),
+            registered_at,
+            registered_at,
+        )
+
+    def _upsert_video_rows(self, rows: list):
+        """
+        Inserts or replaces rows in `jukebox_video_metadata`. The writes are left uncommitted.
+
+        Args:
+            rows (list): Rows built by `_video_row`.
+        """
+        if not rows:
+            return
+        columns = (
+            "video_id",
+            *VIDEO_COLUMNS,
+            "poster_thumbnail",
+            "thumbnails",
+            "registered_at",
+            "last_accessed",
+        )
+        placeholders = ", ".join(["?" if self.db_type == "sqlite" else "%s"] * len(columns))
+        updates = {
+            "sqlite": ", ".join(f"{column}=excluded.{column}" for column in columns[1:-1]),
+            "mysql": ", ".join(f"{column}=VALUES({column})" for column in columns[1:-1]),
+        }
+        conflict = {
+            "sqlite": "ON CONFLICT(video_id) DO UPDATE SET",
+            "mysql": "ON DUPLICATE KEY UPDATE",
+        }
+        self.cursor.executemany(
+            f"INSERT INTO jukebox_video_metadata ({', '.join(columns)}) VALUES ({placeholders}) {conflict[self.db_type]} {updates[self.db_type]}",
+            rows,
+        )
 
     def cache_video_metadata(self, video_id: str, metadata: dict):
         """
@@ -189,14 +469,8 @@ class Database:
             metadata (dict): The metadata to cache.
         """
         try:
-            metadata_json = json.dumps(metadata)
-            registered_date = datetime.now().isoformat()
-            query = {
-                "sqlite": "INSERT INTO jukebox_ytcache (video_id, metadata, registered_date) VALUES (?, ?, ?) ON CONFLICT(video_id) DO UPDATE SET metadata=excluded.metadata, registered_date=excluded.registered_date;",
-                "mysql": "INSERT INTO jukebox_ytcache (video_id, metadata, registered_date) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE metadata=VALUES(metadata), registered_date=VALUES(registered_date);",
-            }
-            self.cursor.execute(
-                query[self.db_type], (video_id, metadata_json, registered_date)
+            self._upsert_video_rows(
+                [self._video_row(video_id, metadata, int(datetime.now().timestamp()))]
             )
             self.connection.commit()
             LogHandler.info(f"Cached video metadata for {video_id}")
@@ -204,78 +478,454 @@ class Database:
             LogHandler.error(f"Error caching video metadata: {e}")
             raise e
 
-    def get_cached_video_metadata(self, video_id: str) -> None | dict:
+    def cache_bulk_video_metadata(self, metadata: dict):
+        """
+        Caches metadata for multiple videos in one transaction.
+
+        Args:
+            metadata (dict): A dictionary with video IDs as keys and metadata as values.
+        """
+        try:
+            registered_at = int(datetime.now().timestamp())
+            self._upsert_video_rows(
+                [
+                    self._video_row(video_id, meta, registered_at)
+                    for video_id, meta in metadata.items()
+                ]
+            )
+            self.connection.commit()
+            LogHandler.info(f"Cached video metadata for {len(metadata)} videos")
+        except Exception as e:
+            self.connection.rollback()
+            LogHandler.error(f"Error caching bulk video metadata: {e}")
+            raise e
+
+    def get_cached_video_ids(self, video_ids: list) -> set:
+        """
+        Checks which videos are in the cache without reading their metadata or recording an access.
+
+        Args:
+            video_ids (list): A list of video IDs.
+
+        Returns:
+            set: The video IDs that are cached.
+        """
+        return set(
+            self._select_video_metadata(
+                tuple(str(video_id) for video_id in video_ids), ()
+            )
+        )
+
+    def get_top_songs(self, limit: int, cutoff: int = 365) -> list:
+        """
+        Retrieves the most played songs across all users within a specified cutoff period, aggregated from the daily rollup.
+
+        Args:
+            limit (int): The maximum number of songs.
+            cutoff (int, optional): The number of days to look back. Defaults to 365.
+
+        Returns:
+            list: A list of (song, plays) tuples, most played first.
+        """
+        try:
+            cutoff_day = (datetime.now() - timedelta(days=cutoff)).date().isoformat()
+            query = {
+                "sqlite": "SELECT song, SUM(plays) AS total FROM jukebox_replay_daily WHERE day >= ? GROUP BY song ORDER BY total DESC LIMIT ?",
+                "mysql": "SELECT song, SUM(plays) AS total FROM jukebox_replay_daily WHERE day >= %s GROUP BY song ORDER BY total DESC LIMIT %s",
+            }
+            self.cursor.execute(query[self.db_type], (cutoff_day, limit))
+            return [(song, int(plays)) for song, plays in self.cursor.fetchall()]
+        except Exception as e:
+            LogHandler.error(f"Error fetching top songs: {e}")
+            raise e
+
+    def _select_video_metadata(
+        self, video_ids: tuple, columns: tuple, touch: bool = False
+    ) -> dict:
+        """
+        Reads the given columns for multiple videos.
+
+        Args:
+            video_ids (tuple): The video IDs.
+            columns (tuple): The columns to read. "thumbnails" is decoded from JSON.
+            touch (bool, optional): Whether to record the read as an access and report stale rows to `on_stale`. Defaults to False.
+
+        Returns:
+            dict: A dictionary with video IDs as keys and column dictionaries as values.
+        """
+        if not video_ids:
+            return {}
+        placeholders = ",".join(
+            ["?" if self.db_type == "sqlite" else "%s"] * len(video_ids)
+        )
+        self.cursor.execute(
+            f"SELECT {', '.join(('video_id', 'registered_at', *columns))} FROM jukebox_video_metadata WHERE video_id IN ({placeholders})",
+            video_ids,
+        )
+        now = int(datetime.now().timestamp())
+        metadata_dict = {}
+        stale = []
+        for row in self.cursor.fetchall():
+            metadata = dict(zip(columns, row[2:]))
+            if "thumbnails" in metadata:
+                metadata["thumbnails"] = json.loads(metadata["thumbnails"] or "[]")
+            metadata_dict[row[0]] = metadata
+            if now - row[1] > self.stale_after:
+                stale.append(row[0])
+
+        if touch and metadata_dict:
+            self._touch_video_metadata(tuple(metadata_dict), now)
+            if stale and self.on_stale is not None:
+                self.on_stale(stale)
+
+        if self.packs and len(metadata_dict) < len(video_ids):
+            for video_id in video_ids:
+                if video_id in metadata_dict:
+                    continue
+                for pack in self.packs:
+                    entry = pack.get(video_id)
+                    if entry is not None:
+                        metadata_dict[video_id] = {
+                            column: entry.get(column) for column in columns
+                        }
+                        break
+        return metadata_dict
+
+    def mount_pack(self, path: str):
+        """
+        Mounts a metadata pack as a read-only tier beneath the SQL cache.
+
+        Args:
+            path (str): The pack file path.
+        """
+        pack = MetadataPack(path)
+        self.packs.append(pack)
+        LogHandler.info(f"Mounted metadata pack {path} with {len(pack)} videos")
+
+    def export_video_metadata(self, batch_size: int = 1000):
+        """
+        Reads every cached video with its full metadata, for exporting to a metadata pack.
+
+        Args:
+            batch_size (int, optional): Rows fetched per round trip. Defaults to 1000.
+
+        Yields:
+            tuple[str, dict]: The video ID and its metadata, including the poster thumbnail and thumbnail list.
+        """
+        columns = VIDEO_COLUMNS + ("poster_thumbnail", "thumbnails")
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                f"SELECT video_id, {', '.join(columns)} FROM jukebox_video_metadata"
+            )
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    metadata = dict(zip(columns, row[1:]))
+                    metadata["thumbnails"] = json.loads(metadata["thumbnails"] or "[]")
+                    yield row[0], metadata
+        finally:
+            cursor.close()
+
+    def _touch_video_metadata(self, video_ids: tuple, now: int):
+        """
+        Records an access to cached videos. Rows touched within the last hour are skipped to keep reads cheap.
+
+        Args:
+            video_ids (tuple): The video IDs.
+            now (int): The current epoch second.
+        """
+        marker = "?" if self.db_type == "sqlite" else "%s"
+        placeholders = ",".join([marker] * len(video_ids))
+        self.cursor.execute(
+            f"UPDATE jukebox_video_metadata SET last_accessed = {marker} WHERE video_id IN ({placeholders}) AND (last_accessed IS NULL OR last_accessed < {marker})",
+            (now, *video_ids, now - 3600),
+        )
+        self.connection.commit()
+
+    def get_cached_video_metadata(
+        self, video_id: str, include_thumbnails: bool = False
+    ) -> None | dict:
         """
         Retrieves cached video metadata from the database.
 
         Args:
             video_id (str): The video ID.
+            include_thumbnails (bool, optional): Whether to read and decode the full thumbnail list. Defaults to False.
 
         Returns:
             None | dict: The cached metadata if found, None otherwise.
         """
         try:
-            query = {
-                "sqlite": "SELECT metadata FROM jukebox_ytcache WHERE video_id = ?",
-                "mysql": "SELECT metadata FROM jukebox_ytcache WHERE video_id = %s",
-            }
-            self.cursor.execute(query[self.db_type], (video_id,))
-            result = self.cursor.fetchone()
+            columns = VIDEO_COLUMNS + (("thumbnails",) if include_thumbnails else ())
+            result = self._select_video_metadata((str(video_id),), columns, touch=True)
             if result:
                 LogHandler.info(f"Using cached video metadata for {video_id}")
-                return json.loads(result[0])
+                return result[str(video_id)]
             return None
         except Exception as e:
             LogHandler.error(f"Error fetching cached video metadata: {e}")
             raise e
 
-    def get_bulk_video_metadata(self, video_ids: list) -> dict:
+    def get_bulk_video_metadata(
+        self, video_ids: list, include_thumbnails: bool = False
+    ) -> dict:
         """
         Retrieves metadata for multiple videos from the cache.
 
         Args:
             video_ids (list): A list of video IDs.
+            include_thumbnails (bool, optional): Whether to read and decode the full thumbnail lists. Defaults to False.
 
         Returns:
             dict: A dictionary with video IDs as keys and metadata as values.
         """
-        video_ids_tuple = tuple(str(video_id) for video_id in video_ids)
-        metadata_dict = {}
         try:
-            placeholders = ",".join(
-                ["?" if self.db_type == "sqlite" else "%s"] * len(video_ids_tuple)
+            columns = VIDEO_COLUMNS + (("thumbnails",) if include_thumbnails else ())
+            return self._select_video_metadata(
+                tuple(str(video_id) for video_id in video_ids), columns, touch=True
             )
-            query = f"SELECT video_id, metadata FROM jukebox_ytcache WHERE video_id IN ({placeholders})"
-            self.cursor.execute(query, video_ids_tuple)
-            results = self.cursor.fetchall()
-            for video_id, metadata_json in results:
-                metadata_dict[video_id] = json.loads(metadata_json)
         except Exception as e:
             LogHandler.error(f"Error fetching bulk video metadata: {e}")
             raise e
-        return metadata_dict
 
-    async def add_replay_entry(self, user_id: str, played_at: str, song: str):
+    def get_bulk_poster_metadata(self, video_ids: list) -> dict:
+        """
+        Retrieves the fields needed to render replay posters for multiple videos from the cache.
+
+        Args:
+            video_ids (list): A list of video IDs.
+
+        Returns:
+            dict: A dictionary with video IDs as keys and "title", "channel", "duration" and "poster_thumbnail" dictionaries as values.
+        """
+        try:
+            return self._select_video_metadata(
+                tuple(str(video_id) for video_id in video_ids),
+                ("title", "channel", "duration", "poster_thumbnail"),
+            )
+        except Exception as e:
+            LogHandler.error(f"Error fetching poster metadata: {e}")
+            raise e
+
+    def get_cached_captions(
+        self, video_id: str, language: str, translated: bool = False
+    ) -> list | None:
+        """
+        Retrieves cached captions of a video.
+
+        Args:
+            video_id (str): The video ID.
+            language (str): The language code of the captions.
+            translated (bool, optional): Whether to look up a machine translation rather than the captions provided by the video. Defaults to False.
+
+        Returns:
+            list | None: The caption lines, or None if they are not cached.
+        """
+        query = {
+            "sqlite": "SELECT captions FROM jukebox_captions WHERE video_id = ? AND language = ? AND translated = ?",
+            "mysql": "SELECT captions FROM jukebox_captions WHERE video_id = %s AND language = %s AND translated = %s",
+        }
+        self.cursor.execute(query[self.db_type], (video_id, language, int(translated)))
+        row = self.cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    def cache_captions(
+        self, video_id: str, language: str, translated: bool, captions: list
+    ):
+        """
+        Caches the captions of a video.
+
+        Args:
+            video_id (str): The video ID.
+            language (str): The language code of the captions.
+            translated (bool): Whether the captions are a machine translation.
+            captions (list): The caption lines.
+        """
+        try:
+            query = {
+                "sqlite": "INSERT OR REPLACE INTO jukebox_captions (video_id, language, translated, captions, cached_at) VALUES (?, ?, ?, ?, ?)",
+                "mysql": "REPLACE INTO jukebox_captions (video_id, language, translated, captions, cached_at) VALUES (%s, %s, %s, %s, %s)",
+            }
+            self.cursor.execute(
+                query[self.db_type],
+                (
+                    video_id,
+                    language,
+                    int(translated),
+                    json.dumps(captions, ensure_ascii=False),
+                    int(datetime.now().timestamp()),
+                ),
+            )
+            self.connection.commit()
+            LogHandler.info(f"Cached {language} captions for {video_id}")
+        except Exception as e:
+            LogHandler.error(f"Error caching captions: {e}")
+            raise e
+
+    async def add_replay_entry(self, user_id: str, played_at, song: str):
         """
         Adds a replay entry to the database.
 
         Args:
             user_id (str): The user ID.
-            played_at (str): The timestamp when the song was played.
+            played_at (int | str | datetime): The time the song was played, as epoch seconds, an ISO-8601 string or a datetime.
             song (str): The song that was played.
         """
-        if not await self.user_exists(user_id):
-            await self.register(user_id)
-        try:
+        await self.add_replay_entries([(user_id, played_at, song)])
+
+    async def _register_missing(self, user_ids: set) -> list:
+        """
+        Registers every user in `user_ids` that is not registered yet, with one query for the lookup and one for the inserts.
+        The inserts are left uncommitted.
+
+        Args:
+            user_ids (set): The user IDs.
+
+        Returns:
+            list: The (user_id, secret) pairs that were inserted.
+        """
+        unknown = tuple(user_ids - self._registered_users)
+        if not unknown:
+            return []
+
+        placeholders = ",".join(
+            ["?" if self.db_type == "sqlite" else "%s"] * len(unknown)
+        )
+        self.cursor.execute(
+            f"SELECT user_id FROM jukebox_secrets WHERE user_id IN ({placeholders})",
+            unknown,
+        )
+        self._registered_users.update(row[0] for row in self.cursor.fetchall())
+
+        missing = [
+            (user_id, await generate_secret())
+            for user_id in unknown
+            if user_id not in self._registered_users
+        ]
+        if missing:
             query = {
-                "sqlite": "INSERT INTO jukebox_replay_history (user_id, played_at, song) VALUES (?, ?, ?)",
-                "mysql": "INSERT INTO jukebox_replay_history (user_id, played_at, song) VALUES (%s, %s, %s)",
+                "sqlite": "INSERT OR IGNORE INTO jukebox_secrets (user_id, secret) VALUES (?, ?)",
+                "mysql": "INSERT IGNORE INTO jukebox_secrets (user_id, secret) VALUES (%s, %s)",
             }
-            self.cursor.execute(query[self.db_type], (user_id, played_at, song))
+            self.cursor.executemany(query[self.db_type], missing)
+            LogHandler.info(f"Registered {len(missing)} users for replay history")
+        return missing
+
+    def _video_keys(self, video_ids: set) -> dict:
+        """
+        Maps video IDs to their integer keys in `jukebox_videos`, inserting the ones that are missing. The inserts are left uncommitted.
+
+        Args:
+            video_ids (set): The video IDs.
+
+        Returns:
+            dict: The integer key of every video ID.
+        """
+        unknown = tuple(video_ids - self._video_key_cache.keys())
+        if unknown:
+            query = {
+                "sqlite": "INSERT OR IGNORE INTO jukebox_videos (video_id) VALUES (?)",
+                "mysql": "INSERT IGNORE INTO jukebox_videos (video_id) VALUES (%s)",
+            }
+            self.cursor.executemany(
+                query[self.db_type], [(video_id,) for video_id in unknown]
+            )
+            placeholders = ",".join(
+                ["?" if self.db_type == "sqlite" else "%s"] * len(unknown)
+            )
+            self.cursor.execute(
+                f"SELECT video_id, id FROM jukebox_videos WHERE video_id IN ({placeholders})",
+                unknown,
+            )
+            self._video_key_cache.update(self.cursor.fetchall())
+        return {video_id: self._video_key_cache[video_id] for video_id in video_ids}
+
+    def _insert_replay_events(self, entries: list):
+        """
+        Inserts replay entries into the compact event table. The inserts are left uncommitted.
+
+        Args:
+            entries (list): A list of (user_id, played_at, song) tuples with epoch second timestamps.
+        """
+        keys = self._video_keys({song for _, _, song in entries})
+        query = {
+            "sqlite": "INSERT INTO jukebox_replay_events (user_id, played_at, video) VALUES (?, ?, ?)",
+            "mysql": "INSERT INTO jukebox_replay_events (user_id, played_at, video) VALUES (%s, %s, %s)",
+        }
+        self.cursor.executemany(
+            query[self.db_type],
+            [
+                (int(user_id), played_at, keys[song])
+                for user_id, played_at, song in entries
+            ],
+        )
+
+    async def add_replay_entries(self, entries: list):
+        """
+        Adds replay entries to the database in one batch, registering unknown users first.
+
+        Args:
+            entries (list): A list of (user_id, played_at, song) tuples, see `add_replay_entry` for the accepted timestamps.
+        """
+        if not entries:
+            return
+        entries = [
+            (str(user_id), to_epoch(played_at), song)
+            for user_id, played_at, song in entries
+        ]
+        try:
+            registered = await self._register_missing({entry[0] for entry in entries})
+            self._insert_replay_events(entries)
+            self._update_replay_daily(entries)
             self.connection.commit()
-            LogHandler.info(f"Added replay entry for {user_id}")
+            for user_id, secret in registered:
+                self._index_secret(user_id, secret)
+            LogHandler.info(f"Added {len(entries)} replay entries")
         except Exception as e:
-            LogHandler.error(f"Error adding replay entry: {e}")
+            self.connection.rollback()
+            LogHandler.error(f"Error adding replay entries: {e}")
+            raise e
+
+    def _update_replay_daily(self, entries: list):
+        """
+        Adds replay entries to the daily rollup. The update is left uncommitted.
+
+        Args:
+            entries (list): A list of (user_id, played_at, song) tuples with epoch second timestamps.
+        """
+        plays = Counter(
+            (user_id, datetime.fromtimestamp(played_at).date().isoformat(), song)
+            for user_id, played_at, song in entries
+        )
+        query = {
+            "sqlite": "INSERT INTO jukebox_replay_daily (user_id, day, song, plays) VALUES (?, ?, ?, ?) ON CONFLICT(user_id, day, song) DO UPDATE SET plays = plays + excluded.plays",
+            "mysql": "INSERT INTO jukebox_replay_daily (user_id, day, song, plays) VALUES (%s, %s, %s, %s) ON DUPLICATE KEY UPDATE plays = plays + VALUES(plays)",
+        }
+        self.cursor.executemany(
+            query[self.db_type], [(*key, count) for key, count in plays.items()]
+        )
+
+    async def get_replay_counts(self, user_id: str, cutoff: int = 30) -> list:
+        """
+        Retrieves the play count of every song a user played within a specified cutoff period, aggregated from the daily rollup.
+
+        Args:
+            user_id (str): The user ID.
+            cutoff (int, optional): The number of days to look back. Defaults to 30.
+
+        Returns:
+            list: A list of (song, plays) tuples, most played first.
+        """
+        try:
+            cutoff_day = (datetime.now() - timedelta(days=cutoff)).date().isoformat()
+            query = {
+                "sqlite": "SELECT song, SUM(plays) AS total FROM jukebox_replay_daily WHERE user_id = ? AND day >= ? GROUP BY song ORDER BY total DESC",
+                "mysql": "SELECT song, SUM(plays) AS total FROM jukebox_replay_daily WHERE user_id = %s AND day >= %s GROUP BY song ORDER BY total DESC",
+            }
+            self.cursor.execute(query[self.db_type], (user_id, cutoff_day))
+            return [(song, int(plays)) for song, plays in self.cursor.fetchall()]
+        except Exception as e:
+            LogHandler.error(f"Error fetching replay counts: {e}")
             raise e
 
     async def get_replay_history(self, user_id: str, cutoff: int = 30) -> list:
@@ -290,18 +940,182 @@ class Database:
             list: A list of dictionaries containing replay history.
         """
         try:
-            cutoff_date = (datetime.now() - timedelta(days=cutoff)).isoformat()
+            cutoff_time = int((datetime.now() - timedelta(days=cutoff)).timestamp())
             query = {
-                "sqlite": "SELECT played_at, song FROM jukebox_replay_history WHERE user_id = ? and played_at >= ? ORDER BY played_at DESC",
-                "mysql": "SELECT played_at, song FROM jukebox_replay_history WHERE user_id = %s and played_at >= %s ORDER BY played_at DESC",
+                "sqlite": "SELECT e.played_at, v.video_id FROM jukebox_replay_events e JOIN jukebox_videos v ON v.id = e.video WHERE e.user_id = ? AND e.played_at >= ? ORDER BY e.played_at DESC",
+                "mysql": "SELECT e.played_at, v.video_id FROM jukebox_replay_events e JOIN jukebox_videos v ON v.id = e.video WHERE e.user_id = %s AND e.played_at >= %s ORDER BY e.played_at DESC",
             }
-            self.cursor.execute(query[self.db_type], (user_id, cutoff_date))
-            results = self.cursor.fetchall()
-            return [{"played_at": result[0], "song": result[1]} for result in results]
+            self.cursor.execute(query[self.db_type], (int(user_id), cutoff_time))
+            history = [
+                {
+                    "played_at": datetime.fromtimestamp(played_at).isoformat(),
+                    "song": song,
+                }
+                for played_at, song in self.cursor.fetchall()
+            ]
+            if self.migration_pending:
+                history.extend(self._get_legacy_replay_history(user_id, cutoff_time))
+                history.sort(key=lambda replay: replay["played_at"], reverse=True)
+            return history
         except Exception as e:
             LogHandler.error(f"Error fetching replay history: {e}")
             raise e
 
+    def _get_legacy_replay_history(self, user_id: str, cutoff_time: int) -> list:
+        """
+        Retrieves the replay history for a user that has not been migrated out of `jukebox_replay_history` yet.
+
+        Args:
+            user_id (str): The user ID.
+            cutoff_time (int): The earliest epoch second to include.
+
+        Returns:
+            list: A list of dictionaries containing replay history.
+        """
+        cutoff_date = datetime.fromtimestamp(cutoff_time).isoformat()
+        query = {
+            "sqlite": "SELECT played_at, song FROM jukebox_replay_history WHERE user_id = ? AND played_at >= ?",
+            "mysql": "SELECT played_at, song FROM jukebox_replay_history WHERE user_id = %s AND played_at >= %s",
+        }
+        self.cursor.execute(query[self.db_type], (str(user_id), cutoff_date))
+        return [
+            {"played_at": played_at, "song": song}
+            for played_at, song in self.cursor.fetchall()
+        ]
+
+    async def migrate_replay_history(self, batch_size: int = 1000, pause: float = 0.1):
+        """
+        Moves rows from the legacy TEXT `jukebox_replay_history` table into `jukebox_replay_events` in small batches,
+        yielding to the event loop between batches so the bot keeps serving while the migration runs.
+        The legacy table is dropped once it is empty. The daily rollup already covers legacy rows, so it is left untouched.
+
+        Args:
+            batch_size (int, optional): Rows moved per transaction. Defaults to 1000.
+            pause (float, optional): Seconds to sleep between batches. Defaults to 0.1.
+        """
+        if not self.migration_pending:
+            return
+        usage_before = self.disk_usage()
+        moved = 0
+        while True:
+            try:
+                count = self._migrate_replay_batch(batch_size)
+            except Exception as e:
+                self.connection.rollback()
+                LogHandler.error(f"Error migrating replay history: {e}")
+                raise e
+            moved += count
+            if count < batch_size:
+                break
+            await asyncio.sleep(pause)
+
+        self.cursor.execute("DROP TABLE jukebox_replay_history")
+        self.connection.commit()
+        self.migration_pending = False
+        LogHandler.info(
+            f"Migrated {moved} replay entries to the compact schema, disk usage {usage_before} -> {self.disk_usage()} bytes"
+        )
+
+    def _migrate_replay_batch(self, batch_size: int) -> int:
+        """
+        Moves up to `batch_size` rows out of the legacy replay table in one transaction.
+
+        Args:
+            batch_size (int): The maximum number of rows to move.
+
+        Returns:
+            int: The number of rows moved.
+        """
+        if self.db_type == "sqlite":
+            self.cursor.execute(
+                "SELECT rowid, user_id, played_at, song FROM jukebox_replay_history LIMIT ?",
+                (batch_size,),
+            )
+            rows = self.cursor.fetchall()
+            delete = ("DELETE FROM jukebox_replay_history WHERE rowid = ?", [(row[0],) for row in rows])
+            rows = [row[1:] for row in rows]
+        else:
+            self.cursor.execute(
+                "SELECT user_id, played_at, song FROM jukebox_replay_history LIMIT %s",
+                (batch_size,),
+            )
+            rows = self.cursor.fetchall()
+            delete = (
+                "DELETE FROM jukebox_replay_history WHERE user_id = %s AND played_at = %s AND song = %s LIMIT 1",
+                rows,
+            )
+        if not rows:
+            return 0
+        entries = []
+        for user_id, played_at, song in rows:
+            try:
+                entries.append((int(user_id), to_epoch(played_at), song))
+            except ValueError:
+                LogHandler.warning(f"Dropping malformed replay entry for {user_id}")
+        if entries:
+            self._insert_replay_events(entries)
+        self.cursor.executemany(*delete)
+        self.connection.commit()
+        return len(rows)
+
+    async def apply_replay_retention(self, days: int, batch_size: int = 5000, pause: float = 0.1) -> int:
+        """
+        Deletes raw replay events older than `days`. Every event is already counted in the daily rollup when it is
+        inserted, so play counts and most played stats are kept after the raw rows are gone.
+
+        Args:
+            days (int): The number of days of raw events to keep.
+            batch_size (int, optional): Rows deleted per transaction. Defaults to 5000.
+            pause (float, optional): Seconds to sleep between batches. Defaults to 0.1.
+
+        Returns:
+            int: The number of events deleted.
+        """
+        cutoff_time = int((datetime.now() - timedelta(days=days)).timestamp())
+        usage_before = self.disk_usage()
+        deleted = 0
+        query = {
+            "sqlite": "DELETE FROM jukebox_replay_events WHERE rowid IN (SELECT rowid FROM jukebox_replay_events WHERE played_at < ? LIMIT ?)",
+            "mysql": "DELETE FROM jukebox_replay_events WHERE played_at < %s LIMIT %s",
+        }
+        while True:
+            try:
+                self.cursor.execute(query[self.db_type], (cutoff_time, batch_size))
+                count = self.cursor.rowcount
+                self.connection.commit()
+            except Exception as e:
+                self.connection.rollback()
+                LogHandler.error(f"Error applying replay retention: {e}")
+                raise e
+            deleted += count
+            if count < batch_size:
+                break
+            await asyncio.sleep(pause)
+
+        LogHandler.info(
+            f"Removed {deleted} replay events older than {days} days, disk usage {usage_before} -> {self.disk_usage()} bytes"
+        )
+        return deleted
+
+    def disk_usage(self) -> int:
+        """
+        Retrieves the space used by the database. For SQLite this excludes free pages that are kept in the file for reuse.
+
+        Returns:
+            int: The used size in bytes.
+        """
+        if self.db_type == "sqlite":
+            self.cursor.execute("PRAGMA page_size")
+            page_size = self.cursor.fetchone()[0]
+            self.cursor.execute("PRAGMA page_count")
+            page_count = self.cursor.fetchone()[0]
+            self.cursor.execute("PRAGMA freelist_count")
+            return (page_count - self.cursor.fetchone()[0]) * page_size
+        self.cursor.execute(
+            "SELECT COALESCE(SUM(data_length + index_length), 0) FROM information_schema.tables WHERE table_schema = DATABASE()"
+        )
+        return int(self.cursor.fetchone()[0])
+
     def clear_replay_history(self, user_id: str):
         """
         Clears the replay history for a user.
@@ -310,11 +1124,15 @@ class Database:
             user_id (str): The user ID.
         """
         try:
-            query = {
-                "sqlite": "DELETE FROM jukebox_replay_history WHERE user_id = ?",
-                "mysql": "DELETE FROM jukebox_replay_history WHERE user_id = %s",
-            }
-            self.cursor.execute(query[self.db_type], (user_id,))
+            tables = [("jukebox_replay_events", int(user_id)), ("jukebox_replay_daily", str(user_id))]
+            if self.migration_pending:
+                tables.append(("jukebox_replay_history", str(user_id)))
+            for table, key in tables:
+                query = {
+                    "sqlite": f"DELETE FROM {table} WHERE user_id = ?",
+                    "mysql": f"DELETE FROM {table} WHERE user_id = %s",
+                }
+                self.cursor.execute(query[self.db_type], (key,))
             self.connection.commit()
             LogHandler.info(f"Cleared replay history for {user_id}")
         except Exception as e:
@@ -323,17 +1141,18 @@ class Database:
 
     def clear_video_cache(self, video_id: str):
         """
-        Clears the cached video metadata for a specific video ID.
+        Clears the cached video metadata and captions for a specific video ID.
 
         Args:
             video_id (str): The video ID.
         """
         try:
-            query = {
-                "sqlite": "DELETE FROM jukebox_ytcache WHERE video_id = ?",
-                "mysql": "DELETE FROM jukebox_ytcache WHERE video_id = %s",
-            }
-            self.cursor.execute(query[self.db_type], (video_id,))
+            for table in ("jukebox_video_metadata", "jukebox_captions"):
+                query = {
+                    "sqlite": f"DELETE FROM {table} WHERE video_id = ?",
+                    "mysql": f"DELETE FROM {table} WHERE video_id = %s",
+                }
+                self.cursor.execute(query[self.db_type], (video_id,))
             self.connection.commit()
             LogHandler.info(f"Cleared cache for video {video_id}")
         except Exception as e:
@@ -341,26 +1160,46 @@ class Database:
             raise e
 
     def clear_old_cache(self, days=28):
-        """Clears old cached video metadata from the database."""
+        """
+        Clears cached video metadata that has not been accessed within the given number of days.
+        Entries that are still read are kept and revalidated through `on_stale` instead.
+        Cached captions older than the given number of days are cleared as well.
+
+        Args:
+            days (int, optional): The number of days since the last access. Defaults to 28.
+        """
         try:
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            cutoff_time = int((datetime.now() - timedelta(days=days)).timestamp())
+            query = {
+                "sqlite": "DELETE FROM jukebox_video_metadata WHERE COALESCE(last_accessed, registered_at) <= ?",
+                "mysql": "DELETE FROM jukebox_video_metadata WHERE COALESCE(last_accessed, registered_at) <= %s",
+            }
+            self.cursor.execute(query[self.db_type], (cutoff_time,))
             query = {
-                "sqlite": "DELETE FROM jukebox_ytcache WHERE registered_date < ?",
-                "mysql": "DELETE FROM jukebox_ytcache WHERE registered_date < %s",
+                "sqlite": "DELETE FROM jukebox_captions WHERE cached_at <= ?",
+                "mysql": "DELETE FROM jukebox_captions WHERE cached_at <= %s",
             }
-            self.cursor.execute(query[self.db_type], (cutoff_date,))
+            self.cursor.execute(query[self.db_type], (cutoff_time,))
             self.connection.commit()
         except Exception as e:
             LogHandler.error(f"Error clearing old cache: {e}")
             raise e
 
-    def run_cleanup(self):
-        """Clears old cached video metadata from the database and logs the action."""
-        self.clear_old_cache()
+    def run_cleanup(self, days=28):
+        """
+        Clears cached video metadata that has not been accessed recently and logs the action.
+
+        Args:
+            days (int, optional): The number of days since the last access. Defaults to 28.
+        """
+        self.clear_old_cache(days)
         LogHandler.info("Old cache entries cleared.")
 
     def close(self):
-        """Closes the database cursor and connection if they are open."""
+        """Closes the database cursor and connection and any mounted metadata packs."""
+        for pack in self.packs:
+            pack.close()
+        self.packs = []
         if self.cursor:
             self.cursor.close()
         if self.connection:
@@ -84,3 +84,7 @@ class InvalidPlaylist(QueueError):
 
 class InvalidVideo(QueueError):
     """The video is invalid."""
+
+
+class ExtractorError(NextcordJukeBoxError):
+    """Every extractor backend failed to serve the request."""
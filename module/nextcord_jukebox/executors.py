@@ -0,0 +1,202 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from . import LogHandler
+from .metrics import LatencyStats
+
+DEFAULT_EXECUTOR_SIZES = {
+    "extraction": 4,
+    "rendering": 2,
+    "misc": 2,
+    "priority": 2,
+}
+
+
+class WorkloadExecutor:
+    """
+    A bounded thread pool for one class of blocking work.
+
+    Attributes:
+        name (str): The name of the workload class.
+        max_workers (int): The number of worker threads.
+        wait_stats (LatencyStats): Time jobs spent queued before a worker picked them up.
+        run_stats (LatencyStats): Time jobs spent running, including failures.
+    """
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        """
+        Initializes the WorkloadExecutor.
+
+        Args:
+            name (str): The name of the workload class.
+            max_workers (int): The number of worker threads.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.wait_stats = LatencyStats()
+        self.run_stats = LatencyStats()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"jukebox-{name}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+    def _wrap(self, func: Callable, args: tuple, submitted: float) -> Callable:
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self.wait_stats.record(started - submitted)
+            error = None
+            try:
+                return func(*args)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.run_stats.record(time.perf_counter() - started, error)
+
+        return job
+
+    async def run(self, func: Callable, *args):
+        """
+        Runs a blocking function on this executor.
+
+        Args:
+            func (Callable): The function to run.
+            *args: Positional arguments passed to the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        with self._lock:
+            self._queued += 1
+        job = self._wrap(func, args, time.perf_counter())
+        return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+
+    def metrics(self) -> dict:
+        """
+        Returns the queue depth and latency metrics of this executor.
+
+        Returns:
+            dict: The metrics keyed by name.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "wait": self.wait_stats.to_dict(),
+                "run": self.run_stats.to_dict(),
+            }
+
+    def shutdown(self) -> None:
+        """Shuts the executor down, letting already submitted jobs finish in the background."""
+        self._executor.shutdown(wait=False)
+
+
+class ExecutorRegistry:
+    """
+    A registry of named executors, one per workload class.
+
+    Separate pools keep a burst of one kind of work, such as playlist imports, from
+    starving another, such as poster rendering. The "priority" pool is reserved for
+    resolving the stream of the song about to play.
+
+    Attributes:
+        executors (Dict[str, WorkloadExecutor]): The executors keyed by workload class.
+    """
+
+    def __init__(self, sizes: Optional[Dict[str, int]] = None) -> None:
+        """
+        Initializes the ExecutorRegistry.
+
+        Args:
+            sizes (Optional[Dict[str, int]]): Worker counts overriding DEFAULT_EXECUTOR_SIZES. Defaults to None.
+        """
+        self.executors: Dict[str, WorkloadExecutor] = {}
+        self.configure(sizes)
+
+    def configure(self, sizes: Optional[Dict[str, int]] = None) -> None:
+        """
+        (Re)creates the executors with the given sizes. Submitted jobs finish on the old executors.
+
+        Args:
+            sizes (Optional[Dict[str, int]]): Worker counts overriding DEFAULT_EXECUTOR_SIZES. Unknown workload classes are ignored. Defaults to None.
+        """
+        sizes = sizes or {}
+        for name in sizes.keys() - DEFAULT_EXECUTOR_SIZES.keys():
+            LogHandler.warning(f"Ignoring size of unknown executor {name}")
+        merged = {
+            name: sizes.get(name, size) for name, size in DEFAULT_EXECUTOR_SIZES.items()
+        }
+        old = self.executors
+        self.executors = {
+            name: WorkloadExecutor(name, max(1, int(size)))
+            for name, size in merged.items()
+        }
+        for executor in old.values():
+            executor.shutdown()
+        LogHandler.info(
+            "Configured executors: "
+            + ", ".join(f"{name}={size}" for name, size in merged.items())
+        )
+
+    def __getitem__(self, name: str) -> WorkloadExecutor:
+        return self.executors[name]
+
+    async def run(self, name: str, func: Callable, *args):
+        """
+        Runs a blocking function on the named executor.
+
+        Args:
+            name (str): The workload class.
+            func (Callable): The function to run.
+            *args: Positional arguments passed to the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        return await self.executors[name].run(func, *args)
+
+    def metrics(self) -> Dict[str, dict]:
+        """
+        Returns the metrics of every executor.
+
+        Returns:
+            Dict[str, dict]: The metrics keyed by workload class.
+        """
+        return {name: executor.metrics() for name, executor in self.executors.items()}
+
+
+executors = ExecutorRegistry()
@@ -0,0 +1,522 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+import datetime
+import hashlib
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib import parse
+
+import yt_dlp
+from meta_yt import Video, YouTube
+from pytube import Playlist
+from pytube import YouTube as PytubeYouTube
+
+from . import LogHandler
+from .exceptions import ExtractorError
+from .metrics import LatencyStats
+from .ytdlp_pool import YoutubeDLPool
+
+yt_dlp.utils.bug_reports_message = lambda: ""
+
+YTDLP_OPTIONS = {
+    "format": "bestaudio/best",
+    "noplaylist": True,
+    "ignoreerrors": True,
+    "quiet": True,
+    "no_warnings": True,
+    "source_address": "0.0.0.0",
+    "forceip": "4",
+    "skip_download": True,
+    "extract_flat": True,
+    "default_search": "auto",
+}
+
+YTDLP_PLAYLIST_OPTIONS = {
+    **YTDLP_OPTIONS,
+    "noplaylist": False,
+    "extract_flat": "in_playlist",
+}
+
+
+class StreamSource:
+    """
+    A class to represent a resolved audio stream.
+
+    Attributes:
+        url (str): The URL or input specification handed to FFmpeg.
+        expire (Optional[datetime.datetime]): When the stream URL stops being valid, if known.
+        before_options (Optional[str]): FFmpeg input options replacing the player's defaults, if any.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        expire: Optional[datetime.datetime] = None,
+        before_options: Optional[str] = None,
+    ) -> None:
+        self.url: str = url
+        self.expire: Optional[datetime.datetime] = expire
+        self.before_options: Optional[str] = before_options
+
+    @classmethod
+    def from_url(cls, url: str) -> "StreamSource":
+        """
+        Creates a StreamSource from a googlevideo URL, reading its expiry if present.
+
+        Args:
+            url (str): The stream URL.
+
+        Returns:
+            StreamSource: The stream source.
+        """
+        expire = parse.parse_qs(parse.urlparse(url).query).get("expire")
+        return cls(
+            url,
+            expire=(
+                datetime.datetime.fromtimestamp(int(expire[0])) if expire else None
+            ),
+        )
+
+
+class PlaylistInfo:
+    """
+    A class to represent a resolved playlist.
+
+    Attributes:
+        title (str): The title of the playlist.
+        video_urls (List[str]): The URLs of the videos in the playlist.
+    """
+
+    def __init__(self, title: str, video_urls: List[str]) -> None:
+        self.title: str = title
+        self.video_urls: List[str] = video_urls
+
+
+class Extractor:
+    """
+    Base class for extractor backends.
+
+    Every operation is blocking and is expected to be run in an executor. Backends
+    raise NotImplementedError for operations they do not support, which makes the
+    ExtractorChain skip them without counting an error.
+
+    Attributes:
+        name (str): The name of the backend used in logs and metrics.
+    """
+
+    name = "base"
+
+    def fetch_metadata(self, video_id: str) -> dict:
+        """
+        Fetches the metadata of a video.
+
+        Args:
+            video_id (str): The video ID.
+
+        Returns:
+            dict: The metadata in the format stored in the video cache.
+        """
+        raise NotImplementedError
+
+    def search(self, query: str) -> str:
+        """
+        Resolves a search query or URL to a single video URL.
+
+        Args:
+            query (str): The search query or URL.
+
+        Returns:
+            str: The URL of the first matching video.
+        """
+        raise NotImplementedError
+
+    def fetch_stream(self, url: str) -> StreamSource:
+        """
+        Resolves the audio stream of a video.
+
+        Args:
+            url (str): The video URL.
+
+        Returns:
+            StreamSource: The resolved stream.
+        """
+        raise NotImplementedError
+
+    def fetch_playlist(self, url: str) -> PlaylistInfo:
+        """
+        Resolves the videos of a playlist.
+
+        Args:
+            url (str): The playlist URL.
+
+        Returns:
+            PlaylistInfo: The resolved playlist.
+        """
+        raise NotImplementedError
+
+
+class YTDLPExtractor(Extractor):
+    """
+    Extractor backend using yt-dlp.
+
+    Attributes:
+        pool (YoutubeDLPool): The pool of instances used for videos and searches.
+        playlist_pool (YoutubeDLPool): The pool of instances used for playlists.
+    """
+
+    name = "yt-dlp"
+
+    def __init__(self, pool_size: int = 4) -> None:
+        """
+        Initializes the YTDLPExtractor.
+
+        Args:
+            pool_size (int, optional): The number of concurrent yt-dlp extractions. Defaults to 4.
+        """
+        self.pool = YoutubeDLPool(YTDLP_OPTIONS, pool_size)
+        self.playlist_pool = YoutubeDLPool(
+            YTDLP_PLAYLIST_OPTIONS, max(1, pool_size // 2)
+        )
+
+    @staticmethod
+    def _extract(pool: YoutubeDLPool, url: str, priority: bool = False) -> dict:
+        data = pool.extract_info(url, priority)
+        if not data:
+            raise ExtractorError(f"yt-dlp returned nothing for {url}")
+        return data
+
+    def fetch_metadata(self, video_id: str) -> dict:
+        data = self._extract(
+            self.pool, f"https://www.youtube.com/watch?v={video_id}"
+        )
+        return {
+            "url": f"https://www.youtube.com/watch?v={data.get('id', video_id)}",
+            "title": data.get("title"),
+            "views": data.get("view_count"),
+            "duration": data.get("duration"),
+            "thumbnail": data.get("thumbnail"),
+            "channel": data.get("channel") or data.get("uploader"),
+            "channel_url": data.get("channel_url") or data.get("uploader_url"),
+            "thumbnails": [
+                {"url": t["url"], "width": t["width"], "height": t["height"]}
+                for t in data.get("thumbnails") or []
+                if t.get("width") and t.get("height")
+            ],
+        }
+
+    def search(self, query: str) -> str:
+        data = self._extract(self.pool, query)
+        if "entries" in data:
+            entries = [entry for entry in data["entries"] if entry]
+            if not entries:
+                raise ExtractorError(f"yt-dlp found no results for {query}")
+            data = entries[0]
+        return f"https://www.youtube.com/watch?v={data['id']}"
+
+    def fetch_stream(self, url: str) -> StreamSource:
+        return StreamSource.from_url(self._extract(self.pool, url, True)["url"])
+
+    def fetch_playlist(self, url: str) -> PlaylistInfo:
+        data = self._extract(self.playlist_pool, url)
+        return PlaylistInfo(
+            data.get("title") or "",
+            [
+                f"https://www.youtube.com/watch?v={entry['id']}"
+                for entry in data.get("entries") or []
+                if entry and entry.get("id")
+            ],
+        )
+
+
+class MetaYTExtractor(Extractor):
+    """Extractor backend using meta_yt, supporting metadata and search."""
+
+    name = "meta_yt"
+
+    def fetch_metadata(self, video_id: str) -> dict:
+        video = Video(str(video_id))
+        return {
+            "url": video.url,
+            "title": video.title,
+            "views": video.views,
+            "duration": video.duration,
+            "thumbnail": video.thumbnail,
+            "channel": video.channel,
+            "channel_url": video.channel_url,
+            "thumbnails": video.thumbnails,
+        }
+
+    def search(self, query: str) -> str:
+        return YouTube(query).video.url
+
+
+class PytubeExtractor(Extractor):
+    """Extractor backend using pytube, supporting playlists and streams."""
+
+    name = "pytube"
+
+    def fetch_stream(self, url: str) -> StreamSource:
+        stream = PytubeYouTube(url).streams.get_audio_only()
+        if stream is None:
+            raise ExtractorError(f"pytube found no audio stream for {url}")
+        return StreamSource.from_url(stream.url)
+
+    def fetch_playlist(self, url: str) -> PlaylistInfo:
+        playlist = Playlist(url)
+        return PlaylistInfo(playlist.title, list(playlist.video_urls))
+
+
+class FakeExtractor(Extractor):
+    """
+    Deterministic offline extractor backend.
+
+    Every answer is derived from a hash of its input, so the same ID always yields
+    the same metadata. Streams are FFmpeg lavfi sine tones, which lets the whole
+    jukebox run and be benchmarked without network access.
+
+    Attributes:
+        latency (float): Simulated latency in seconds added to every operation.
+        playlist_size (int): The number of videos in every fake playlist.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, playlist_size: int = 25) -> None:
+        self.latency = latency
+        self.playlist_size = playlist_size
+
+    @staticmethod
+    def _digest(value: str) -> bytes:
+        return hashlib.sha256(value.encode("utf8")).digest()
+
+    @classmethod
+    def _video_id(cls, value: str) -> str:
+        alphabet = (
+            "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+        )
+        return "".join(alphabet[b % 64] for b in cls._digest(value)[:11])
+
+    @classmethod
+    def _duration(cls, video_id: str) -> int:
+        return 60 + int.from_bytes(cls._digest(video_id)[5:7], "big") % 240
+
+    def _wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def fetch_metadata(self, video_id: str) -> dict:
+        self._wait()
+        digest = self._digest(video_id)
+        channel = f"Fake Channel {digest[0] % 16}"
+        return {
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "title": f"Fake Song {video_id}",
+            "views": int.from_bytes(digest[1:5], "big"),
+            "duration": self._duration(video_id),
+            "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+            "channel": channel,
+            "channel_url": f"https://www.youtube.com/@fake{digest[0] % 16}",
+            "thumbnails": [
+                {
+                    "url": f"https://i.ytimg.com/vi/{video_id}/{name}.jpg",
+                    "width": width,
+                    "height": height,
+                }
+                for name, width, height in [
+                    ("default", 120, 90),
+                    ("mqdefault", 320, 180),
+                    ("hqdefault", 480, 360),
+                ]
+            ],
+        }
+
+    def search(self, query: str) -> str:
+        self._wait()
+        return f"https://www.youtube.com/watch?v={self._video_id(query)}"
+
+    def fetch_stream(self, url: str) -> StreamSource:
+        self._wait()
+        match = re.search(r"(?:v=|youtu\.be/)([a-zA-Z0-9_-]{11})", url)
+        video_id = match.group(1) if match else self._video_id(url)
+        frequency = 220 + self._digest(video_id)[0] * 2
+        return StreamSource(
+            f"sine=frequency={frequency}:sample_rate=48000:duration={self._duration(video_id)}",
+            before_options="-f lavfi",
+        )
+
+    def fetch_playlist(self, url: str) -> PlaylistInfo:
+        self._wait()
+        match = re.search(r"list=([a-zA-Z0-9_-]+)", url)
+        playlist_id = match.group(1) if match else url
+        return PlaylistInfo(
+            f"Fake Playlist {playlist_id}",
+            [
+                f"https://www.youtube.com/watch?v={self._video_id(f'{playlist_id}:{i}')}"
+                for i in range(self.playlist_size)
+            ],
+        )
+
+
+class ExtractorChain:
+    """
+    A class to run extractor operations over an ordered list of backends.
+
+    Each operation is attempted on every backend in order until one succeeds.
+    Backends not implementing an operation are skipped, failures fall through to
+    the next backend, and latency and errors are recorded per backend and operation.
+
+    Attributes:
+        backends (List[Extractor]): The backends in fallback order.
+        routes (Dict[str, List[Extractor]]): Backend orders overriding `backends` per operation.
+        stats (Dict[Tuple[str, str], LatencyStats]): Metrics keyed by (backend, operation).
+    """
+
+    def __init__(
+        self,
+        backends: List[Extractor],
+        routes: Optional[Dict[str, List[Extractor]]] = None,
+    ) -> None:
+        """
+        Initializes the ExtractorChain with the given backends.
+
+        Args:
+            backends (List[Extractor]): The backends in fallback order.
+            routes (Optional[Dict[str, List[Extractor]]]): Backend orders overriding `backends`
+                for specific operations. Defaults to None.
+        """
+        if not backends:
+            raise ValueError("ExtractorChain requires at least one backend.")
+        self.backends: List[Extractor] = backends
+        self.routes: Dict[str, List[Extractor]] = routes or {}
+        self.stats: Dict[Tuple[str, str], LatencyStats] = {}
+
+    def _record(self, backend, operation, started, error=None):
+        self.stats.setdefault((backend.name, operation), LatencyStats()).record(
+            time.perf_counter() - started, error
+        )
+
+    def _call(self, operation: str, *args):
+        last_error = None
+        for backend in self.routes.get(operation, self.backends):
+            started = time.perf_counter()
+            try:
+                result = getattr(backend, operation)(*args)
+            except NotImplementedError:
+                continue
+            except Exception as e:
+                self._record(backend, operation, started, e)
+                last_error = e
+                LogHandler.warning(
+                    f"Extractor {backend.name} failed to {operation} {args}: {type(e).__name__}: {e}"
+                )
+                continue
+            self._record(backend, operation, started)
+            return result
+        raise ExtractorError(
+            f"No extractor could {operation} {args}: {last_error}"
+        ) from last_error
+
+    def fetch_metadata(self, video_id: str) -> dict:
+        """See Extractor.fetch_metadata."""
+        return self._call("fetch_metadata", video_id)
+
+    def search(self, query: str) -> str:
+        """See Extractor.search."""
+        return self._call("search", query)
+
+    def fetch_stream(self, url: str) -> StreamSource:
+        """See Extractor.fetch_stream."""
+        return self._call("fetch_stream", url)
+
+    def fetch_playlist(self, url: str) -> PlaylistInfo:
+        """See Extractor.fetch_playlist."""
+        return self._call("fetch_playlist", url)
+
+    def metrics(self) -> Dict[str, Dict[str, dict]]:
+        """
+        Returns the latency and error metrics of every backend.
+
+        Returns:
+            Dict[str, Dict[str, dict]]: The metrics keyed by backend then operation, including
+                yt-dlp pool occupancy.
+        """
+        result = {}
+        for (backend, operation), stats in self.stats.items():
+            result.setdefault(backend, {})[operation] = stats.to_dict()
+        for backend in self.backends:
+            if isinstance(backend, YTDLPExtractor):
+                result.setdefault(backend.name, {})["pool"] = backend.pool.metrics()
+                result[backend.name]["playlist_pool"] = backend.playlist_pool.metrics()
+        return result
+
+
+def create_extractor(
+    backend: str = "auto", use_ytdlp: bool = False, ytdlp_pool_size: int = 4
+) -> ExtractorChain:
+    """
+    Creates an ExtractorChain for the given backend selection.
+
+    Args:
+        backend (str, optional): "auto" for the network backends with fallback, "fake" for the
+            offline backend, or a comma separated list of backend names. Defaults to "auto".
+        use_ytdlp (bool, optional): Whether yt-dlp is preferred over meta_yt for metadata and
+            search in "auto" mode. Defaults to False.
+        ytdlp_pool_size (int, optional): The number of concurrent yt-dlp extractions. Defaults to 4.
+
+    Returns:
+        ExtractorChain: The configured chain.
+    """
+    factories = {
+        "yt-dlp": lambda: YTDLPExtractor(ytdlp_pool_size),
+        "meta_yt": MetaYTExtractor,
+        "pytube": PytubeExtractor,
+        "fake": FakeExtractor,
+    }
+    if backend != "auto":
+        names = [name.strip() for name in backend.split(",") if name.strip()]
+        unknown = [name for name in names if name not in factories]
+        if unknown:
+            raise ValueError(f"Unknown extractor backend(s): {', '.join(unknown)}")
+        LogHandler.info(f"Using extractor backends: {', '.join(names)}")
+        return ExtractorChain([factories[name]() for name in names])
+
+    backends = {name: factories[name]() for name in ["yt-dlp", "meta_yt", "pytube"]}
+    metadata = (
+        [backends["yt-dlp"], backends["meta_yt"]]
+        if use_ytdlp
+        else [backends["meta_yt"], backends["yt-dlp"]]
+    )
+    LogHandler.info(
+        f"Using extractor backends: {', '.join(b.name for b in metadata)} for metadata"
+    )
+    return ExtractorChain(
+        list(backends.values()),
+        routes={
+            "fetch_metadata": metadata,
+            "search": metadata,
+            "fetch_stream": [backends["yt-dlp"], backends["pytube"]],
+            "fetch_playlist": [backends["pytube"], backends["yt-dlp"]],
+        },
+    )
@@ -0,0 +1,202 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+"""
+Read-only, memory-mapped packs of cached video metadata.
+
+A pack is an immutable file exported from the metadata cache that new nodes mount beneath
+their SQL cache to start warm. Layout, all integers little-endian:
+
+    header   magic "RJMP", version u32, entry count u32, key width u32
+    index    entry count x (video ID padded to key width, data offset u64, data length u32), sorted by video ID
+    data     one UTF-8 JSON object per video
+
+Lookups binary search the fixed-width index directly in the mapping, so only the matching
+entry is ever decoded and the OS pages in just the parts of the file that are read.
+
+Usage:
+    python -m module.nextcord_jukebox.metadata_pack export --db sqlite/database.db --out metadata.pack
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+
+MAGIC = b"RJMP"
+VERSION = 1
+KEY_WIDTH = 16
+HEADER = struct.Struct("<4sIII")
+ENTRY = struct.Struct(f"<{KEY_WIDTH}sQI")
+
+
+def write_pack(path: str, items) -> int:
+    """
+    Writes a metadata pack. The file is written next to `path` and moved into place once complete.
+
+    Args:
+        path (str): The pack file path.
+        items (Iterable[tuple[str, dict]]): (video ID, metadata) pairs.
+
+    Returns:
+        int: The number of entries written.
+    """
+    blobs = {}
+    for video_id, metadata in items:
+        key = str(video_id).encode("utf8")
+        if len(key) > KEY_WIDTH:
+            raise ValueError(f"Video ID {video_id} is longer than {KEY_WIDTH} bytes")
+        blobs[key] = json.dumps(metadata, separators=(",", ":")).encode("utf8")
+
+    keys = sorted(blobs)
+    offset = HEADER.size + ENTRY.size * len(keys)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(keys), KEY_WIDTH))
+        for key in keys:
+            file.write(ENTRY.pack(key, offset, len(blobs[key])))
+            offset += len(blobs[key])
+        for key in keys:
+            file.write(blobs[key])
+    os.replace(temp_path, path)
+    return len(keys)
+
+
+class MetadataPack:
+    """
+    A memory-mapped metadata pack opened for lookups.
+
+    Attributes:
+        path (str): The pack file path.
+        count (int): The number of entries in the pack.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens and maps a metadata pack.
+
+        Args:
+            path (str): The pack file path.
+
+        Raises:
+            ValueError: If the file is not a supported metadata pack.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a supported metadata pack")
+        try:
+            magic, version, self.count, key_width = HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        if magic != MAGIC or version != VERSION or key_width != KEY_WIDTH:
+            self.close()
+            raise ValueError(f"{path} is not a supported metadata pack")
+        if HEADER.size + self.count * ENTRY.size > len(self._map):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def _key_at(self, index: int) -> bytes:
+        start = HEADER.size + index * ENTRY.size
+        return self._map[start : start + KEY_WIDTH]
+
+    def get(self, video_id: str) -> dict | None:
+        """
+        Looks up the metadata of a video.
+
+        Args:
+            video_id (str): The video ID.
+
+        Returns:
+            dict | None: The metadata if the video is in the pack, None otherwise.
+        """
+        key = str(video_id).encode("utf8").ljust(KEY_WIDTH, b"\0")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count or self._key_at(low) != key:
+            return None
+        _, offset, length = ENTRY.unpack_from(
+            self._map, HEADER.size + low * ENTRY.size
+        )
+        return json.loads(self._map[offset : offset + length])
+
+    def __contains__(self, video_id: str) -> bool:
+        return self.get(video_id) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """Unmaps and closes the pack file."""
+        self._map.close()
+        self._file.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m module.nextcord_jukebox.metadata_pack",
+        description="Exports the jukebox metadata cache to a memory-mappable pack.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export = subparsers.add_parser("export", help="Export the metadata cache to a pack")
+    export.add_argument("--db", default="sqlite/database.db", help="SQLite database path")
+    export.add_argument("--mysql", action="store_true", help="Use the MySQL database from the MYSQL_* environment variables")
+    export.add_argument("--out", required=True, help="Pack file to write")
+    args = parser.parse_args()
+
+    from .database_handler import Database
+
+    if args.mysql:
+        database = Database(
+            "mysql",
+            host=os.getenv("MYSQL_HOST"),
+            user=os.getenv("MYSQL_USER"),
+            password=os.getenv("MYSQL_PASSWORD"),
+            database=os.getenv("MYSQL_DATABASE"),
+            port=int(os.getenv("MYSQL_PORT", 3306)),
+        )
+    else:
+        database = Database("sqlite", db_file=args.db)
+    started = time.perf_counter()
+    try:
+        count = write_pack(args.out, database.export_video_metadata())
+    finally:
+        database.close()
+    print(
+        f"Exported {count} videos to {args.out} ({os.path.getsize(args.out)} bytes) in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+import asyncio
+from collections import deque
+from typing import Iterable
+
+from . import LogHandler
+from .executors import executors
+
+
+class MetadataRefresher:
+    """
+    Refreshes stale cached video metadata in the background so stale entries can be served immediately.
+
+    Video IDs are deduplicated and held in a bounded queue; IDs beyond the bound are dropped and
+    picked up again the next time they are read. A single worker drains the queue, waiting
+    `interval` seconds between refreshes so revalidation never competes with user requests.
+
+    Attributes:
+        database (Database): The database the refreshed metadata is written to.
+        extractor (Extractor): The extractor used to fetch metadata.
+        max_pending (int): The maximum number of queued refreshes.
+        interval (float): Seconds to wait between refreshes.
+    """
+
+    def __init__(self, database, extractor, max_pending: int = 256, interval: float = 2.0):
+        """
+        Initializes the MetadataRefresher.
+
+        Args:
+            database (Database): The database the refreshed metadata is written to.
+            extractor (Extractor): The extractor used to fetch metadata.
+            max_pending (int, optional): The maximum number of queued refreshes. Defaults to 256.
+            interval (float, optional): Seconds to wait between refreshes. Defaults to 2.0.
+        """
+        self.database = database
+        self.extractor = extractor
+        self.max_pending = max_pending
+        self.interval = interval
+        self._queue = deque()
+        self._pending = set()
+        self._task = None
+        self.refreshed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def enqueue(self, video_ids: Iterable[str]) -> None:
+        """
+        Queues video IDs for a background refresh. Must be called from the bot's event loop.
+
+        Args:
+            video_ids (Iterable[str]): The video IDs whose cached metadata is stale.
+        """
+        for video_id in video_ids:
+            if video_id in self._pending:
+                continue
+            if len(self._queue) >= self.max_pending:
+                self.dropped += 1
+                continue
+            self._pending.add(video_id)
+            self._queue.append(video_id)
+        if self._queue and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._worker())
+
+    async def _worker(self):
+        while self._queue:
+            video_id = self._queue.popleft()
+            try:
+                meta = await executors.run(
+                    "extraction", self.extractor.fetch_metadata, video_id
+                )
+                self.database.cache_video_metadata(video_id, meta)
+                self.refreshed += 1
+            except Exception as e:
+                self.failed += 1
+                LogHandler.warning(f"Failed to refresh metadata for {video_id}: {e}")
+            finally:
+                self._pending.discard(video_id)
+            await asyncio.sleep(self.interval)
+
+    def metrics(self) -> dict:
+        """
+        Retrieves the refresh queue counters.
+
+        Returns:
+            dict: The queue depth and the refreshed, failed and dropped counts.
+        """
+        return {
+            "queue_depth": len(self._queue),
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    def close(self):
+        """Stops the worker and discards queued refreshes."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._queue.clear()
+        self._pending.clear()
@@ -0,0 +1,110 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+import time
+from typing import Optional
+
+
+class LatencyStats:
+    """
+    A class to accumulate call counts, errors and latency for a single operation.
+
+    Attributes:
+        count (int): The number of recorded calls.
+        errors (int): The number of recorded calls that failed.
+        total (float): The summed latency of all recorded calls in seconds.
+        max (float): The highest latency recorded in seconds.
+        last (float): The latency of the most recent call in seconds.
+        last_error (Optional[str]): A description of the most recent failure.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty LatencyStats instance."""
+        self.count: int = 0
+        self.errors: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.last: float = 0.0
+        self.last_error: Optional[str] = None
+
+    def record(self, elapsed: float, error: Optional[Exception] = None) -> None:
+        """
+        Records a single call.
+
+        Args:
+            elapsed (float): The latency of the call in seconds.
+            error (Optional[Exception]): The exception raised by the call, if any.
+        """
+        self.count += 1
+        self.total += elapsed
+        self.last = elapsed
+        self.max = max(self.max, elapsed)
+        if error is not None:
+            self.errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+
+    def timer(self) -> "_StatsTimer":
+        """
+        Returns a context manager that records the latency of its body.
+
+        Returns:
+            _StatsTimer: The context manager bound to this instance.
+        """
+        return _StatsTimer(self)
+
+    @property
+    def average(self) -> float:
+        """float: The mean latency of all recorded calls in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Converts the statistics to a dictionary.
+
+        Returns:
+            dict: The statistics keyed by name.
+        """
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "average": self.average,
+            "max": self.max,
+            "last": self.last,
+            "last_error": self.last_error,
+        }
+
+
+class _StatsTimer:
+    """A context manager recording the latency of its body into a LatencyStats."""
+
+    def __init__(self, stats: LatencyStats) -> None:
+        self.stats = stats
+        self.started = 0.0
+
+    def __enter__(self) -> "_StatsTimer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.stats.record(time.perf_counter() - self.started, exc)
+        return False
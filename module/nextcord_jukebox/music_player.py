@@ -22,40 +22,26 @@
 #
 
 import asyncio
-import datetime
 import random
+import sys
 import time
 from typing import Callable, Optional, Union
 from urllib import parse
 
-import yt_dlp
-from meta_yt import Video, YouTube
 from nextcord import FFmpegPCMAudio, Interaction, PCMVolumeTransformer
-from pytube import Playlist
 from termcolor import colored
 
 from . import LogHandler
 from .enums import LOOPMODE
 from .event_manager import EventManager
 from .exceptions import *
+from .executors import executors
+from .extractors import StreamSource
 from .song import Song
+from .song_queue import SongQueue
 from .utils import get_video_id
 
-yt_dlp.utils.bug_reports_message = lambda: ""
-ytdlp = yt_dlp.YoutubeDL(
-    {
-        "format": "bestaudio/best",
-        "noplaylist": True,
-        "ignoreerrors": True,
-        "quiet": True,
-        "no_warnings": True,
-        "source_address": "0.0.0.0",
-        "forceip": "4",
-        "skip_download": True,
-        "extract_flat": True,
-        "default_search": "auto",
-    }
-)
+DEGRADABLE_FILTERS = {"loudnorm"}
 
 
 class MusicPlayer:
@@ -74,16 +60,25 @@ class MusicPlayer:
         leave_when_empty (bool): Whether to leave the voice channel when the queue is empty.
         manager (PlayerManager): The player manager instance managing this player.
         database: The database instance for caching video metadata.
-        music_queue (list): The queue of songs to play.
+        extractor (ExtractorChain): The extractor backends used to resolve metadata, streams and playlists.
+        music_queue (SongQueue): The queue of songs to play, the first song being the one playing.
         _fetching_stream (bool): Whether a stream is currently being fetched.
         _appending (bool): Whether songs are being appended to the queue.
         _asyncio_lock (asyncio.Lock): An asyncio lock for handling concurrency.
         _members (list): The list of members currently in the voice channel.
         ffmpeg_opts (dict): Options for FFmpeg.
+        audio_filters (list): The FFmpeg audio filters applied to every stream.
+        volume (float): The playback volume, 1.0 being unchanged, applied in the FFmpeg filter graph.
+        last_active (float): Monotonic time the player was last playing or used.
     """
 
     def __init__(
-        self, manager, interaction: Interaction, bot, ffmpeg_opts=None
+        self,
+        manager,
+        interaction: Interaction,
+        bot,
+        ffmpeg_opts=None,
+        audio_filters=None,
     ) -> None:
         """
         Initializes the MusicPlayer with the given interaction and bot instances.
@@ -93,6 +88,7 @@ class MusicPlayer:
             interaction (Interaction): The interaction object containing information about the user and the guild.
             bot: The bot instance to which this player is attached.
             ffmpeg_opts (dict, optional): Options for FFmpeg. Defaults to None.
+            audio_filters (list, optional): The FFmpeg audio filters applied to every stream. Defaults to ["loudnorm"].
         """
         self.loop = None
         self.voice = None
@@ -106,16 +102,24 @@ class MusicPlayer:
         self.leave_when_empty = False
         self.manager = manager
         self.database = manager.database
+        self.extractor = manager.extractor
 
-        self.music_queue = []
+        self.music_queue = SongQueue()
         self._fetching_stream = False
         self._appending = False
         self._asyncio_lock = asyncio.Lock()
         self._members = []
         self.ffmpeg_opts = ffmpeg_opts or {
-            "options": "-vn -af loudnorm",
+            "options": "-vn",
             "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 0",
         }
+        self.audio_filters = ["loudnorm"] if audio_filters is None else audio_filters
+        self.volume = 1.0
+        self._stream = None
+        self._degraded = False
+        self._stream_volume = 1.0
+        self._suppressed_after = 0
+        self.last_active = time.monotonic()
 
     async def _attempt_reconnect(self, max_retries=5, delay=1):
         """
@@ -166,19 +170,46 @@ class MusicPlayer:
             new_members = set(self.voice.channel.members)
             old_members = set(self._members)
 
-            await asyncio.gather(
-                *(
-                    EventManager.fire("member_joined_voice", self, m)
-                    for m in new_members - old_members
-                ),
-                *(
-                    EventManager.fire("member_left_voice", self, m)
-                    for m in old_members - new_members
-                ),
-            )
+            for m in new_members - old_members:
+                EventManager.fire_nowait("member_joined_voice", self, m)
+            for m in old_members - new_members:
+                EventManager.fire_nowait("member_left_voice", self, m)
 
             self._members = self.voice.channel.members
 
+    def _ffmpeg_options(
+        self, stream: StreamSource, degraded: bool = False, position: float = 0.0
+    ) -> dict:
+        """
+        Builds the FFmpeg options for a stream.
+
+        Args:
+            stream (StreamSource): The stream about to be played.
+            degraded (bool, optional): Whether to drop expensive filters because the node is saturated. Defaults to False.
+            position (float, optional): The position in seconds to start the stream at. Defaults to 0.0.
+
+        Returns:
+            dict: The keyword arguments for FFmpegPCMAudio.
+        """
+        options = dict(self.ffmpeg_opts)
+        if stream.before_options is not None:
+            options["before_options"] = stream.before_options
+        if position > 0:
+            options["before_options"] = (
+                f"{options.get('before_options', '')} -ss {position:.3f}"
+            )
+
+        filters = [
+            f
+            for f in self.audio_filters
+            if not (degraded and f.split("=")[0] in DEGRADABLE_FILTERS)
+        ]
+        if self.volume != 1.0:
+            filters.append(f"volume={self.volume:.3f}")
+        if filters:
+            options["options"] = f"{options.get('options', '')} -af {','.join(filters)}"
+        return options
+
     async def _play_func(self, last: Union[Song, None], new):
         """
         Plays a new song and updates the now playing state.
@@ -192,6 +223,13 @@ class MusicPlayer:
         """
         if self.voice:
             self._members = self.voice.channel.members
+        if not self.interaction.guild.voice_client:
+            return
+
+        # Admission may wait for a free FFmpeg slot, so it happens before taking the
+        # lock to keep volume changes of this guild responsive meanwhile.
+        degraded = await self.manager.ffmpeg.admit(self.interaction.guild.id)
+        playing = False
 
         async with self._asyncio_lock:
             try:
@@ -199,8 +237,8 @@ class MusicPlayer:
                     timer = time.time()
                     print(colored(f"Extracting Song... {new.title}", "dark_grey"))
 
-                    data = await self.loop.run_in_executor(
-                        None, lambda: ytdlp.extract_info(new.url, download=False)
+                    stream = await executors.run(
+                        "priority", self.extractor.fetch_stream, new.url
                     )
 
                     print(
@@ -209,26 +247,27 @@ class MusicPlayer:
                             "dark_grey",
                         )
                     )
-                    source_url = data["url"]
+                    source_url = stream.url
                     new.source_url = source_url
 
-                    audio_source = FFmpegPCMAudio(source_url, **self.ffmpeg_opts)
-                    self.voice.play(
-                        PCMVolumeTransformer(audio_source), after=self._after_func
+                    audio_source = FFmpegPCMAudio(
+                        source_url, **self._ffmpeg_options(stream, degraded)
                     )
+                    self.voice.play(audio_source, after=self._after_func)
+                    playing = True
+                    self.manager.ffmpeg.track(self.interaction.guild.id, audio_source)
+                    self._stream = stream
+                    self._degraded = degraded
+                    self._stream_volume = self.volume
 
                     self._now_playing = new
                     await self._now_playing.start()
 
                     print(colored(f"[PLAYING] {new.title}", "light_blue"))
 
-                    expire_unix_time = parse.parse_qs(parse.urlparse(source_url).query)[
-                        "expire"
-                    ][0]
-                    expire_time = datetime.datetime.fromtimestamp(int(expire_unix_time))
                     print(
                         colored(
-                            f"Queue Source (Expire: {expire_time}):\n{source_url}",
+                            f"Queue Source (Expire: {stream.expire}):\n{source_url}",
                             "dark_grey",
                         )
                     )
@@ -242,6 +281,9 @@ class MusicPlayer:
                 if str(e) == "Not connected to voice.":
                     return
                 raise e
+            finally:
+                if not playing:
+                    self.manager.ffmpeg.release(self.interaction.guild.id)
 
     async def _pop_queue(self, index: int = 1, append: bool = False):
         """
@@ -290,6 +332,10 @@ class MusicPlayer:
         Args:
             error (Union[None, Exception], optional): An exception if one occurred. Defaults to None.
         """
+        if self._suppressed_after:
+            self._suppressed_after -= 1
+            return
+        self.manager.ffmpeg.release(self.interaction.guild.id)
         if error:
             raise error
         if len(self.music_queue) > 0:
@@ -353,6 +399,7 @@ class MusicPlayer:
 
         def decorator(function):
             async def wrapper(self, *args, **kwargs):
+                self.last_active = time.monotonic()
                 if await self._pre_check(*d_args, **d_kwargs):
                     return await function(self, *args, **kwargs)
 
@@ -362,9 +409,14 @@ class MusicPlayer:
 
     async def cleanup(self):
         """
-        Cleans up the music player by clearing the queue and disconnecting from the voice channel.
+        Cleans up the music player by clearing the queue, dropping the playback state and disconnecting from the voice channel.
         """
-        self.music_queue = []
+        self.removed = True
+        self.music_queue.clear()
+        self._now_playing = None
+        self._stream = None
+        self._members = []
+        self.manager.ffmpeg.release(self.interaction.guild.id)
         try:
             if self.voice:
                 await self.voice.disconnect()
@@ -374,6 +426,22 @@ class MusicPlayer:
             )
         return
 
+    async def _fetch_metadata(self, video_id: str) -> dict:
+        """
+        Fetches the metadata of a video through the extractor backends and caches it.
+
+        Args:
+            video_id (str): The video ID.
+
+        Returns:
+            dict: The fetched metadata.
+        """
+        meta = await executors.run(
+            "extraction", self.extractor.fetch_metadata, str(video_id)
+        )
+        self.database.cache_video_metadata(video_id, meta)
+        return meta
+
     async def _process_songs(self, video_ids, cache_metas):
         songs = []
         for video_id in video_ids:
@@ -388,18 +456,7 @@ class MusicPlayer:
     async def _process_missing_songs(self, missing_ids):
         songs = []
         for video_id in missing_ids:
-            video = await self.loop.run_in_executor(None, lambda: Video(str(video_id)))
-            meta = {
-                "url": video.url,
-                "title": video.title,
-                "views": video.views,
-                "duration": video.duration,
-                "thumbnail": video.thumbnail,
-                "channel": video.channel,
-                "channel_url": video.channel_url,
-                "thumbnails": video.thumbnails,
-            }
-            self.database.cache_video_metadata(video_id, meta)
+            meta = await self._fetch_metadata(video_id)
             song = Song(**meta)
             songs.append(song)
             self.music_queue.append(song)
@@ -423,7 +480,6 @@ class MusicPlayer:
             tuple: A tuple containing the processed songs and the failed songs.
         """
         timer = time.time()
-        self.database.run_cleanup()
         failed_songs = []
         processed_songs = []
 
@@ -459,20 +515,7 @@ class MusicPlayer:
 
         for video_id in missing_ids:
             try:
-                video = await self.loop.run_in_executor(
-                    None, lambda: Video(str(video_id))
-                )
-                meta = {
-                    "url": video.url,
-                    "title": video.title,
-                    "views": video.views,
-                    "duration": video.duration,
-                    "thumbnail": video.thumbnail,
-                    "channel": video.channel,
-                    "channel_url": video.channel_url,
-                    "thumbnails": video.thumbnails,
-                }
-                self.database.cache_video_metadata(video_id, meta)
+                meta = await self._fetch_metadata(video_id)
                 song = Song(**meta)
                 processed_songs.append(song)
                 self.music_queue.append(song)
@@ -500,25 +543,12 @@ class MusicPlayer:
         Returns:
             Song: The queued song.
         """
-        # TODO: self.database.run_cleanup() を呼び出し続けると、ボットの負荷が高くなると思う、だからこれより良い方法を探してください
         timer = time.time()
-        self.database.run_cleanup()
         video_id = await get_video_id(video_url)
         cached_meta = self.database.get_cached_video_metadata(video_id)
 
         if cached_meta is None:
-            video = await self.loop.run_in_executor(None, lambda: Video(video_id))
-            meta = {
-                "url": video.url,
-                "title": video.title,
-                "views": video.views,
-                "duration": video.duration,
-                "thumbnail": video.thumbnail,
-                "channel": video.channel,
-                "channel_url": video.channel_url,
-                "thumbnails": video.thumbnails,
-            }
-            self.database.cache_video_metadata(video_id, meta)
+            meta = await self._fetch_metadata(video_id)
         else:
             meta = cached_meta
 
@@ -532,6 +562,23 @@ class MusicPlayer:
         print(colored(text=f"Time taken: {time.time() - timer}", color="dark_grey"))
         return song
 
+    async def _failed_title(self, video_url: str, query: str) -> str:
+        """
+        Names a video that failed to queue, by its title if its metadata was resolved.
+
+        Args:
+            video_url (str): The URL the query resolved to.
+            query (str): The query as entered.
+
+        Returns:
+            str: The video title, or the query if the metadata is unknown.
+        """
+        try:
+            meta = self.database.get_cached_video_metadata(await get_video_id(video_url))
+        except Exception:
+            meta = None
+        return (meta or {}).get("title") or query
+
     @staticmethod
     def is_valid_playlist_url(query: str) -> bool:
         """
@@ -559,7 +606,7 @@ class MusicPlayer:
             query (str): Search query or URL to queue.
 
         Returns:
-            Union[Playlist, Song]: The queued playlist or song.
+            Union[PlaylistInfo, Song]: The queued playlist or song.
 
         Raises:
             NoQueryResult: If no results are found for the given query.
@@ -572,7 +619,9 @@ class MusicPlayer:
 
         try:
             if self.is_valid_playlist_url(query):
-                playlist = await asyncio.to_thread(Playlist, query)
+                playlist = await executors.run(
+                    "extraction", self.extractor.fetch_playlist, query
+                )
                 await EventManager.fire("loading_playlist", self, interaction, None)
 
                 after_playlist = (
@@ -592,14 +641,16 @@ class MusicPlayer:
                 failed_songs.extend(failed)
             else:
                 try:
-                    yt = await asyncio.to_thread(YouTube, query)
+                    video_url = await executors.run(
+                        "extraction", self.extractor.search, query
+                    )
                 except Exception as e:
                     failed_songs.append(query)
                 else:
                     try:
-                        result = await self._queue_single(yt.video.url)
+                        result = await self._queue_single(video_url)
                     except Exception as e:
-                        failed_songs.append(yt.video.title or query)
+                        failed_songs.append(await self._failed_title(video_url, query))
                         LogHandler.error(f"Failed to queue song: {e}")
 
         except Exception as e:
@@ -666,6 +717,7 @@ class MusicPlayer:
             self.voice.resume()
             song = self._now_playing
             await song.resume()
+            EventManager.fire_nowait("track_resumed", self, self.interaction, song)
             return song
         raise NotPaused
 
@@ -685,6 +737,7 @@ class MusicPlayer:
             self.voice.pause()
             song = self._now_playing
             await song.pause()
+            EventManager.fire_nowait("track_paused", self, self.interaction, song)
             return song
         raise AlreadyPaused
 
@@ -728,7 +781,7 @@ class MusicPlayer:
         last = self.music_queue[len(self.music_queue) - 2 :]
         last.extend(first)
 
-        self.music_queue = last
+        self.music_queue[:] = last
 
         if not len(self.music_queue) > 1:
             self.music_queue.append(self.music_queue[0])
@@ -748,12 +801,86 @@ class MusicPlayer:
             list: The shuffled music queue.
         """
         if len(self.music_queue) > 0:
-            self.music_queue = [self.music_queue[0]] + random.sample(
+            self.music_queue[1:] = random.sample(
                 self.music_queue[1:], len(self.music_queue) - 1
             )
 
         return self.music_queue
 
+    async def _restart_stream(self) -> bool:
+        """
+        Restarts FFmpeg for the current song at its current position, picking up filter changes.
+
+        Returns:
+            bool: True if the stream was restarted, False if playback stopped because the new stream could not be played.
+
+        Raises:
+            Exception: If the new FFmpeg source could not be created. The old stream keeps playing.
+        """
+        position = self._now_playing.timer.elapsed
+        audio_source = FFmpegPCMAudio(
+            self._stream.url,
+            **self._ffmpeg_options(self._stream, self._degraded, position),
+        )
+        self._suppressed_after += 1
+        self.voice.stop()
+        try:
+            self.voice.play(audio_source, after=self._after_func)
+        except Exception as e:
+            audio_source.cleanup()
+            LogHandler.error(
+                f"Failed to play the restarted stream. {type(e).__name__}: {e}"
+            )
+            return False
+        if self.paused:
+            self.voice.pause()
+        self.manager.ffmpeg.track(self.interaction.guild.id, audio_source)
+        self._stream_volume = self.volume
+        return True
+
+    @pre_check()
+    async def set_volume(self, volume: float) -> float:
+        """
+        Changes the playback volume.
+
+        The volume is applied in the FFmpeg filter graph by restarting the stream at the
+        current position. If the new stream cannot be created, the volume falls back to a
+        Python-side PCMVolumeTransformer for the rest of the song. If it cannot be played
+        after the old one was stopped, the queue moves on as if the song had ended.
+
+        Args:
+            volume (float): The new volume, 1.0 being unchanged.
+
+        Returns:
+            float: The new volume.
+        """
+        self.volume = volume
+        if self._now_playing is None or self._stream is None:
+            return self.volume
+        if not (self.voice.is_playing() or self.voice.is_paused()):
+            return self.volume
+
+        async with self._asyncio_lock:
+            try:
+                restarted = await self._restart_stream()
+            except Exception as e:
+                restarted = True
+                LogHandler.warning(
+                    f"Failed to restart stream for volume change, using PCMVolumeTransformer. {type(e).__name__}: {e}"
+                )
+                relative = (
+                    self.volume / self._stream_volume if self._stream_volume else 0.0
+                )
+                if isinstance(self.voice.source, PCMVolumeTransformer):
+                    self.voice.source.volume = relative
+                else:
+                    self.voice.source = PCMVolumeTransformer(self.voice.source, relative)
+        if not restarted:
+            # The stopped stream's suppressed after callback is consumed by whichever of
+            # the two calls runs first, so the queue advances exactly once.
+            await self._after_func()
+        return self.volume
+
     @pre_check(check_nowplaying=True)
     async def now_playing(self):
         """
@@ -774,6 +901,38 @@ class MusicPlayer:
         """
         return self.music_queue
 
+    def time_until(self, index: int) -> float:
+        """
+        Computes how long until the song at a queue position starts playing, assuming nothing is skipped.
+
+        Args:
+            index (int): The queue position, 0 being the song that is playing.
+
+        Returns:
+            float: The time in seconds.
+        """
+        if index <= 0:
+            return 0.0
+        return max(self.music_queue.duration_before(index) - self._elapsed(), 0.0)
+
+    def remaining_duration(self) -> float:
+        """
+        Computes how long the queue keeps playing, including the rest of the current song.
+
+        Returns:
+            float: The time in seconds.
+        """
+        return max(self.music_queue.total_duration() - self._elapsed(), 0.0)
+
+    def _elapsed(self) -> float:
+        if (
+            self._now_playing is not None
+            and self.music_queue
+            and self.music_queue[0] is self._now_playing
+        ):
+            return self._now_playing.timer.elapsed
+        return 0.0
+
     @pre_check()
     async def stop(self, disconnect=True):
         """
@@ -785,12 +944,13 @@ class MusicPlayer:
         Returns:
             bool: True if stopped successfully.
         """
-        self.music_queue = []
+        self.music_queue.clear()
 
         try:
             self.voice.stop()
         except Exception:
             pass
+        self.manager.ffmpeg.release(self.interaction.guild.id)
 
         if disconnect:
             await self.voice.disconnect()
@@ -814,12 +974,56 @@ class MusicPlayer:
             await self.skip()
         elif index == -1:
             self.voice.stop()
-            self.music_queue = []
+            self.music_queue.clear()
         else:
             song = self.music_queue.pop(index)
 
         return song
 
+    def is_active(self) -> bool:
+        """
+        Checks whether the player is doing work. A paused or disconnected player is not active.
+
+        Returns:
+            bool: True if the player is playing or loading songs.
+        """
+        if self._fetching_stream or self._appending:
+            return True
+        return bool(
+            self.voice and self.voice.is_connected() and self.voice.is_playing()
+        )
+
+    def idle_for(self, now: Optional[float] = None) -> float:
+        """
+        Returns how long the player has been idle, refreshing `last_active` while it is active.
+
+        Args:
+            now (Optional[float], optional): The current monotonic time. Defaults to None.
+
+        Returns:
+            float: Seconds since the player was last active, 0 while it is active.
+        """
+        now = time.monotonic() if now is None else now
+        if self.is_active():
+            self.last_active = now
+        return max(now - self.last_active, 0.0)
+
+    def memory_usage(self) -> int:
+        """
+        Approximates the memory held by the player's queue and songs.
+
+        Returns:
+            int: The approximate size in bytes.
+        """
+        size = sys.getsizeof(self.music_queue) + sys.getsizeof(
+            getattr(self.music_queue, "_tree", ())
+        )
+        for song in self.music_queue:
+            fields = vars(song)
+            size += sys.getsizeof(song) + sys.getsizeof(fields)
+            size += sum(sys.getsizeof(value) for value in fields.values())
+        return size
+
     @property
     def fetching_stream(self):
         """bool: Whether a stream is currently being fetched."""
@@ -42,12 +42,22 @@ Methods:
 #  ------------------------------------------------------------
 #
 
+import asyncio
+import time
+from typing import Dict, Optional
+
 from nextcord import BotIntegration, Interaction, Member
 from nextcord.utils import get
 
+from . import LogHandler
 from .database_handler import Database
+from .event_manager import EventManager
 from .exceptions import UserNotConnected, VoiceChannelMismatch
+from .executors import executors
+from .extractors import create_extractor
+from .metadata_refresh import MetadataRefresher
 from .music_player import MusicPlayer
+from .process_monitor import FFmpegMonitor
 from .replay_handler import attach as attach_replay
 from .sockets import attach as attach_sockets
 
@@ -65,15 +75,59 @@ class PlayerManager:
         mysql_database: str = "jukebox",
         enable_rpc: bool = True,
         enable_replay: bool = True,
+        extractor_backend: str = "auto",
+        use_ytdlp: bool = False,
+        ytdlp_pool_size: int = 4,
+        executor_sizes: Optional[Dict[str, int]] = None,
+        ffmpeg_max_processes: int = 0,
+        ffmpeg_cpu_threshold: float = 0,
+        ffmpeg_saturation_policy: str = "degrade",
+        replay_retention_days: int = 0,
+        metadata_stale_days: float = 7,
+        metadata_expire_days: float = 28,
+        metadata_refresh_interval: float = 2.0,
+        metadata_packs: Optional[list] = None,
+        rpc_mode: str = "loop",
+        player_idle_timeout: float = 600,
     ):
         """
         Initializes the PlayerManager with the given bot instance.
 
         Args:
             bot (Bot): The bot instance to which the PlayerManager is attached.
+            extractor_backend (str, optional): The extractor backends to use, see `create_extractor`. Defaults to "auto".
+            use_ytdlp (bool, optional): Whether yt-dlp is preferred over meta_yt for metadata. Defaults to False.
+            ytdlp_pool_size (int, optional): The number of concurrent yt-dlp extractions. Defaults to 4.
+            executor_sizes (Optional[Dict[str, int]], optional): Worker counts per workload class, see `ExecutorRegistry`. Defaults to None.
+            ffmpeg_max_processes (int, optional): The maximum number of concurrent FFmpeg processes, 0 for no limit. Defaults to 0.
+            ffmpeg_cpu_threshold (float, optional): The system CPU percentage considered saturated, 0 to ignore CPU. Defaults to 0.
+            ffmpeg_saturation_policy (str, optional): "degrade" to drop expensive filters or "queue" to wait when saturated. Defaults to "degrade".
+            replay_retention_days (int, optional): Days of raw replay events to keep, 0 to keep them forever. Defaults to 0.
+            metadata_stale_days (float, optional): Days after which cached metadata is served stale and refreshed in the background. Defaults to 7.
+            metadata_expire_days (float, optional): Days without access after which cached metadata is deleted. Defaults to 28.
+            metadata_refresh_interval (float, optional): Seconds between background metadata refreshes. Defaults to 2.0.
+            metadata_packs (Optional[list], optional): Paths of metadata packs mounted beneath the SQL cache. Defaults to None.
+            rpc_mode (str, optional): "loop" to run the RPC WebSocket server on the bot's event loop, "thread" to run it on a separate thread. Defaults to "loop".
+            player_idle_timeout (float, optional): Seconds a player may stay idle, paused or disconnected before it is removed, 0 to keep players forever. Defaults to 600.
         """
         self.players = {}
         self.bot = bot
+        self.replay_retention_days = replay_retention_days
+        self.metadata_expire_days = metadata_expire_days
+        self._maintenance_task = None
+        self.player_idle_timeout = player_idle_timeout
+        self.reaped = 0
+        self._reaper_task = None
+        if executor_sizes:
+            executors.configure(executor_sizes)
+        self.ffmpeg = FFmpegMonitor(
+            max_processes=ffmpeg_max_processes,
+            cpu_threshold=ffmpeg_cpu_threshold,
+            policy=ffmpeg_saturation_policy,
+        )
+        self.extractor = create_extractor(
+            extractor_backend, use_ytdlp=use_ytdlp, ytdlp_pool_size=ytdlp_pool_size
+        )
 
         # Initialize database
         if db_type == "mysql":
@@ -88,11 +142,24 @@ class PlayerManager:
         else:
             self.database = Database("sqlite", db_file=db_path)
 
+        self.metadata_refresher = MetadataRefresher(
+            self.database, self.extractor, interval=metadata_refresh_interval
+        )
+        for path in metadata_packs or []:
+            try:
+                self.database.mount_pack(path)
+            except (OSError, ValueError) as e:
+                LogHandler.error(f"Failed to mount metadata pack {path}: {e}")
+        self.database.stale_after = int(metadata_stale_days * 86400)
+        self.database.on_stale = self.metadata_refresher.enqueue
+
         # Optional features
+        self.replay_handler = None
+        self.rpc_handler = None
         if enable_rpc:
-            attach_sockets(self)
+            self.rpc_handler = attach_sockets(self, rpc_mode)
         if enable_replay:
-            attach_replay(self)
+            self.replay_handler = attach_replay(self)
 
     async def get_player(
         self, interaction: Interaction, bot: BotIntegration
@@ -139,6 +206,40 @@ class PlayerManager:
         """
         return self.players.get(guild_id)
 
+    def process_stats(self) -> Dict[int, dict]:
+        """
+        Retrieves the CPU and memory usage of the FFmpeg process of every playing guild.
+
+        Returns:
+            Dict[int, dict]: The PID, CPU percentage, RSS in bytes and degraded state keyed by guild ID.
+        """
+        return self.ffmpeg.stats()
+
+    def player_stats(self) -> dict:
+        """
+        Retrieves the number of active and idle players and the approximate memory held by each.
+
+        Returns:
+            dict: The active, idle and reaped player counts, and the idle seconds, queue length and approximate bytes of every player keyed by guild ID.
+        """
+        now = time.monotonic()
+        players = {}
+        active = 0
+        for guild_id, player in list(self.players.items()):
+            idle_for = player.idle_for(now)
+            active += idle_for == 0
+            players[guild_id] = {
+                "idle_for": round(idle_for, 1),
+                "queue": len(player.music_queue),
+                "memory": player.memory_usage(),
+            }
+        return {
+            "active": active,
+            "idle": len(players) - active,
+            "reaped": self.reaped,
+            "players": players,
+        }
+
     async def remove_player(self, interaction: Interaction) -> bool:
         """
         Removes the MusicPlayer for the guild associated with the given interaction.
@@ -149,15 +250,12 @@ class PlayerManager:
         Returns:
             bool: True if a player was removed, False otherwise.
         """
-        if interaction.guild.id in self.players:
-            await self.players[interaction.guild.id].cleanup()
-            self.players.pop(interaction.guild.id, None)
-            return True
-        return False
+        return await self.remove_player_by_guild_id(interaction.guild.id)
 
     async def remove_player_by_guild_id(self, guild_id: int) -> bool:
         """
-        Removes the MusicPlayer for the guild associated with the given guild ID.
+        Removes the MusicPlayer for the guild associated with the given guild ID and fires
+        `player_removed` so listeners can release anything tied to the player.
 
         Args:
             guild_id (int): The ID of the guild.
@@ -165,11 +263,102 @@ class PlayerManager:
         Returns:
             bool: True if a player was removed, False otherwise.
         """
-        if guild_id in self.players:
-            await self.players[guild_id].cleanup()
-            self.players.pop(guild_id, None)
-            return True
-        return False
+        player = self.players.pop(guild_id, None)
+        if player is None:
+            return False
+        await player.cleanup()
+        await EventManager.fire("player_removed", self, guild_id)
+        return True
+
+    def start_maintenance(self) -> None:
+        """
+        Starts the background database maintenance task if it is not running yet. Must be called from the bot's event loop.
+        """
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    def start_reaper(self) -> None:
+        """
+        Starts the background task removing idle players if a timeout is set and it is not running yet. Must be called from the bot's event loop.
+        """
+        if self.player_idle_timeout <= 0:
+            return
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper_loop())
+
+    async def reap_idle_players(self) -> list:
+        """
+        Removes every player that has been idle, paused or disconnected for longer than `player_idle_timeout`.
+
+        Returns:
+            list: The IDs of the guilds whose player was removed.
+        """
+        now = time.monotonic()
+        idle = [
+            guild_id
+            for guild_id, player in list(self.players.items())
+            if player.idle_for(now) > self.player_idle_timeout
+        ]
+        for guild_id in idle:
+            try:
+                await self.remove_player_by_guild_id(guild_id)
+            except Exception as e:
+                LogHandler.error(f"Failed to clean up idle player of {guild_id}: {e}")
+            self.reaped += 1
+        if idle:
+            LogHandler.info(f"Removed {len(idle)} idle player(s)")
+        return idle
+
+    async def _reaper_loop(self) -> None:
+        interval = min(max(self.player_idle_timeout / 4, 1), 60)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reap_idle_players()
+            except Exception as e:
+                LogHandler.error(f"Idle player cleanup failed: {e}")
+
+    def start_rpc(self) -> None:
+        """
+        Starts the RPC WebSocket server if RPC is enabled and it is not running yet. Must be called from the bot's event loop.
+        """
+        if self.rpc_handler is not None:
+            self.rpc_handler.start()
+
+    async def _maintenance_loop(self) -> None:
+        try:
+            await self.database.migrate_replay_history()
+        except Exception as e:
+            LogHandler.error(f"Replay history migration stopped: {e}")
+        while True:
+            if self.replay_retention_days > 0:
+                try:
+                    await self.database.apply_replay_retention(
+                        self.replay_retention_days
+                    )
+                except Exception as e:
+                    LogHandler.error(f"Replay retention failed: {e}")
+            try:
+                self.database.run_cleanup(self.metadata_expire_days)
+            except Exception as e:
+                LogHandler.error(f"Metadata cache cleanup failed: {e}")
+            await asyncio.sleep(86400)
+
+    async def shutdown(self) -> None:
+        """
+        Cleans up every player and flushes buffered replay history. Should be called before the bot stops.
+        """
+        for guild_id in list(self.players):
+            await self.remove_player_by_guild_id(guild_id)
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+        self.metadata_refresher.close()
+        if self.rpc_handler is not None:
+            self.rpc_handler.stop()
+        if self.replay_handler is not None:
+            await self.replay_handler.close()
 
     async def fire_voice_state_update(self, member: Member, before, after) -> None:
         """
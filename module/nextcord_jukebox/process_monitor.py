@@ -0,0 +1,187 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+import asyncio
+from typing import Dict, Optional
+
+import psutil
+
+from . import LogHandler
+
+
+class FFmpegMonitor:
+    """
+    Tracks the FFmpeg process of every playing guild and admits new playback.
+
+    When the node is saturated, either because `max_processes` FFmpeg processes are
+    running or because system CPU usage is above `cpu_threshold`, new playback is
+    degraded (expensive filters such as loudnorm are dropped) or queued until a
+    process exits, depending on `policy`.
+
+    Attributes:
+        max_processes (int): The maximum number of concurrent FFmpeg processes, 0 for no limit.
+        cpu_threshold (float): The system CPU percentage considered saturated, 0 to ignore CPU.
+        policy (str): "degrade" or "queue".
+        queue_timeout (float): Seconds a queued playback waits before starting degraded anyway.
+        poll_interval (float): Seconds between saturation checks of a queued playback, so a drop in CPU usage is noticed without a process exiting.
+        processes (Dict[int, psutil.Process]): The tracked FFmpeg processes keyed by guild ID.
+    """
+
+    poll_interval: float = 1.0
+
+    def __init__(
+        self,
+        max_processes: int = 0,
+        cpu_threshold: float = 0,
+        policy: str = "degrade",
+        queue_timeout: float = 30,
+    ) -> None:
+        """
+        Initializes the FFmpegMonitor.
+
+        Args:
+            max_processes (int, optional): The maximum number of concurrent FFmpeg processes, 0 for no limit. Defaults to 0.
+            cpu_threshold (float, optional): The system CPU percentage considered saturated, 0 to ignore CPU. Defaults to 0.
+            policy (str, optional): "degrade" or "queue". Defaults to "degrade".
+            queue_timeout (float, optional): Seconds a queued playback waits before starting degraded anyway. Defaults to 30.
+        """
+        if policy not in ("degrade", "queue"):
+            raise ValueError("FFmpeg saturation policy must be 'degrade' or 'queue'.")
+        self.max_processes = max_processes
+        self.cpu_threshold = cpu_threshold
+        self.policy = policy
+        self.queue_timeout = queue_timeout
+        self.processes: Dict[int, psutil.Process] = {}
+        self.degraded: Dict[int, bool] = {}
+        self._admitted: set = set()
+        self._condition: Optional[asyncio.Condition] = None
+        psutil.cpu_percent(interval=None)
+
+    @property
+    def saturated(self) -> bool:
+        """bool: Whether the node cannot take another FFmpeg process at full quality."""
+        if self.max_processes and len(self._admitted) >= self.max_processes:
+            return True
+        return bool(
+            self.cpu_threshold
+            and psutil.cpu_percent(interval=None) >= self.cpu_threshold
+        )
+
+    async def admit(self, guild_id: int) -> bool:
+        """
+        Admits a new playback for a guild, waiting if the policy is "queue".
+
+        Args:
+            guild_id (int): The ID of the guild about to start FFmpeg.
+
+        Returns:
+            bool: True if the playback should run degraded, False otherwise.
+        """
+        self.release(guild_id)
+        degraded = False
+        if self.saturated:
+            if self.policy == "queue":
+                self._condition = self._condition or asyncio.Condition()
+                LogHandler.warning(f"FFmpeg saturated, queueing playback for {guild_id}")
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.queue_timeout
+                async with self._condition:
+                    while self.saturated:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            degraded = True
+                            break
+                        try:
+                            await asyncio.wait_for(
+                                self._condition.wait(),
+                                min(self.poll_interval, remaining),
+                            )
+                        except asyncio.TimeoutError:
+                            pass
+            else:
+                degraded = True
+
+        if degraded:
+            LogHandler.warning(f"FFmpeg saturated, degrading playback for {guild_id}")
+        self._admitted.add(guild_id)
+        self.degraded[guild_id] = degraded
+        return degraded
+
+    def track(self, guild_id: int, audio_source) -> None:
+        """
+        Starts tracking the FFmpeg process behind an audio source.
+
+        Args:
+            guild_id (int): The ID of the guild playing the source.
+            audio_source (nextcord.FFmpegAudio): The audio source that spawned FFmpeg.
+        """
+        process = getattr(audio_source, "_process", None)
+        if process is None:
+            return
+        try:
+            tracked = psutil.Process(process.pid)
+            tracked.cpu_percent(interval=None)
+            self.processes[guild_id] = tracked
+        except psutil.Error as e:
+            LogHandler.warning(f"Failed to track FFmpeg process for {guild_id}: {e}")
+
+    def release(self, guild_id: int) -> None:
+        """
+        Stops tracking a guild's FFmpeg process and frees its admission slot.
+
+        Args:
+            guild_id (int): The ID of the guild.
+        """
+        self.processes.pop(guild_id, None)
+        self.degraded.pop(guild_id, None)
+        if guild_id in self._admitted:
+            self._admitted.discard(guild_id)
+            if self._condition is not None:
+                asyncio.ensure_future(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._condition:
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[int, dict]:
+        """
+        Returns the CPU and memory usage of every tracked FFmpeg process.
+
+        CPU usage is measured since the previous call and can exceed 100 on multi-core hosts.
+
+        Returns:
+            Dict[int, dict]: The usage keyed by guild ID.
+        """
+        result = {}
+        for guild_id, process in list(self.processes.items()):
+            try:
+                with process.oneshot():
+                    result[guild_id] = {
+                        "pid": process.pid,
+                        "cpu_percent": process.cpu_percent(interval=None),
+                        "rss": process.memory_info().rss,
+                        "degraded": self.degraded.get(guild_id, False),
+                    }
+            except psutil.Error:
+                self.processes.pop(guild_id, None)
+        return result
@@ -21,7 +21,9 @@
 #  ------------------------------------------------------------
 #
 
-from datetime import datetime
+import asyncio
+import atexit
+import time
 
 from . import LogHandler
 from .event_manager import EventManager
@@ -33,20 +35,86 @@ class ReplayHandler(EventManager):
     """
     ReplayHandler class to handle replay events and log them to a database.
 
+    Replay events are buffered in memory and written with a single batch per track,
+    or by a periodic flush for events recorded between tracks. Anything still
+    buffered is flushed on shutdown.
+
     Attributes:
         manager (EventManager): The event manager instance.
         database: The database instance from the manager.
+        flush_interval (float): Seconds between periodic flushes of buffered events.
+        max_buffer_size (int): Events kept buffered while the database is failing, the oldest are dropped first.
+        dropped (int): Number of events dropped because the buffer was full.
     """
 
-    def __init__(self, manager):
+    def __init__(
+        self, manager, flush_interval: float = 30, max_buffer_size: int = 10000
+    ):
         """
         Initializes the ReplayHandler with the given manager.
 
         Args:
             manager (EventManager): The event manager instance.
+            flush_interval (float, optional): Seconds between periodic flushes of buffered events. Defaults to 30.
+            max_buffer_size (int, optional): Events kept buffered while the database is failing. Defaults to 10000.
         """
         self.manager = manager
         self.database = manager.database
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.dropped = 0
+        self._buffer = []
+        self._flush_task = None
+        atexit.register(self._flush_at_exit)
+
+    def _ensure_flush_task(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._periodic_flush())
+
+    async def _periodic_flush(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def record(self, user_id: str, video_id: str):
+        """
+        Buffers a replay event.
+
+        Args:
+            user_id (str): The user ID.
+            video_id (str): The ID of the video played.
+        """
+        self._buffer.append((user_id, int(time.time()), video_id))
+        self._ensure_flush_task()
+
+    async def flush(self):
+        """Writes every buffered replay event to the database in one batch."""
+        if not self._buffer:
+            return
+        entries, self._buffer = self._buffer, []
+        try:
+            await self.database.add_replay_entries(entries)
+        except Exception as e:
+            LogHandler.error(f"Failed to flush {len(entries)} replay entries: {e}")
+            self._buffer = entries + self._buffer
+            overflow = len(self._buffer) - self.max_buffer_size
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self.dropped += overflow
+                LogHandler.warning(
+                    f"Dropped {overflow} oldest replay entries, buffer is full"
+                )
+
+    async def close(self):
+        """Stops the periodic flush and writes any buffered replay events."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    def _flush_at_exit(self):
+        if self._buffer:
+            asyncio.run(self.flush())
 
     @EventManager.listener
     async def track_start(self, player, interaction, before, after):
@@ -59,15 +127,16 @@ class ReplayHandler(EventManager):
             before: The state before the track started.
             after: The state after the track started.
         """
+        now_playing = await player.now_playing()
+        video_id = await get_video_id(now_playing.url)
+        recorded = 0
         for member in player.members:
             if member.id == player.bot.user.id or member.id is None:
                 continue
-            now_playing = await player.now_playing()
-            video_id = await get_video_id(now_playing.url)
-            LogHandler.info(f"Adding replay entry for {member.global_name}")
-            await self.database.add_replay_entry(
-                str(member.id), (datetime.now().isoformat()), video_id
-            )
+            self.record(str(member.id), video_id)
+            recorded += 1
+        LogHandler.info(f"Adding replay entries for {recorded} plays")
+        await self.flush()
 
     @EventManager.listener
     async def member_joined_voice(self, player, member):
@@ -85,10 +154,8 @@ class ReplayHandler(EventManager):
         except NothingPlaying:
             return
         video_id = await get_video_id(now_playing.url)
-        LogHandler.info(f"Adding replay entry for {member.global_name}")
-        await self.database.add_replay_entry(
-            str(member.id), (datetime.now().isoformat()), video_id
-        )
+        LogHandler.info(f"Buffering replay entry for {member.global_name}")
+        self.record(str(member.id), video_id)
 
 
 def attach(manager):
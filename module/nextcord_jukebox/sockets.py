@@ -25,33 +25,109 @@ import asyncio
 import json
 import os
 import threading
-from typing import Dict, Optional
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
 
 import websockets
 from websockets.server import WebSocketServerProtocol
 
-from . import LogHandler, __socket_standard_version__
+from . import LogHandler, __socket_standard_v2_version__, __socket_standard_version__
 from .event_manager import EventManager
 from .exceptions import NothingPlaying
+from .metrics import LatencyStats
+
+
+TRACKED_FIELDS = ("state", "title", "url", "channel", "thumbnail", "duration", "paused")
+POSITION_TOLERANCE = 1.0
+
+
+class _Session:
+    """
+    Protocol v2 state of one client secret, kept across reconnects.
+
+    Attributes:
+        state (Optional[dict]): The last state sent to the client.
+        seq (Optional[int]): The sequence number of the last message sent to the client.
+        buffer (deque): The last messages sent to the client as (seq, message) pairs, replayed on resume.
+    """
+
+    __slots__ = ("state", "seq", "buffer")
+
+    def __init__(self, buffer_size: int):
+        self.state: Optional[dict] = None
+        self.seq: Optional[int] = None
+        self.buffer = deque(maxlen=buffer_size)
 
 
 class RPCHandler(EventManager):
     """
     Handles WebSocket connections and dispatches events to clients.
 
+    The server runs either as a task on the bot's event loop ("loop" mode) or on its own event
+    loop in a separate thread ("thread" mode). Listeners always run on the bot's loop and only
+    read the in-memory secret index there. In thread mode they hand the serialized message to
+    the server's loop, so connections are only touched by the loop that owns them and the
+    server thread never uses the database connection.
+
+    Clients connect to `/<secret>` for protocol v1, which receives a full `playing` or `idle`
+    payload on every track change. Clients connecting to `/<secret>?v=2` get protocol v2: a
+    `snapshot` with the playback position and timer state, then `delta` messages holding
+    only the fields that changed, including pauses and resumes. Every v2 message carries
+    the sequence number `seq` and the `prev` sequence number sent to the same client. A
+    client reconnecting with `?v=2&since=<seq>` is replayed the messages it missed from a
+    small per-client buffer, or sent a fresh snapshot if they are no longer buffered. The
+    position is only resent when something else changes, so clients advance it locally from
+    `position` and `timestamp` while `paused` is false.
+
+    Every event is serialized once and sent to all its recipients concurrently. A send that
+    does not finish within `send_timeout`, or a client whose unsent data exceeds
+    `max_buffer_size`, gets the client disconnected so one slow client cannot stall the rest.
+
     Attributes:
         clients (Dict[str, WebSocketServerProtocol]): A dictionary of connected clients.
         port (int): The port on which the WebSocket server listens.
         address (str): The address on which the WebSocket server listens.
         database: The database instance from the manager.
+        mode (str): "loop" to serve on the bot's event loop, "thread" to serve on a separate thread.
+        server_loop (Optional[asyncio.AbstractEventLoop]): The event loop the server runs on, once started.
+        send_timeout (float): Seconds a single send may take before the client is dropped.
+        max_buffer_size (int): Bytes of unsent data a client may have queued before it is dropped.
+        send_stats (LatencyStats): Latency and failures of individual sends.
+        dropped (int): Number of clients disconnected for being too slow.
+        sessions (Dict[str, _Session]): Protocol v2 state per client secret.
+        client_versions (Dict[str, int]): The protocol version of each connected client.
+        resume_buffer_size (int): Messages kept per client for resuming.
     """
 
-    def __init__(self, manager) -> None:
+    resume_buffer_size = 32
+    send_timeout = 2.0
+    max_buffer_size = 256 * 1024
+    rate_window = 60.0
+
+    def __init__(self, manager, mode: str = "loop") -> None:
         """
         Initializes the RPCHandler with the WebSocket server settings from environment variables.
+
+        Args:
+            manager: The manager instance that provides the database.
+            mode (str, optional): "loop" to serve on the bot's event loop, "thread" to serve on a separate thread. Defaults to "loop".
         """
+        if mode not in ("loop", "thread"):
+            raise ValueError("RPC mode must be 'loop' or 'thread'")
         self.clients: Dict[str, WebSocketServerProtocol] = {}
         self.database = manager.database
+        self.mode = mode
+        self.server_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server_task: Optional[asyncio.Task] = None
+        self._server_thread: Optional[threading.Thread] = None
+        self.send_stats = LatencyStats()
+        self.dropped = 0
+        self.sessions: Dict[str, _Session] = {}
+        self.client_versions: Dict[str, int] = {}
+        self._seq = 0
+        self._sent_at = deque()
         ws_port = os.getenv("RPC_WEBSOCKET_PORT")
         ws_address = os.getenv("RPC_WEBSOCKET_IP")
 
@@ -65,6 +141,114 @@ class RPCHandler(EventManager):
 
         self.address: str = ws_address if ws_address is not None else "localhost"
 
+    @staticmethod
+    def _playing(song) -> dict:
+        return {
+            "version": __socket_standard_version__,
+            "state": "playing",
+            "data": {
+                "title": song.title,
+                "url": song.url,
+                "channel": song.channel,
+                "thumbnail": song.thumbnail,
+            },
+        }
+
+    @staticmethod
+    def _idle() -> dict:
+        return {"version": __socket_standard_version__, "state": "idle", "data": {}}
+
+    @staticmethod
+    def _state(song=None) -> dict:
+        """
+        Builds the protocol v2 state of a song, or the idle state.
+
+        Args:
+            song (Optional[Song]): The playing song, or None when idle.
+
+        Returns:
+            dict: The state, with the position in seconds at `timestamp` (Unix time).
+        """
+        if song is None:
+            return {
+                "state": "idle",
+                "title": None,
+                "url": None,
+                "channel": None,
+                "thumbnail": None,
+                "duration": None,
+                "paused": False,
+                "position": 0.0,
+                "timestamp": time.time(),
+            }
+        return {
+            "state": "playing",
+            "title": song.title,
+            "url": song.url,
+            "channel": song.channel,
+            "thumbnail": song.thumbnail,
+            "duration": song.duration,
+            "paused": song.timer.paused,
+            "position": song.timer.elapsed,
+            "timestamp": time.time(),
+        }
+
+    @staticmethod
+    def _diff(previous: Optional[dict], state: dict) -> Optional[dict]:
+        """
+        Computes the protocol v2 delta between two states.
+
+        A position more than `POSITION_TOLERANCE` seconds away from where the client
+        extrapolates it, such as the same track restarting, counts as a change.
+
+        Args:
+            previous (Optional[dict]): The state last sent, or None if nothing was sent.
+            state (dict): The new state.
+
+        Returns:
+            Optional[dict]: The changed fields with the current position, the whole state if nothing was sent, or None if nothing changed.
+        """
+        if previous is None:
+            return dict(state)
+        changes = {
+            field: state[field]
+            for field in TRACKED_FIELDS
+            if previous.get(field) != state[field]
+        }
+        if not changes:
+            if state["state"] != "playing":
+                return None
+            expected = previous["position"]
+            if not previous["paused"]:
+                expected += state["timestamp"] - previous["timestamp"]
+            if abs(expected - state["position"]) <= POSITION_TOLERANCE:
+                return None
+        changes["position"] = state["position"]
+        changes["timestamp"] = state["timestamp"]
+        return changes
+
+    def _member_secrets(self, player, members: Iterable) -> list:
+        """
+        Looks up the secrets of the listening members that are registered.
+
+        Args:
+            player: The player instance.
+            members (Iterable): The members to look up.
+
+        Returns:
+            list: The secrets of the registered members.
+        """
+        members = [
+            member
+            for member in members
+            if member is not None and member != "None" and member != player.bot
+        ]
+        secrets = self.database.get_user_secrets(member.id for member in members)
+        for member in members:
+            if member.id not in secrets:
+                LogHandler.info(f"Client {member.global_name} not registered")
+        return list(secrets.values())
+
     @EventManager.listener
     async def track_start(self, player, interaction, before, after) -> None:
         """
@@ -76,26 +260,39 @@ class RPCHandler(EventManager):
             before: The state before the event.
             after: The state after the event.
         """
-        for member in player.members:
-            if member == player.bot or member is None:
-                continue
-            user_secret: Optional[str] = await self.database.get_user_secret(member.id)
-            if user_secret is not None:
-                await self.dispatch(
-                    user_secret,
-                    {
-                        "version": __socket_standard_version__,
-                        "state": "playing",
-                        "data": {
-                            "title": after.title,
-                            "url": after.url,
-                            "channel": after.channel,
-                            "thumbnail": after.thumbnail,
-                        },
-                    },
-                )
-            else:
-                LogHandler.info(f"Client {member.global_name} not registered")
+        await self.publish(
+            self._member_secrets(player, player.members),
+            self._state(after),
+            self._playing(after),
+        )
+
+    @EventManager.listener
+    async def track_paused(self, player, interaction, song) -> None:
+        """
+        Event listener for when a track is paused. Dispatches the timer state to protocol v2 clients.
+
+        Args:
+            player: The player instance.
+            interaction: The interaction instance.
+            song: The paused song.
+        """
+        await self.publish(
+            self._member_secrets(player, player.members), self._state(song)
+        )
+
+    @EventManager.listener
+    async def track_resumed(self, player, interaction, song) -> None:
+        """
+        Event listener for when a track is resumed. Dispatches the timer state to protocol v2 clients.
+
+        Args:
+            player: The player instance.
+            interaction: The interaction instance.
+            song: The resumed song.
+        """
+        await self.publish(
+            self._member_secrets(player, player.members), self._state(song)
+        )
 
     @EventManager.listener
     async def queue_ended(self, player, interaction) -> None:
@@ -106,24 +303,9 @@ class RPCHandler(EventManager):
             player: The player instance.
             interaction: The interaction instance.
         """
-        for member in player.members:
-            if member == player.bot or member is None or member == "None":
-                continue
-            user_secret: Optional[str] = await self.database.get_user_secret(member.id)
-            if user_secret is not None:
-                await self.dispatch(
-                    user_secret,
-                    {
-                        "version": __socket_standard_version__,
-                        "state": "idle",
-                        "data": {},
-                    },
-                )
-                LogHandler.info(
-                    f"Dispatched queue_ended to {user_secret}[{member.global_name}]"
-                )
-            else:
-                LogHandler.info(f"Client {member.global_name} not registered")
+        secrets = self._member_secrets(player, player.members)
+        await self.publish(secrets, self._state(), self._idle())
+        LogHandler.info(f"Dispatched queue_ended to {len(secrets)} clients")
 
     @EventManager.listener
     async def member_joined_voice(self, player, member) -> None:
@@ -134,29 +316,14 @@ class RPCHandler(EventManager):
             player: The player instance.
             member: The member who joined the voice channel.
         """
-        if member == player.bot or member is None:
+        secrets = self._member_secrets(player, [member])
+        if not secrets:
             return
-        user_secret: Optional[str] = await self.database.get_user_secret(member.id)
         try:
             now_playing = await player.now_playing()
         except NothingPlaying:
             return
-        if user_secret is not None:
-            await self.dispatch(
-                user_secret,
-                {
-                    "version": __socket_standard_version__,
-                    "state": "playing",
-                    "data": {
-                        "title": now_playing.title,
-                        "url": now_playing.url,
-                        "channel": now_playing.channel,
-                        "thumbnail": now_playing.thumbnail,
-                    },
-                },
-            )
-        else:
-            LogHandler.info(f"Client {member.global_name} not registered")
+        await self.publish(secrets, self._state(now_playing), self._playing(now_playing))
 
     @EventManager.listener
     async def member_left_voice(self, player, member) -> None:
@@ -167,21 +334,10 @@ class RPCHandler(EventManager):
             player: The player instance.
             member: The member who left the voice channel.
         """
-        if member == player.bot or member is None or member == "None":
-            return
-        user_secret: Optional[str] = await self.database.get_user_secret(member.id)
-        if user_secret is not None:
-            await self.dispatch(
-                user_secret,
-                {
-                    "version": __socket_standard_version__,
-                    "state": "idle",
-                    "data": {},
-                },
-            )
-            LogHandler.info(f"Dispatched idle to {user_secret}[{member.global_name}]")
-        else:
-            LogHandler.info(f"Client {member.global_name} not registered")
+        secrets = self._member_secrets(player, [member])
+        await self.publish(secrets, self._state(), self._idle())
+        for secret in secrets:
+            LogHandler.info(f"Dispatched idle to {secret}[{member.global_name}]")
 
     async def handler(self, websocket: WebSocketServerProtocol, path: str) -> None:
         """
@@ -191,17 +347,63 @@ class RPCHandler(EventManager):
             websocket (WebSocketServerProtocol): The WebSocket connection instance.
             path (str): The path of the WebSocket connection.
         """
-        secret: str = path.strip("/")
+        url = urlsplit(path)
+        query = parse_qs(url.query)
+        secret: str = url.path.strip("/")
+        try:
+            version = int(query.get("v", ["1"])[0])
+            since = int(query["since"][0]) if "since" in query else None
+        except ValueError:
+            version, since = 1, None
         self.clients[secret] = websocket
-        LogHandler.info(f"Client {secret} connected")
+        self.client_versions[secret] = version
+        LogHandler.info(f"Client {secret} connected with protocol v{version}")
 
         try:
+            if version >= 2:
+                for message in self._resume(secret, since):
+                    if not await self._send(secret, websocket, message):
+                        return
             async for message in websocket:
                 LogHandler.info(f"Received message from {secret}: {message}")
         except websockets.exceptions.ConnectionClosed as e:
             LogHandler.info(f"Client {secret} disconnected: {e}")
         finally:
-            del self.clients[secret]
+            if self.clients.get(secret) is websocket:
+                del self.clients[secret]
+                del self.client_versions[secret]
+
+    def _resume(self, secret: str, since: Optional[int]) -> List[str]:
+        """
+        Picks the protocol v2 messages a connecting client needs to catch up.
+
+        Args:
+            secret (str): The client secret.
+            since (Optional[int]): The last sequence number the client received, if it is resuming.
+
+        Returns:
+            List[str]: The buffered messages after `since`, a snapshot if they are not all buffered, or nothing if the client is up to date.
+        """
+        session = self.sessions.get(secret)
+        if session is None or session.state is None:
+            return []
+        if since is not None:
+            if since == session.seq:
+                return []
+            seqs = [seq for seq, _ in session.buffer]
+            if since in seqs:
+                return [message for _, message in list(session.buffer)[seqs.index(since) + 1 :]]
+        return [
+            json.dumps(
+                {
+                    "version": __socket_standard_v2_version__,
+                    "type": "snapshot",
+                    "seq": session.seq,
+                    "prev": None,
+                    "data": session.state,
+                }
+            )
+        ]
 
     async def dispatch(self, secret: str, data: dict) -> None:
         """
@@ -211,47 +413,293 @@ class RPCHandler(EventManager):
             secret (str): The client secret.
             data (dict): The data to be sent.
         """
-        data = json.dumps(data)
-        if secret in self.clients:
-            await self.clients[secret].send(data)
-            LogHandler.info(f"Dispatched message to client {secret}: {data}")
-        else:
-            LogHandler.info(f"Client {secret} not connected")
+        await self.broadcast([secret], data)
+
+    async def broadcast(self, secrets: Iterable[str], data: dict) -> int:
+        """
+        Serializes a message once and sends it to several clients concurrently, whatever their protocol version.
+
+        Args:
+            secrets (Iterable[str]): The client secrets.
+            data (dict): The data to be sent.
+
+        Returns:
+            int: The number of clients the message was delivered to.
+        """
+        secrets = list(secrets)
+        if not secrets:
+            return 0
+        message = json.dumps(data)
+        return await self._on_server_loop(
+            self._fan_out([(secret, message) for secret in secrets])
+        )
+
+    async def publish(
+        self, secrets: Iterable[str], state: dict, legacy: Optional[dict] = None
+    ) -> int:
+        """
+        Publishes a new playback state to several clients.
+
+        Protocol v2 clients are sent the delta from the state they last received, and protocol
+        v1 clients are sent `legacy`, if given.
+
+        Args:
+            secrets (Iterable[str]): The client secrets.
+            state (dict): The new state, see `_state`.
+            legacy (Optional[dict]): The protocol v1 payload, or None if v1 clients are not notified.
+
+        Returns:
+            int: The number of clients a message was delivered to.
+        """
+        secrets = list(secrets)
+        if not secrets:
+            return 0
+        legacy_message = json.dumps(legacy) if legacy is not None else None
+        return await self._on_server_loop(
+            self._publish(secrets, state, legacy_message)
+        )
+
+    async def _on_server_loop(self, coroutine) -> int:
+        """
+        Runs a coroutine on the server's loop, handing it over when the server runs on another thread.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            int: The coroutine's result, or 0 if the server has stopped.
+        """
+        loop = self.server_loop
+        if loop is None or loop is asyncio.get_running_loop():
+            return await coroutine
+        if loop.is_closed():
+            coroutine.close()
+            return 0
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coroutine, loop)
+        )
+
+    async def _publish(
+        self, secrets: list, state: dict, legacy_message: Optional[str]
+    ) -> int:
+        """
+        Records a new state in the clients' sessions and sends it. Runs on the server's loop.
+
+        Clients with the same previous message and the same delta share one serialized message.
+
+        Args:
+            secrets (list): The client secrets.
+            state (dict): The new state.
+            legacy_message (Optional[str]): The serialized protocol v1 payload.
+
+        Returns:
+            int: The number of clients a message was delivered to.
+        """
+        self._seq += 1
+        seq = self._seq
+        messages = {}
+        targets: List[Tuple[str, str]] = []
+        for secret in secrets:
+            session = self.sessions.get(secret)
+            if session is None:
+                session = self.sessions[secret] = _Session(self.resume_buffer_size)
+            message = None
+            delta = self._diff(session.state, state)
+            if delta is not None:
+                key = (session.seq, session.state is None, tuple(sorted(delta.items())))
+                message = messages.get(key)
+                if message is None:
+                    message = messages[key] = json.dumps(
+                        {
+                            "version": __socket_standard_v2_version__,
+                            "type": "snapshot" if session.state is None else "delta",
+                            "seq": seq,
+                            "prev": session.seq,
+                            "data": delta,
+                        }
+                    )
+                session.state = state
+                session.seq = seq
+                session.buffer.append((seq, message))
+
+            version = self.client_versions.get(secret)
+            if version is None:
+                if state["state"] == "idle":
+                    session.buffer.clear()
+            elif version >= 2:
+                if message is not None:
+                    targets.append((secret, message))
+            elif legacy_message is not None:
+                targets.append((secret, legacy_message))
+        return await self._fan_out(targets)
+
+    async def _fan_out(self, targets: List[Tuple[str, str]]) -> int:
+        """
+        Sends serialized messages to the connected clients among the targets concurrently. Runs on the server's loop.
+
+        Args:
+            targets (List[Tuple[str, str]]): (secret, message) pairs.
+
+        Returns:
+            int: The number of clients a message was delivered to.
+        """
+        targets = [
+            (secret, self.clients[secret], message)
+            for secret, message in targets
+            if secret in self.clients
+        ]
+        if not targets:
+            return 0
+        results = await asyncio.gather(
+            *(
+                self._send(secret, websocket, message)
+                for secret, websocket, message in targets
+            )
+        )
+        return sum(results)
+
+    async def _send(
+        self, secret: str, websocket: WebSocketServerProtocol, message: str
+    ) -> bool:
+        """
+        Sends a serialized message to one client, dropping the client if it cannot keep up.
+
+        Args:
+            secret (str): The client secret.
+            websocket (WebSocketServerProtocol): The client's connection.
+            message (str): The serialized message.
+
+        Returns:
+            bool: Whether the message was sent.
+        """
+        transport = websocket.transport
+        if (
+            transport is not None
+            and transport.get_write_buffer_size() > self.max_buffer_size
+        ):
+            self._drop(secret, websocket, "send buffer full")
+            return False
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(websocket.send(message), self.send_timeout)
+        except asyncio.TimeoutError as e:
+            self.send_stats.record(time.perf_counter() - started, e)
+            self._drop(secret, websocket, f"send timed out after {self.send_timeout}s")
+            return False
+        except websockets.exceptions.ConnectionClosed as e:
+            self.send_stats.record(time.perf_counter() - started, e)
+            if self.clients.get(secret) is websocket:
+                del self.clients[secret]
+                del self.client_versions[secret]
+            return False
+
+        self.send_stats.record(time.perf_counter() - started)
+        self._sent_at.append(time.monotonic())
+        self._trim_sent()
+        return True
+
+    def _trim_sent(self):
+        """Forgets send timestamps older than the metrics window."""
+        cutoff = time.monotonic() - self.rate_window
+        while self._sent_at and self._sent_at[0] < cutoff:
+            self._sent_at.popleft()
+
+    def _drop(self, secret: str, websocket: WebSocketServerProtocol, reason: str):
+        """
+        Disconnects a client that cannot keep up.
+
+        Args:
+            secret (str): The client secret.
+            websocket (WebSocketServerProtocol): The client's connection.
+            reason (str): Why the client is dropped.
+        """
+        if self.clients.get(secret) is websocket:
+            del self.clients[secret]
+            del self.client_versions[secret]
+        self.dropped += 1
+        if websocket.transport is not None:
+            websocket.transport.abort()
+        LogHandler.warning(f"Dropped client {secret}: {reason}")
+
+    def client_metrics(self) -> dict:
+        """
+        Returns connection and throughput metrics of the WebSocket server.
+
+        Returns:
+            dict: Connected clients, messages sent per second over the last minute, clients dropped and send latency statistics.
+        """
+        self._trim_sent()
+        return {
+            "clients": len(self.clients),
+            "messages_per_second": len(self._sent_at) / self.rate_window,
+            "dropped": self.dropped,
+            "send": self.send_stats.to_dict(),
+        }
 
     async def start_server(self) -> None:
-        """Starts the WebSocket server."""
+        """Starts the WebSocket server and serves until cancelled."""
+        self.server_loop = asyncio.get_running_loop()
         async with websockets.serve(self.handler, self.address, self.port):
             LogHandler.info(
                 f"WebSocket server started on ws://{self.address}:{self.port}"
             )
             await asyncio.Future()
 
+    def start(self) -> None:
+        """
+        Starts the WebSocket server if it is not running yet. In loop mode this must be called from the bot's event loop.
+        """
+        if self.mode == "thread":
+            if self._server_thread is None or not self._server_thread.is_alive():
+                self._server_thread = threading.Thread(
+                    target=start_websocket_server, args=(self,), daemon=True
+                )
+                self._server_thread.start()
+        elif self._server_task is None or self._server_task.done():
+            self._server_task = asyncio.create_task(self.start_server())
+
+    def stop(self) -> None:
+        """Stops the WebSocket server."""
+        task, loop = self._server_task, self.server_loop
+        if task is None:
+            return
+        self._server_task = None
+        if self.mode == "thread" and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(task.cancel)
+        else:
+            task.cancel()
+
 
 def start_websocket_server(handler: RPCHandler) -> None:
     """
-    Starts the WebSocket server using the provided handler.
+    Runs the WebSocket server on a new event loop in the calling thread until it is stopped.
 
     Args:
         handler (RPCHandler): The handler instance to use for the WebSocket server.
     """
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
-    loop.run_until_complete(handler.start_server())
-    loop.run_forever()
+    handler._server_task = loop.create_task(handler.start_server())
+    try:
+        loop.run_until_complete(handler._server_task)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        loop.close()
 
 
-def attach(manager) -> RPCHandler:
+def attach(manager, mode: str = "loop") -> RPCHandler:
     """
-    Attaches the RPCHandler to the EventManager and starts the WebSocket server in a separate thread.
+    Attaches the RPCHandler to the EventManager. The server is started by `RPCHandler.start`.
 
     Args:
         manager: The manager instance that provides the database and other services.
+        mode (str, optional): "loop" to serve on the bot's event loop, "thread" to serve on a separate thread. Defaults to "loop".
 
     Returns:
         RPCHandler: The attached handler instance.
     """
-    handler = RPCHandler(manager)
+    handler = RPCHandler(manager, mode)
     EventManager.attach(handler)
-    websocket_thread = threading.Thread(target=start_websocket_server, args=(handler,))
-    websocket_thread.start()
     return handler
@@ -0,0 +1,207 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+from collections import Counter
+from typing import Callable, Iterable
+
+
+class SongQueue(list):
+    """
+    The list of songs of a player, with a Fenwick tree over song durations.
+
+    Appending and popping from the front, which is how songs are consumed and looped,
+    update the tree in O(log n). Any other mutation rebuilds it in O(n). Every mutation
+    increments `version`, so readers can tell whether cached views of the queue are stale,
+    and listeners are told which songs were added and removed so derived indexes can be
+    kept in sync incrementally.
+
+    Attributes:
+        version (int): A counter incremented on every mutation.
+    """
+
+    def __init__(self, songs: Iterable = ()) -> None:
+        super().__init__(songs)
+        self.version = 0
+        self._listeners = []
+        self._rebuild()
+
+    def add_listener(self, callback: Callable) -> None:
+        """
+        Registers a callback called as `callback(added, removed)` with the lists of songs added to and removed from the queue.
+
+        Args:
+            callback (Callable): The callback.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable) -> None:
+        """
+        Unregisters a callback added with `add_listener`.
+
+        Args:
+            callback (Callable): The callback.
+        """
+        self._listeners.remove(callback)
+
+    def _notify(self, added: list, removed: list) -> None:
+        if added or removed:
+            for callback in self._listeners:
+                callback(added, removed)
+
+    def _notify_diff(self, before: list) -> None:
+        if not self._listeners:
+            return
+        songs = {id(song): song for song in before}
+        songs.update((id(song), song) for song in self)
+        counts = Counter(map(id, before))
+        counts.subtract(map(id, self))
+        added, removed = [], []
+        for key, count in counts.items():
+            (removed if count > 0 else added).extend([songs[key]] * abs(count))
+        self._notify(added, removed)
+
+    @staticmethod
+    def _duration(song) -> int:
+        return max(int(getattr(song, "duration", 0) or 0), 0)
+
+    def _rebuild(self) -> None:
+        self._head = 0
+        self._tree = [0] * (max(len(self), 16) * 2 + 1)
+        for position, song in enumerate(self, start=1):
+            self._tree[position] = self._duration(song)
+        for position in range(1, len(self._tree)):
+            parent = position + (position & -position)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[position]
+        self.version += 1
+
+    def _add(self, slot: int, delta: int) -> None:
+        position = slot + 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def _prefix(self, slots: int) -> int:
+        total = 0
+        while slots > 0:
+            total += self._tree[slots]
+            slots -= slots & -slots
+        return total
+
+    def duration_before(self, index: int) -> int:
+        """
+        Sums the durations of the songs before `index`.
+
+        Args:
+            index (int): The queue position.
+
+        Returns:
+            int: The total duration in seconds.
+        """
+        index = max(0, min(index, len(self)))
+        return self._prefix(self._head + index) - self._prefix(self._head)
+
+    def total_duration(self) -> int:
+        """
+        Sums the durations of every song in the queue.
+
+        Returns:
+            int: The total duration in seconds.
+        """
+        return self.duration_before(len(self))
+
+    def append(self, song) -> None:
+        slot = self._head + len(self)
+        if slot + 1 >= len(self._tree):
+            super().append(song)
+            self._rebuild()
+            self._notify([song], [])
+            return
+        super().append(song)
+        self._add(slot, self._duration(song))
+        self.version += 1
+        self._notify([song], [])
+
+    def extend(self, songs: Iterable) -> None:
+        for song in songs:
+            self.append(song)
+
+    def __iadd__(self, songs: Iterable):
+        self.extend(songs)
+        return self
+
+    def pop(self, index: int = -1):
+        if index == 0 and self:
+            song = super().pop(0)
+            self._add(self._head, -self._duration(song))
+            self._head += 1
+            self.version += 1
+            self._notify([], [song])
+            return song
+        song = super().pop(index)
+        self._rebuild()
+        self._notify([], [song])
+        return song
+
+    def insert(self, index: int, song) -> None:
+        super().insert(index, song)
+        self._rebuild()
+        self._notify([song], [])
+
+    def remove(self, song) -> None:
+        super().remove(song)
+        self._rebuild()
+        self._notify([], [song])
+
+    def clear(self) -> None:
+        removed = list(self)
+        super().clear()
+        self._rebuild()
+        self._notify([], removed)
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._rebuild()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._rebuild()
+
+    def __setitem__(self, index, value) -> None:
+        before = list(self) if self._listeners else []
+        super().__setitem__(index, value)
+        self._rebuild()
+        self._notify_diff(before)
+
+    def __delitem__(self, index) -> None:
+        before = list(self) if self._listeners else []
+        super().__delitem__(index)
+        self._rebuild()
+        self._notify_diff(before)
+
+    def __imul__(self, count: int):
+        before = list(self) if self._listeners else []
+        super().__imul__(count)
+        self._rebuild()
+        self._notify_diff(before)
+        return self
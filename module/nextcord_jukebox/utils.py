@@ -94,3 +94,26 @@ def to_timestamp(dt: datetime.datetime) -> int:
         int: Unix timestamp.
     """
     return int(dt.timestamp())
+
+
+def get_poster_thumbnail(thumbnails: list) -> str:
+    """
+    Picks the thumbnail used on posters, the smallest one that is not the 120x90 placeholder.
+
+    Args:
+        thumbnails (list): A list of thumbnail dictionaries with "url", "width" and "height" keys.
+
+    Returns:
+        str: The URL of the chosen thumbnail, or an empty string if none qualifies.
+    """
+    candidates = [
+        thumb
+        for thumb in thumbnails or []
+        if isinstance(thumb, dict)
+        and thumb.get("width")
+        and thumb.get("height")
+        and (thumb["width"], thumb["height"]) != (120, 90)
+    ]
+    if not candidates:
+        return ""
+    return min(candidates, key=lambda t: t["width"] * t["height"])["url"]
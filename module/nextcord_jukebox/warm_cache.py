@@ -0,0 +1,303 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+"""
+Warms the video metadata cache ahead of time so new nodes and fresh databases start warm.
+
+Usage:
+    python -m module.nextcord_jukebox.warm_cache --playlist PLxxxx --ids ids.txt --top 500
+
+Video IDs are collected from playlists, files with one video ID or URL per line and the
+most played songs in the replay history. Metadata is fetched in parallel under a rate limit
+and written in batches. With --checkpoint, finished and failed IDs are recorded so an
+interrupted run continues where it stopped.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+
+from termcolor import colored
+
+from .database_handler import Database
+from .executors import executors
+from .extractors import create_extractor
+
+VIDEO_ID_PATTERN = re.compile(
+    r"(?:v=|youtu\.be/|/embed/|/v/|/shorts/)([a-zA-Z0-9_-]{11})|^([a-zA-Z0-9_-]{11})$"
+)
+
+
+class RateLimiter:
+    """
+    Spaces out calls so no more than `rate` start per second.
+
+    Attributes:
+        interval (float): The minimum number of seconds between two calls.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Waits until the next call is allowed to start."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Checkpoint:
+    """
+    Records finished and failed video IDs in a JSON file so interrupted runs can resume.
+
+    Attributes:
+        path (str | None): The checkpoint file, or None to keep progress in memory only.
+        done (set): Video IDs that were cached.
+        failed (dict): Error messages of video IDs that failed, keyed by video ID.
+    """
+
+    def __init__(self, path: str | None) -> None:
+        self.path = path
+        self.done = set()
+        self.failed = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf8") as file:
+                data = json.load(file)
+            self.done = set(data.get("done", []))
+            self.failed = data.get("failed", {})
+
+    def save(self) -> None:
+        """Writes the checkpoint file atomically."""
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf8") as file:
+            json.dump({"done": sorted(self.done), "failed": self.failed}, file)
+        os.replace(temp_path, self.path)
+
+
+def parse_video_id(value: str) -> str | None:
+    """
+    Extracts a video ID from a video URL or a bare ID.
+
+    Args:
+        value (str): The URL or ID.
+
+    Returns:
+        str | None: The video ID, or None if the value holds none.
+    """
+    match = VIDEO_ID_PATTERN.search(value.strip())
+    if not match:
+        return None
+    return match.group(1) or match.group(2)
+
+
+def read_id_file(path: str) -> list:
+    """
+    Reads video IDs from a file with one ID or URL per line. Blank lines and lines starting with # are skipped.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        list: The video IDs in file order.
+    """
+    video_ids = []
+    with open(path, "r", encoding="utf8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            video_id = parse_video_id(line)
+            if video_id:
+                video_ids.append(video_id)
+            else:
+                print(colored(f"[SKIPPED] {line}", color="yellow"))
+    return video_ids
+
+
+async def collect_video_ids(args, database: Database, extractor) -> list:
+    """
+    Collects the video IDs to warm from every source given on the command line, without duplicates.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        database (Database): The database to read replay history from.
+        extractor (Extractor): The extractor used to resolve playlists.
+
+    Returns:
+        list: The video IDs in the order they were found.
+    """
+    video_ids = []
+    for playlist in args.playlist:
+        url = (
+            playlist
+            if playlist.startswith("http")
+            else f"https://www.youtube.com/playlist?list={playlist}"
+        )
+        info = await executors.run("extraction", extractor.fetch_playlist, url)
+        found = [parse_video_id(video_url) for video_url in info.video_urls]
+        print(colored(f"[PLAYLIST] {info.title}: {len(found)} videos", color="cyan"))
+        video_ids.extend(video_id for video_id in found if video_id)
+    for path in args.ids:
+        found = read_id_file(path)
+        print(colored(f"[FILE] {path}: {len(found)} videos", color="cyan"))
+        video_ids.extend(found)
+    if args.top:
+        found = [song for song, _ in database.get_top_songs(args.top, args.days)]
+        print(colored(f"[REPLAY] top {len(found)} videos", color="cyan"))
+        video_ids.extend(found)
+    return list(dict.fromkeys(video_ids))
+
+
+async def warm(args) -> int:
+    """
+    Runs the cache warming.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The process exit code, 1 if any video failed in this run.
+    """
+    if args.mysql:
+        database = Database(
+            "mysql",
+            host=os.getenv("MYSQL_HOST"),
+            user=os.getenv("MYSQL_USER"),
+            password=os.getenv("MYSQL_PASSWORD"),
+            database=os.getenv("MYSQL_DATABASE"),
+            port=int(os.getenv("MYSQL_PORT", 3306)),
+        )
+    else:
+        database = Database("sqlite", db_file=args.db)
+    executors.configure({"extraction": args.workers})
+    extractor = create_extractor(args.backend, ytdlp_pool_size=args.workers)
+    checkpoint = Checkpoint(args.checkpoint)
+
+    video_ids = await collect_video_ids(args, database, extractor)
+    pending = [video_id for video_id in video_ids if video_id not in checkpoint.done]
+    if not args.refresh:
+        cached = set()
+        for start in range(0, len(pending), 500):
+            cached |= database.get_cached_video_ids(pending[start : start + 500])
+        checkpoint.done |= cached
+        pending = [video_id for video_id in pending if video_id not in cached]
+    print(
+        colored(
+            f"{len(video_ids)} videos found, {len(video_ids) - len(pending)} already cached or done, {len(pending)} to fetch",
+            color="cyan",
+        )
+    )
+
+    limiter = RateLimiter(args.rate)
+    semaphore = asyncio.Semaphore(args.workers)
+    batch = {}
+    fetched = 0
+    cached = 0
+    failed = {}
+    started = time.perf_counter()
+
+    def flush():
+        if batch:
+            database.cache_bulk_video_metadata(batch)
+            checkpoint.done.update(batch)
+            batch.clear()
+        checkpoint.save()
+
+    async def fetch(video_id):
+        nonlocal fetched, cached
+        async with semaphore:
+            await limiter.wait()
+            try:
+                meta = await executors.run(
+                    "extraction", extractor.fetch_metadata, video_id
+                )
+                batch[video_id] = meta
+                checkpoint.failed.pop(video_id, None)
+                cached += 1
+            except Exception as e:
+                failed[video_id] = f"{type(e).__name__}: {e}"
+                checkpoint.failed[video_id] = failed[video_id]
+                print(colored(f"[FAILED] {video_id}: {e}", color="red"))
+            fetched += 1
+            if len(batch) >= args.batch:
+                flush()
+            if fetched % args.batch == 0 or fetched == len(pending):
+                elapsed = time.perf_counter() - started
+                print(
+                    colored(
+                        f"[{fetched}/{len(pending)}] {fetched / elapsed:.2f} videos/s, {len(failed)} failed",
+                        color="dark_grey",
+                    )
+                )
+
+    try:
+        await asyncio.gather(*(fetch(video_id) for video_id in pending))
+    finally:
+        flush()
+        database.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        colored(
+            f"Cached {cached} videos in {elapsed:.1f}s, {len(failed)} failed",
+            color="green" if not failed else "yellow",
+        )
+    )
+    for video_id, error in failed.items():
+        print(colored(f"  {video_id}: {error}", color="red"))
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m module.nextcord_jukebox.warm_cache",
+        description="Fetches video metadata ahead of time and bulk-loads it into the jukebox cache.",
+    )
+    parser.add_argument("--playlist", action="append", default=[], help="Playlist ID or URL, repeatable")
+    parser.add_argument("--ids", action="append", default=[], help="File with one video ID or URL per line, repeatable")
+    parser.add_argument("--top", type=int, default=0, help="Warm the N most played songs in the replay history")
+    parser.add_argument("--days", type=int, default=365, help="Replay history window for --top in days")
+    parser.add_argument("--db", default="sqlite/database.db", help="SQLite database path")
+    parser.add_argument("--mysql", action="store_true", help="Use the MySQL database from the MYSQL_* environment variables")
+    parser.add_argument("--backend", default="auto", help="Extractor backends, see create_extractor")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent fetches")
+    parser.add_argument("--rate", type=float, default=2.0, help="Maximum fetches started per second, 0 for no limit")
+    parser.add_argument("--batch", type=int, default=50, help="Videos written per transaction")
+    parser.add_argument("--checkpoint", help="JSON file recording progress so interrupted runs resume")
+    parser.add_argument("--refresh", action="store_true", help="Fetch videos that are already cached as well")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(warm(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import yt_dlp
+
+from .metrics import LatencyStats
+
+
+class YoutubeDLPool:
+    """
+    A bounded pool of YoutubeDL instances.
+
+    YoutubeDL is not safe for concurrent use, so every extraction checks out an
+    instance exclusively and returns it when done. Instances are created lazily up
+    to `size`, after which callers block until one is returned. Priority callers,
+    such as now-playing stream resolution, are served before everyone else.
+
+    Attributes:
+        options (dict): The options every instance is created with.
+        size (int): The maximum number of instances.
+        wait_stats (LatencyStats): Time spent waiting for an instance.
+    """
+
+    def __init__(self, options: dict, size: int = 4) -> None:
+        """
+        Initializes the YoutubeDLPool.
+
+        Args:
+            options (dict): The options every instance is created with.
+            size (int, optional): The maximum number of instances. Defaults to 4.
+        """
+        if size < 1:
+            raise ValueError("YoutubeDLPool size must be at least 1.")
+        self.options = options
+        self.size = size
+        self.wait_stats = LatencyStats()
+        self._idle: List[yt_dlp.YoutubeDL] = []
+        self._condition = threading.Condition()
+        self._created = 0
+        self._waiting = 0
+        self._priority_waiting = 0
+        self._in_use = 0
+
+    def _available(self, priority: bool) -> bool:
+        if not priority and self._priority_waiting:
+            return False
+        return bool(self._idle) or self._created < self.size
+
+    def _acquire(self, priority: bool) -> yt_dlp.YoutubeDL:
+        started = time.perf_counter()
+        with self._condition:
+            if not self._available(priority):
+                self._waiting += 1
+                self._priority_waiting += priority
+                try:
+                    self._condition.wait_for(lambda: self._available(priority))
+                finally:
+                    self._waiting -= 1
+                    self._priority_waiting -= priority
+                self.wait_stats.record(time.perf_counter() - started)
+
+            self._in_use += 1
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        try:
+            return yt_dlp.YoutubeDL(self.options)
+        except BaseException:
+            with self._condition:
+                self._in_use -= 1
+                self._created -= 1
+                self._condition.notify_all()
+            raise
+
+    def _release(self, instance: yt_dlp.YoutubeDL) -> None:
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append(instance)
+            self._condition.notify_all()
+
+    @contextmanager
+    def checkout(self, priority: bool = False) -> Iterator[yt_dlp.YoutubeDL]:
+        """
+        Checks out an instance for the duration of the with block.
+
+        Args:
+            priority (bool, optional): Whether to be served before non-priority waiters. Defaults to False.
+
+        Yields:
+            yt_dlp.YoutubeDL: An instance used by no other thread until the block exits.
+        """
+        instance = self._acquire(priority)
+        try:
+            yield instance
+        finally:
+            self._release(instance)
+
+    def extract_info(self, url: str, priority: bool = False) -> dict:
+        """
+        Runs `extract_info` without downloading on a checked out instance.
+
+        Args:
+            url (str): The URL or query to extract.
+            priority (bool, optional): Whether to be served before non-priority waiters. Defaults to False.
+
+        Returns:
+            dict: The extracted information.
+        """
+        with self.checkout(priority) as ytdlp:
+            return ytdlp.extract_info(url, download=False)
+
+    def metrics(self) -> dict:
+        """
+        Returns the pool occupancy and wait-time metrics.
+
+        Returns:
+            dict: The metrics keyed by name.
+        """
+        with self._condition:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "queue_depth": self._waiting,
+                "priority_queue_depth": self._priority_waiting,
+                "wait": self.wait_stats.to_dict(),
+            }
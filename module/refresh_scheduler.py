@@ -0,0 +1,298 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import nextcord
+from termcolor import colored
+
+
+class _ViewState:
+    """
+    Refresh bookkeeping for a single registered view.
+
+    Attributes:
+        due (Optional[float]): Monotonic time of the next refresh, or None when the view only
+            refreshes on request.
+        fingerprint (Optional[str]): Fingerprint of the last payload sent to Discord.
+    """
+
+    __slots__ = ("due", "fingerprint")
+
+    def __init__(self, fingerprint: Optional[str] = None):
+        self.due: Optional[float] = None
+        self.fingerprint = fingerprint
+
+
+class RefreshScheduler:
+    """
+    A per-guild scheduler that coalesces message edits of live views.
+
+    Views register once their message has been sent and then only ask for refreshes. The
+    scheduler renders a due view, compares the result with what was last sent and skips
+    the edit when nothing visible changed. Edits in a guild share a budget of `rate` edits
+    per `window` seconds, and a 429 response pauses the whole guild for `retry_after`.
+
+    A registered view must provide:
+        - `interaction` and `follow_up`, used to edit the message.
+        - `async render() -> Optional[dict]`, the keyword arguments of the edit, or None to skip.
+        - `next_refresh() -> Optional[float]`, seconds until its content changes on its own,
+          or None if it only changes on request.
+
+    Attributes:
+        guild_id (int): The guild this scheduler refreshes views for.
+        edits (int): Number of edits sent.
+        skipped (int): Number of renders skipped because the payload did not change.
+        rate_limited (int): Number of 429 responses received.
+    """
+
+    _schedulers: Dict[int, "RefreshScheduler"] = {}
+
+    rate: int = 5
+    window: float = 5.0
+    min_interval: float = 1.0
+    max_interval: float = 5.0
+
+    def __init__(self, guild_id: int):
+        """
+        Initializes the scheduler of a guild.
+
+        Args:
+            guild_id (int): The guild this scheduler refreshes views for.
+        """
+        self.guild_id = guild_id
+        self.edits = 0
+        self.skipped = 0
+        self.rate_limited = 0
+
+        self._views: Dict[nextcord.ui.View, _ViewState] = {}
+        self._sent = deque()
+        self._blocked_until = 0.0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def of(cls, guild_id: int) -> "RefreshScheduler":
+        """
+        Returns the scheduler of a guild, creating it if needed.
+
+        Args:
+            guild_id (int): The guild ID.
+
+        Returns:
+            RefreshScheduler: The guild's scheduler.
+        """
+        scheduler = cls._schedulers.get(guild_id)
+        if scheduler is None:
+            scheduler = cls._schedulers[guild_id] = cls(guild_id)
+        return scheduler
+
+    @classmethod
+    def metrics(cls) -> dict:
+        """
+        Returns counters summed over all guilds.
+
+        Returns:
+            dict: Number of live views, edits sent, edits skipped and 429 responses.
+        """
+        schedulers = list(cls._schedulers.values())
+        return {
+            "views": sum(len(s._views) for s in schedulers),
+            "edits": sum(s.edits for s in schedulers),
+            "skipped": sum(s.skipped for s in schedulers),
+            "rate_limited": sum(s.rate_limited for s in schedulers),
+        }
+
+    def register(self, view, payload: Optional[dict] = None) -> None:
+        """
+        Starts refreshing a view whose message has been sent.
+
+        Args:
+            view: The view to refresh.
+            payload (Optional[dict]): The payload the message was sent with, so an identical
+                first render is skipped.
+        """
+        state = _ViewState(self._fingerprint(payload) if payload else None)
+        self._views[view] = state
+        self._schedule(view, state)
+        self._start()
+
+    def unregister(self, view) -> None:
+        """
+        Stops refreshing a view.
+
+        Args:
+            view: The view to stop refreshing.
+        """
+        self._views.pop(view, None)
+        self._wake.set()
+
+    def request(self, view) -> None:
+        """
+        Asks for a view to be refreshed as soon as the edit budget allows.
+
+        Repeated requests before the refresh runs are coalesced into a single edit. A view
+        that is not registered yet is registered.
+
+        Args:
+            view: The view to refresh.
+        """
+        state = self._views.setdefault(view, _ViewState())
+        state.due = time.monotonic()
+        self._wake.set()
+        self._start()
+
+    def _start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _schedule(self, view, state: _ViewState) -> None:
+        interval = view.next_refresh()
+        if interval is None:
+            state.due = None
+            return
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        state.due = time.monotonic() + interval
+
+    def _next_slot(self, now: float) -> float:
+        while self._sent and now - self._sent[0] >= self.window:
+            self._sent.popleft()
+        slot = self._blocked_until
+        if len(self._sent) >= self.rate:
+            slot = max(slot, self._sent[0] + self.window)
+        return slot
+
+    async def _run(self) -> None:
+        while self._views:
+            now = time.monotonic()
+            due = [
+                (state.due, view)
+                for view, state in self._views.items()
+                if state.due is not None
+            ]
+            wake_at = min((at for at, _ in due), default=None)
+
+            if wake_at is not None and wake_at <= now:
+                slot = self._next_slot(now)
+                if slot <= now:
+                    _, view = min(due, key=lambda item: item[0])
+                    await self._refresh(view)
+                    continue
+                wake_at = slot
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(),
+                    timeout=None if wake_at is None else max(wake_at - now, 0),
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        if self._schedulers.get(self.guild_id) is self:
+            del self._schedulers[self.guild_id]
+
+    async def _refresh(self, view) -> None:
+        state = self._views[view]
+        if getattr(view, "is_timeout", False) or view.follow_up is None:
+            self.unregister(view)
+            return
+
+        try:
+            payload = await view.render()
+        except Exception as e:
+            self.unregister(view)
+            print(colored(text=f"[REFRESH] Render failed: {e}", color="red"))
+            return
+        if view not in self._views:
+            return
+
+        fingerprint = self._fingerprint(payload) if payload is not None else None
+        if payload is None or fingerprint == state.fingerprint:
+            self.skipped += 1
+            self._schedule(view, state)
+            return
+
+        self._sent.append(time.monotonic())
+        try:
+            await view.interaction.followup.edit_message(
+                message_id=view.follow_up.id, **payload
+            )
+        except nextcord.NotFound:
+            self.unregister(view)
+            return
+        except nextcord.HTTPException as e:
+            if e.status != 429:
+                self.unregister(view)
+                print(colored(text=f"[REFRESH] Edit failed: {e}", color="red"))
+                return
+            self.rate_limited += 1
+            self._blocked_until = time.monotonic() + self._retry_after(e)
+            state.due = self._blocked_until
+            return
+
+        self.edits += 1
+        state.fingerprint = fingerprint
+        self._schedule(view, state)
+
+    def _retry_after(self, error: nextcord.HTTPException) -> float:
+        headers = getattr(error.response, "headers", None) or {}
+        for key in ("Retry-After", "X-RateLimit-Reset-After"):
+            try:
+                return float(headers[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return self.window
+
+    @staticmethod
+    def _fingerprint(payload: dict) -> str:
+        """
+        Returns a string that changes whenever the visible part of a payload changes.
+
+        Args:
+            payload (dict): The edit keyword arguments, `embed` and `view`.
+
+        Returns:
+            str: The fingerprint.
+        """
+        embed = payload.get("embed")
+        view = payload.get("view")
+        return json.dumps(
+            [
+                embed.to_dict() if embed is not None else None,
+                (
+                    [
+                        [str(getattr(item, "emoji", None)), getattr(item, "disabled", None)]
+                        for item in view.children
+                    ]
+                    if view is not None
+                    else None
+                ),
+            ],
+            sort_keys=True,
+            default=str,
+        )
@@ -39,7 +39,7 @@ def create_top_songs_poster(
     Create a poster for top songs with given title, description, and optional details.
 
     Args:
-        songs (List[dict]): A list of dictionaries, each containing "title", "artist", "replays", and "thumbnail" keys.
+        songs (List[dict]): A list of dictionaries, each containing "title", "artist", "replays", and "poster_thumbnail" keys.
         title (str): The title of the poster.
         description (str): The description text on the poster.
         detail_texts (Optional[List[str]]): A list of additional detail texts to be displayed on the poster.
@@ -116,28 +116,6 @@ def create_top_songs_poster(
             return Image.open(BytesIO(requests.get(url).content)).convert("RGBA")
         return Image.new("RGBA", (200, 200), (0, 0, 0, 0))
 
-    def get_smallest_thumbnail(thumbnails) -> str:
-        """
-        Get the URL of the smallest thumbnail from a list of thumbnails.
-
-        Args:
-            thumbnails (list): A list of thumbnail dictionaries, each containing
-                               'url', 'width', and 'height' keys.
-
-        Returns:
-            str: The URL of the smallest thumbnail that does not have the size (120, 90).
-                 Returns an empty string if no such thumbnail is found.
-        """
-        return min(
-            (
-                thumb
-                for thumb in thumbnails
-                if (thumb["width"], thumb["height"]) != (120, 90)
-            ),
-            key=lambda t: t["width"] * t["height"],
-            default="",
-        )["url"]
-
     canvas = Image.new("RGB", (800, 1300), color="#16181d")
     draw = ImageDraw.Draw(canvas)
 
@@ -171,7 +149,7 @@ def create_top_songs_poster(
         )
 
     for i, song in enumerate(songs):
-        required_keys = ["artist", "replays", "thumbnails"]
+        required_keys = ["artist", "replays", "poster_thumbnail"]
 
         if not all(key in song for key in required_keys):
             print(f"Missing key(s) for song [{song['title']}]: {song}.")
@@ -191,7 +169,7 @@ def create_top_songs_poster(
         load_timer = time.time()
 
         thumbnail = (
-            load_image_from_url(get_smallest_thumbnail(song["thumbnails"]))
+            load_image_from_url(song["poster_thumbnail"])
             .resize((106, 60))
             .crop((23, 0, 83, 60))
         )
@@ -0,0 +1,215 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+import asyncio
+import weakref
+from typing import Dict, List, Optional, Set
+
+from termcolor import colored
+
+
+class _Entry:
+    """
+    Bookkeeping for a single registered view.
+
+    Attributes:
+        ref (weakref.ref): Weak reference to the view.
+        guild_id (int): The guild the view belongs to.
+        tasks (Set[asyncio.Task]): Background tasks owned by the view.
+    """
+
+    __slots__ = ("ref", "guild_id", "tasks")
+
+    def __init__(self, ref: weakref.ref, guild_id: int):
+        self.ref = ref
+        self.guild_id = guild_id
+        self.tasks: Set[asyncio.Task] = set()
+
+
+class ViewRegistry:
+    """
+    Keeps track of the live interactive views (Now Playing, queue, lyrics) of every guild.
+
+    Views are held through weak references, so a view that is no longer referenced anywhere
+    else drops out on its own. Each guild keeps at most `max_per_guild` live views; when a new
+    one is registered past the cap the oldest is retired. Retiring a view calls its
+    `timeout_self()` and cancels every task it owns, and the same happens to all views of a
+    guild when its player is removed.
+
+    A registered view must provide `is_timeout` and `async timeout_self()`.
+    """
+
+    _entries: Dict[int, _Entry] = {}
+    _guilds: Dict[int, List[int]] = {}
+    _retiring: Set[asyncio.Task] = set()
+
+    retired: int = 0
+    max_per_guild: int = 10
+
+    @classmethod
+    def register(cls, guild_id: int, view, *tasks: asyncio.Task) -> None:
+        """
+        Registers a live view, retiring the oldest view of the guild if the cap is exceeded.
+
+        Args:
+            guild_id (int): The guild the view belongs to.
+            view: The view to register.
+            *tasks (asyncio.Task): Background tasks owned by the view.
+        """
+        key = id(view)
+        entry = cls._entries.get(key)
+        if entry is None:
+            entry = cls._entries[key] = _Entry(
+                weakref.ref(view, lambda _, key=key: cls._forget(key)), guild_id
+            )
+            cls._guilds.setdefault(guild_id, []).append(key)
+        for task in tasks:
+            cls.track_task(view, task)
+
+        keys = cls._guilds[guild_id]
+        while len(keys) > cls.max_per_guild:
+            oldest = cls._entries[keys[0]].ref()
+            if oldest is None:
+                cls._forget(keys[0])
+                continue
+            cls.unregister(oldest)
+            task = asyncio.create_task(cls._timeout(oldest))
+            cls._retiring.add(task)
+            task.add_done_callback(cls._retiring.discard)
+            cls.retired += 1
+
+    @classmethod
+    def track_task(cls, view, task: asyncio.Task) -> None:
+        """
+        Ties a background task to a registered view, so it is cancelled when the view retires.
+
+        Args:
+            view: A registered view.
+            task (asyncio.Task): The task owned by the view.
+        """
+        entry = cls._entries.get(id(view))
+        if entry is None or entry.ref() is not view:
+            return
+        entry.tasks.add(task)
+        task.add_done_callback(entry.tasks.discard)
+
+    @classmethod
+    def unregister(cls, view) -> None:
+        """
+        Forgets a view and cancels the tasks it owns. The calling task is never cancelled, so
+        a view may unregister itself from its own background task.
+
+        Args:
+            view: The view to forget.
+        """
+        entry = cls._entries.get(id(view))
+        if entry is None or entry.ref() is not view:
+            return
+        cls._forget(id(view))
+
+        current = asyncio.current_task()
+        for task in list(entry.tasks):
+            if task is not current and not task.done():
+                task.cancel()
+
+    @classmethod
+    def views(cls, guild_id: int, kind: Optional[type] = None) -> list:
+        """
+        Returns the live views of a guild, oldest first.
+
+        Args:
+            guild_id (int): The guild ID.
+            kind (Optional[type]): Only return views of this type.
+
+        Returns:
+            list: The views that have not timed out yet.
+        """
+        views = []
+        for key in list(cls._guilds.get(guild_id, ())):
+            view = cls._entries[key].ref()
+            if view is None or view.is_timeout:
+                continue
+            if kind is None or isinstance(view, kind):
+                views.append(view)
+        return views
+
+    @classmethod
+    async def retire(cls, guild_id: int, kind: Optional[type] = None) -> None:
+        """
+        Times out the live views of a guild and cancels their tasks.
+
+        Args:
+            guild_id (int): The guild ID.
+            kind (Optional[type]): Only retire views of this type.
+        """
+        views = cls.views(guild_id, kind)
+        for view in views:
+            cls.unregister(view)
+        await asyncio.gather(*(cls._timeout(view) for view in views))
+        cls.retired += len(views)
+
+    @classmethod
+    def gauge(cls) -> dict:
+        """
+        Returns the current number of live views and tasks.
+
+        Returns:
+            dict: Number of live views, running view tasks, guilds with live views, the largest
+                number of views in a single guild and the number of views retired so far.
+        """
+        entries = list(cls._entries.values())
+        return {
+            "views": len(entries),
+            "tasks": sum(
+                1 for entry in entries for task in entry.tasks if not task.done()
+            ),
+            "guilds": len(cls._guilds),
+            "max_guild_views": max((len(k) for k in cls._guilds.values()), default=0),
+            "retired": cls.retired,
+        }
+
+    @classmethod
+    def _forget(cls, key: int) -> None:
+        entry = cls._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = cls._guilds.get(entry.guild_id)
+        if keys is not None:
+            if key in keys:
+                keys.remove(key)
+            if not keys:
+                cls._guilds.pop(entry.guild_id, None)
+
+    @staticmethod
+    async def _timeout(view) -> None:
+        if view.is_timeout:
+            return
+        try:
+            await view.timeout_self()
+        except Exception as e:
+            print(
+                colored(
+                    text=f"[VIEWS] Failed to time out {type(view).__name__}: {e}",
+                    color="red",
+                )
+            )
@@ -0,0 +1,138 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+"""
+Benchmarks SongSearchIndex against SongMatcher.match on a 10k song queue of mixed
+Japanese and Latin titles, and checks that both return identical results.
+
+Usage:
+    python -m test.matcher_benchmark
+"""
+
+import random
+import time
+
+from module.matcher import Song, SongMatcher, SongSearchIndex
+from module.nextcord_jukebox.song_queue import SongQueue
+
+QUEUE_SIZE = 10000
+
+KATAKANA = "アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワン"
+HIRAGANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわん"
+KANJI = "夢恋歌夜月星空花雪風海光影桜君僕心愛声色春夏秋冬青赤白黒"
+LATIN = [
+    "love", "night", "dream", "star", "light", "heart", "memory", "summer",
+    "orange", "blue", "forever", "tonight", "music", "world", "story", "again",
+]
+ARTISTS = [
+    "アステル・レダ", "カグラナナ", "歌衣メイカ", "七海うらら", "竜胆 尊", "夢追翔",
+    "HoneyWorks", "Justin Bieber", "Kaga Sumire", "Oishi Masayoshi", "VOCALOID",
+]
+
+QUERIES = [
+    "cover",
+    "仮死化",
+    "covered by 町田ちま",
+    "夢追翔 and 町田ちま",
+    "一度だけの恋なら とこ",
+    "   一度だ  け  の   恋   なら",
+    "カグラナナ",
+    "アステル レダ",
+    "アステルレダ",
+    "w/x/y",
+    "alice in musicland",
+    "オレンジ",
+    "memroy",
+    "summer nigth",
+    "honeyworks",
+    "夢恋",
+]
+
+
+def random_japanese(rng, length):
+    alphabet = rng.choice([KATAKANA, HIRAGANA, KANJI, KANJI + HIRAGANA])
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def random_song(rng):
+    artist = rng.choice(ARTISTS)
+    style = rng.random()
+    if style < 0.4:
+        name = f"【歌ってみた】{random_japanese(rng, rng.randint(3, 8))} / {artist}【Covered by {rng.choice(ARTISTS)}】"
+    elif style < 0.7:
+        words = " ".join(rng.choice(LATIN) for _ in range(rng.randint(2, 4)))
+        name = f"{artist} - {words.title()} [Official Video]"
+    else:
+        name = f"【MV】{random_japanese(rng, rng.randint(2, 6))}／{artist}【{rng.choice(LATIN)} ver】"
+    return Song(name=name, channel=artist)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def compare(index, songs):
+    linear_total = indexed_total = 0
+    for query in QUERIES:
+        expected, linear = timed(
+            SongMatcher.match, songs, query, case_sens=False, threshold=0.8
+        )
+        actual, indexed = timed(index.match, songs, query, threshold=0.8)
+        assert [(id(song), score) for song, score in expected] == [
+            (id(song), score) for song, score in actual
+        ], f"Results differ for {query!r}"
+        linear_total += linear
+        indexed_total += indexed
+        print(
+            f"{query!r:40} {len(actual):6} matches  linear {linear * 1000:9.2f}ms  indexed {indexed * 1000:8.2f}ms"
+        )
+    print(
+        f"Total: linear {linear_total * 1000:.1f}ms, indexed {indexed_total * 1000:.1f}ms ({linear_total / indexed_total:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    songs = [random_song(rng) for _ in range(QUEUE_SIZE)]
+
+    queue = SongQueue(songs)
+    index, build = timed(SongSearchIndex.of, queue)
+    print(f"Indexed {len(queue)} songs in {build * 1000:.1f}ms")
+    assert SongSearchIndex.of(queue) is index
+    compare(index, list(queue))
+
+    added = [random_song(rng) for _ in range(QUEUE_SIZE // 4)]
+
+    def mutate():
+        del queue[: QUEUE_SIZE // 4]
+        for _ in range(QUEUE_SIZE // 4):
+            queue.pop(0)
+        queue.extend(added)
+        queue.remove(added[0])
+
+    _, update = timed(mutate)
+    print(f"\nRemoved {QUEUE_SIZE // 2 + 1} and added {len(added)} queued songs in {update * 1000:.1f}ms")
+    assert SongSearchIndex.of(queue) is index
+    compare(index, list(queue))
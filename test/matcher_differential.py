@@ -0,0 +1,133 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+"""
+Differential test of the bounded edit-distance kernel in SongMatcher against the
+full Levenshtein computation it replaces, over the examples in module/matcher.py.
+
+Usage:
+    python -m test.matcher_differential
+"""
+
+import random
+
+from module import matcher
+from module.matcher import EXAMPLE_QUERIES, EXAMPLE_SONGS, SongMatcher, SongSearchIndex
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.75, 0.8, 0.9, 1.0]
+
+
+def reference_term_sim(q_term, t_term):
+    max_len = max(len(q_term), len(t_term))
+    return SongMatcher.calc_score(SongMatcher.lev_dist(q_term, t_term), max_len)
+
+
+def reference_match(song_queue, query, case_sens=True, threshold=0.8):
+    """SongMatcher.match as it was before the bounded kernel, scoring every term in full."""
+    if not case_sens:
+        query = query.lower()
+    q_terms = SongMatcher.split(SongMatcher.normalize_text(query))
+    results = []
+    for song in song_queue:
+        title_proc = SongMatcher.normalize_text(song.name)
+        channel_proc = SongMatcher.normalize_text(song.channel)
+        if not case_sens:
+            title_proc, channel_proc = title_proc.lower(), channel_proc.lower()
+        combined_terms = SongMatcher.split(title_proc) + SongMatcher.split(channel_proc)
+        match_found = False
+        for q_term in q_terms:
+            highest_score = 0
+            if q_term in title_proc or q_term in channel_proc:
+                highest_score = 1
+                match_found = True
+                break
+            for t_term in combined_terms:
+                highest_score = max(highest_score, reference_term_sim(q_term, t_term))
+            if highest_score >= threshold:
+                match_found = True
+                break
+        if match_found:
+            results.append((song, highest_score))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results
+
+
+def example_terms():
+    terms = set()
+    for song in EXAMPLE_SONGS:
+        for text in (song.name, song.channel):
+            text = SongMatcher.normalize_text(text)
+            terms.update(SongMatcher.split(text) + SongMatcher.split(text.lower()))
+    for query in EXAMPLE_QUERIES:
+        terms.update(SongMatcher.split(SongMatcher.normalize_text(query.lower())))
+    return sorted(terms)
+
+
+def check_pairs(q_terms, t_terms):
+    checked = 0
+    for q_term in q_terms:
+        for threshold in THRESHOLDS:
+            paths = [False, True] if matcher.np is not None else [False]
+            for use_numpy in paths:
+                scores = SongMatcher.term_sims(q_term, t_terms, threshold, use_numpy)
+                for t_term, score in zip(t_terms, scores):
+                    expected = reference_term_sim(q_term, t_term)
+                    assert (score >= threshold) == (expected >= threshold), (q_term, t_term, threshold)
+                    if expected >= threshold:
+                        assert score == expected, (q_term, t_term, threshold, score, expected)
+                    else:
+                        assert expected <= score < threshold, (q_term, t_term, threshold)
+                    checked += 1
+        for t_term in t_terms:
+            assert SongMatcher.term_sim(q_term, t_term) == reference_term_sim(q_term, t_term)
+    return checked
+
+
+def random_terms(rng, count):
+    alphabet = "abcdeアイウ夢"
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+if __name__ == "__main__":
+    terms = example_terms()
+    print(f"NumPy batch path: {'enabled' if matcher.np is not None else 'not installed, skipped'}")
+
+    checked = check_pairs(terms, terms)
+    print(f"Example term pairs: {checked} scores identical")
+
+    rng = random.Random(7)
+    checked = check_pairs(random_terms(rng, 60), random_terms(rng, 200))
+    print(f"Random term pairs: {checked} scores identical")
+
+    index = SongSearchIndex(EXAMPLE_SONGS)
+    for query in EXAMPLE_QUERIES:
+        for threshold in THRESHOLDS:
+            expected = reference_match(EXAMPLE_SONGS, query, case_sens=False, threshold=threshold)
+            for actual in (
+                SongMatcher.match(EXAMPLE_SONGS, query, case_sens=False, threshold=threshold),
+                index.match(EXAMPLE_SONGS, query, threshold=threshold),
+            ):
+                assert [(id(s), score) for s, score in actual] == [
+                    (id(s), score) for s, score in expected
+                ], (query, threshold)
+    print(f"Example queries: {len(EXAMPLE_QUERIES) * len(THRESHOLDS)} results identical")
@@ -0,0 +1,148 @@
+#  ------------------------------------------------------------
+#  Copyright (c) 2024 Rystal-Team
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+#  ------------------------------------------------------------
+#
+
+"""
+Load test of the RPC WebSocket server with hundreds of simulated local clients.
+
+Registers the clients in a throwaway SQLite jukebox database, connects them to an
+RPCHandler serving on localhost, fires track_start events through the EventManager and
+checks that every client received every event. Both server modes are exercised: "loop"
+serves on this script's event loop, "thread" on a separate thread.
+
+Usage:
+    python -m test.rpc_load [--clients 300] [--events 50] [--port 18098] [--protocol 2]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+import websockets
+
+from module.nextcord_jukebox.database_handler import Database
+from module.nextcord_jukebox.event_manager import EventManager
+from module.nextcord_jukebox.sockets import RPCHandler
+
+
+async def run_client(url, expected, received, ready):
+    async with websockets.connect(url) as websocket:
+        ready.release()
+        async for _ in websocket:
+            received[url] = received.get(url, 0) + 1
+            if received[url] == expected:
+                return
+
+
+async def load_test(database, mode, args):
+    handler = RPCHandler(SimpleNamespace(database=database), mode)
+    handler.address = "localhost"
+    handler.port = args.port
+    EventManager.attach(handler)
+    handler.start()
+
+    deadline = time.monotonic() + 10
+    while handler.server_loop is None and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.2)
+
+    members = [
+        SimpleNamespace(id=user_id, global_name=f"user{user_id}")
+        for user_id in range(args.clients)
+    ]
+    secrets = database.get_user_secrets(member.id for member in members)
+    player = SimpleNamespace(bot=None, members=members)
+
+    received = {}
+    ready = asyncio.Semaphore(0)
+    clients = [
+        asyncio.create_task(
+            run_client(
+                f"ws://localhost:{args.port}/{secrets[member.id]}"
+                + ("?v=2" if args.protocol == 2 else ""),
+                args.events,
+                received,
+                ready,
+            )
+        )
+        for member in members
+    ]
+    for _ in clients:
+        await ready.acquire()
+    while len(handler.clients) < args.clients:
+        await asyncio.sleep(0.01)
+
+    latencies = []
+    started = time.perf_counter()
+    for index in range(args.events):
+        song = SimpleNamespace(
+            title=f"Song {index}",
+            url=f"https://www.youtube.com/watch?v={index:011d}",
+            channel="Load Test",
+            thumbnail=None,
+            duration=180,
+            timer=SimpleNamespace(paused=False, elapsed=0.0),
+        )
+        fired = time.perf_counter()
+        await EventManager.fire("track_start", player, None, None, song)
+        latencies.append(time.perf_counter() - fired)
+    await asyncio.wait_for(asyncio.gather(*clients), timeout=60)
+    elapsed = time.perf_counter() - started
+
+    EventManager.detach(handler)
+    handler.stop()
+    if handler._server_thread is not None:
+        handler._server_thread.join(timeout=10)
+
+    delivered = sum(received.values())
+    assert delivered == args.clients * args.events, (delivered, args.clients * args.events)
+    latencies.sort()
+    print(
+        f"[{mode}, v{args.protocol}] {args.clients} clients x {args.events} events: {delivered} messages in {elapsed:.2f}s "
+        f"({delivered / elapsed:.0f}/s), fire p50 {statistics.median(latencies) * 1000:.1f}ms "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms, dropped {handler.dropped}"
+    )
+    print(f"[{mode}, v{args.protocol}] {handler.client_metrics()['send']}")
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        database = Database("sqlite", db_file=os.path.join(directory, "jukebox.sqlite"))
+        for user_id in range(args.clients):
+            await database.register(str(user_id))
+        for mode in ("loop", "thread"):
+            await load_test(database, mode, args)
+            args.port += 1
+        database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--port", type=int, default=18098)
+    parser.add_argument("--protocol", type=int, choices=(1, 2), default=1)
+    asyncio.run(main(parser.parse_args()))